@@ -0,0 +1,416 @@
+# bench_bridge.py • замеры методов COM-моста на имитации 1С
+# -*- coding: utf-8 -*-
+"""Время и число вызовов COM для публичных методов моста.
+
+Запуск из корня проекта (Linux/Windows, без 1С)::
+
+    python -m bench.bench_bridge                    # 100 000 заказов
+    python -m bench.bench_bridge --orders 5000 --only orders --detail
+    python -m bench.bench_bridge --json bench.json  # для сравнения прогонов
+
+Каждый метод вызывается дважды: первый вызов — с холодными кэшами моста,
+второй показывает эффект кэширования (изменяющие методы — один раз).
+Число вызовов COM считает ``fake_1c.STATS``: оно не зависит от машины,
+поэтому рост этого числа и есть регрессия (например, новый полный
+перебор ``Select()``). В конце перечисляются методы мостов без замера.
+"""
+from __future__ import annotations
+import argparse
+import io
+import json
+import logging
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Any, Callable
+
+from . import fake_1c
+
+# Сколько строк читать из генераторов iter_* (первые страницы)
+ITER_LIMIT = 1000
+
+
+@dataclass
+class Case:
+    target: str                       # метод моста: "list_orders" или "wax_bridge.plan_wax_jobs"
+    run: Callable[[Any, SimpleNamespace], Any]
+    label: str = ""                   # вариант вызова
+    repeat: bool = True               # False — метод меняет данные, вызывается один раз
+
+
+def _count(selection) -> int:
+    n = 0
+    while selection.Next():
+        n += 1
+    return n
+
+
+def _first(iterable, limit: int = ITER_LIMIT) -> list:
+    return list(islice(iterable, limit))
+
+
+# ─────────────  Чтение  ─────────────
+def _order_items(s) -> list[dict]:
+    return [
+        {"Номенклатура": s.product, "ВариантИзготовления": f"{s.article}-1", "Размер": "17.0",
+         "Количество": 2, "Вес": 5.5, "Примечание": ""},
+        {"Номенклатура": s.product, "ВариантИзготовления": "—", "Размер": "18.5",
+         "Количество": 1, "Вес": 2.75, "Примечание": "бенчмарк"},
+    ]
+
+
+def _task_rows(s) -> list[dict]:
+    return [{
+        "name": s.product, "article": s.article, "size": "17.0", "assay": "585",
+        "color": "красный", "insert": "без вставок", "method": f"{s.article}-1", "qty": 2,
+        "weight": 5.5, "operation": "работа с восковыми изделиями", "employee": "Иванов И.И.",
+    }]
+
+
+def _sync_orders(b, s):
+    result = b.sync_orders(None)
+    s.order_versions = result["versions"]
+    return result
+
+
+def _sync_orders_window(b, s):
+    """Сверка окна последних 100 заказов, как на странице заказов (без изменений)."""
+    if s.order_window is None:
+        since = b.list_orders_filtered({}, None, 100)["next"][0]
+        s.order_window = (b.sync_orders({}, {}, since)["versions"], since)
+    known, since = s.order_window
+    return b.sync_orders(known, {}, since)
+
+
+def _sync_window(method: str):
+    """Сверка окна последних 100 документов, как в деревьях страницы воскования."""
+    def run(b, s):
+        since = s.since[method]
+        if method not in s.windows:
+            s.windows[method] = getattr(b, method)({}, since)["versions"]
+        return getattr(b, method)(s.windows[method], since)
+    return run
+
+
+def _plan(b, s):
+    s.plan = b.wax_bridge.plan_wax_jobs(s.task_ref, "Иванов И.И.", "Петров П.П.")
+    return s.plan
+
+
+READ_CASES = [
+    # справочники и перечисления
+    Case("get_articles", lambda b, s: b.get_articles()),
+    Case("get_article_index", lambda b, s: b.get_article_index()),
+    Case("cache_variants", lambda b, s: b.cache_variants()),
+    Case("get_variants_by_article", lambda b, s: b.get_variants_by_article(s.article)),
+    Case("get_size_ref", lambda b, s: b.get_size_ref("17.0")),
+    Case("get_ref", lambda b, s: b.get_ref("Контрагенты", s.counterparty)),
+    Case("get_ref_by_description", lambda b, s: b.get_ref_by_description("Склады", "Основной склад")),
+    Case("get_catalog_ref", lambda b, s: b.get_catalog_ref("Склады", "Основной склад")),
+    Case("get_catalog_object_by_description",
+         lambda b, s: b.get_catalog_object_by_description("Склады", "Основной склад")),
+    Case("get_enum_by_description",
+         lambda b, s: b.get_enum_by_description("ВидыСтатусыПродукции", "Дав металл, дав камни")),
+    Case("list_enum_values", lambda b, s: b.list_enum_values("ВидыСтатусыПродукции")),
+    Case("iter_catalog_items", lambda b, s: list(b.iter_catalog_items("Контрагенты"))),
+    Case("list_catalog_items", lambda b, s: b.list_catalog_items("Номенклатура", 100)),
+    Case("log_catalog_contents", lambda b, s: b.log_catalog_contents("Склады")),
+    Case("to_string", lambda b, s: b.to_string(s.order_ref)),
+    Case("safe", lambda b, s: b.safe(s.order_ref, "Контрагент")),
+    Case("query_select", lambda b, s: _count(b.query_select(
+        s.queries.DOC_BY_NUMBER.format(doc="ЗаказВПроизводство"), Номер=s.order_number))),
+    Case("query_batch", lambda b, s: [_count(x) for x in b.query_batch(
+        s.queries.ORDERS_LIST.format(where=s.queries.LIST_BY_REFS) + ";" + s.queries.ORDER_ROWS,
+        Ссылки=[s.order_ref], Ссылка=s.order_ref)]),
+    # поиск документов
+    Case("get_doc_ref", lambda b, s: b.get_doc_ref("ЗаказВПроизводство", s.order_number)),
+    Case("get_doc_object_by_number",
+         lambda b, s: b.get_doc_object_by_number("ЗаданиеНаПроизводство", s.task_number)),
+    Case("get_object_from_ref", lambda b, s: b.get_object_from_ref(s.order_ref)),
+    Case("get_object_property", lambda b, s: b.get_object_property(s.order_ref, "Контрагент")),
+    Case("iter_documents", lambda b, s: _first(b.iter_documents("НарядВосковыеИзделия")),
+         f"первые {ITER_LIMIT}"),
+    Case("list_documents", lambda b, s: b.list_documents("ЗаданиеНаПроизводство")),
+    Case("get_last_order_number", lambda b, s: b.get_last_order_number()),
+    Case("get_next_order_number", lambda b, s: b.get_next_order_number()),
+    Case("get_last_task_number", lambda b, s: b.get_last_task_number()),
+    Case("get_next_task_number", lambda b, s: b.get_next_task_number()),
+    # заказы
+    Case("list_orders", lambda b, s: b.list_orders()),
+    Case("sync_orders", _sync_orders, "полный"),
+    Case("sync_orders", lambda b, s: b.sync_orders(s.order_versions), "без изменений"),
+    Case("sync_orders", _sync_orders_window, "окно страницы"),
+    Case("list_orders_filtered", lambda b, s: b.list_orders_filtered({}), "без отбора"),
+    Case("list_orders_filtered", lambda b, s: b.list_orders_filtered({
+        "counterparty": "Контрагент 00", "status": "ДавМеталлДавКамни", "posted": True,
+        "date_from": datetime(2024, 1, 1),
+    }), "с отбором"),
+    Case("list_orders_page", lambda b, s: b.list_orders_page()),
+    Case("iter_orders", lambda b, s: _first(b.iter_orders()), f"первые {ITER_LIMIT}"),
+    Case("get_order_rows", lambda b, s: b.get_order_rows(s.order_ref)),
+    Case("get_order_lines", lambda b, s: b.get_order_lines(s.order_number)),
+    Case("orders_bridge.get_order_lines", lambda b, s: b.orders_bridge.get_order_lines(s.order_number)),
+    # задания
+    Case("list_tasks", lambda b, s: b.list_tasks()),
+    Case("sync_tasks", lambda b, s: b.sync_tasks(None), "полный"),
+    Case("sync_tasks", _sync_window("sync_tasks"), "окно 100"),
+    Case("list_tasks_page", lambda b, s: b.list_tasks_page()),
+    Case("iter_tasks", lambda b, s: _first(b.iter_tasks()), f"первые {ITER_LIMIT}"),
+    Case("get_task_lines", lambda b, s: b.get_task_lines(s.task_number)),
+    Case("find_production_task_ref_by_method",
+         lambda b, s: b.find_production_task_ref_by_method("3D печать")),
+    Case("detect_method_from_items", lambda b, s: b.detect_method_from_items(b.get_task_lines(s.task_number))),
+    Case("calculate_batches", lambda b, s: b.calculate_batches([
+        {"metal": "Золото", "assay": "585", "color": "красный", "qty": 2, "weight": 5.5},
+    ] * 100)),
+    # наряды
+    Case("list_wax_jobs", lambda b, s: b.list_wax_jobs()),
+    Case("sync_wax_jobs", lambda b, s: b.sync_wax_jobs(None), "полный"),
+    Case("sync_wax_jobs", _sync_window("sync_wax_jobs"), "окно 100"),
+    Case("list_wax_jobs_page", lambda b, s: b.list_wax_jobs_page()),
+    Case("iter_wax_jobs", lambda b, s: _first(b.iter_wax_jobs()), f"первые {ITER_LIMIT}"),
+    Case("get_wax_job_lines", lambda b, s: b.get_wax_job_lines(s.job_number)),
+    Case("get_wax_job_lines_by_ref", lambda b, s: b.get_wax_job_lines_by_ref(s.job_ref)),
+    Case("get_wax_job_rows", lambda b, s: b.get_wax_job_rows(s.job_number)),
+    Case("wax_bridge.get_wax_job_rows", lambda b, s: b.wax_bridge.get_wax_job_rows(s.job_number)),
+    Case("find_wax_jobs_by_task", lambda b, s: b.find_wax_jobs_by_task(s.task_ref)),
+    Case("wax_bridge.plan_wax_jobs", _plan),
+]
+
+
+# ─────────────  Изменение данных  ─────────────
+def _create_order(b, s):
+    s.new_order = b.create_order({
+        "Организация": "ООО «Ювелир»", "Контрагент": s.counterparty, "Склад": "Основной склад",
+        "Ответственный": "Администратор", "ВидСтатусПродукции": "Дав металл, дав камни",
+        "Комментарий": "бенчмарк",
+    }, _order_items(s))
+    return s.new_order
+
+
+def _update_order(b, s):
+    items = _order_items(s)
+    items[1]["Количество"] = 3
+    return b.update_order(s.new_order, {"Комментарий": "бенчмарк, изменён"}, items)
+
+
+def _create_task(b, s):
+    order_ref = b.get_doc_ref("ЗаказВПроизводство", s.new_order)
+    task = b.create_production_task(order_ref, _task_rows(s))
+    s.new_task, s.new_task_ref = task.get("Номер"), task.get("Ref")
+    return task
+
+
+def _create_jobs(b, s):
+    s.new_jobs = b.create_wax_jobs_from_task(s.new_task_ref, "Иванов И.И.", "Петров П.П.")
+    return s.new_jobs
+
+
+def _job_refs(b, s) -> list:
+    return [b.get_doc_ref("НарядВосковыеИзделия", n) for n in s.new_jobs]
+
+
+WRITE_CASES = [
+    Case("create_order", _create_order),
+    Case("update_order", _update_order),
+    Case("sync_orders", lambda b, s: b.sync_orders(s.order_versions), "после изменений"),
+    Case("post_order", lambda b, s: b.post_order(s.new_order)),
+    Case("undo_posting", lambda b, s: b.undo_posting(s.new_order)),
+    Case("mark_order_for_deletion", lambda b, s: b.mark_order_for_deletion(s.new_order)),
+    Case("unmark_order_deletion", lambda b, s: b.unmark_order_deletion(s.new_order)),
+    Case("print_order_preview_pdf", lambda b, s: b.print_order_preview_pdf(s.new_order)),
+    Case("create_production_task", _create_task),
+    Case("post_task", lambda b, s: b.post_task(s.new_task)),
+    Case("undo_post_task", lambda b, s: b.undo_post_task(s.new_task)),
+    Case("mark_task_for_deletion", lambda b, s: b.mark_task_for_deletion(s.new_task)),
+    Case("unmark_task_deletion", lambda b, s: b.unmark_task_deletion(s.new_task)),
+    Case("create_wax_job_from_task", lambda b, s: b.create_wax_job_from_task(s.new_task)),
+    Case("wax_bridge.create_wax_job_from_task",
+         lambda b, s: b.wax_bridge.create_wax_job_from_task(s.new_task)),
+    Case("wax_bridge.create_wax_jobs_from_plan", lambda b, s: b.wax_bridge.create_wax_jobs_from_plan(s.plan)),
+    Case("create_wax_jobs_from_task", _create_jobs),
+    Case("post_wax_job", lambda b, s: b.post_wax_job(s.new_jobs[0])),
+    Case("undo_post_wax_job", lambda b, s: b.undo_post_wax_job(s.new_jobs[0])),
+    Case("mark_wax_job_for_deletion", lambda b, s: b.mark_wax_job_for_deletion(s.new_jobs[0])),
+    Case("unmark_wax_job_deletion", lambda b, s: b.unmark_wax_job_deletion(s.new_jobs[0])),
+    Case("close_wax_jobs", lambda b, s: b.close_wax_jobs(_job_refs(b, s))),
+    Case("close_wax_jobs_batch", lambda b, s: b.close_wax_jobs_batch(_job_refs(b, s))),
+    Case("wax_bridge.invalidate_task_jobs", lambda b, s: b.wax_bridge.invalidate_task_jobs()),
+    Case("delete_wax_job", lambda b, s: b.delete_wax_job(s.new_jobs[-1])),
+    Case("delete_task", lambda b, s: b.delete_task(s.new_task)),
+    Case("delete_order_by_number", lambda b, s: b.delete_order_by_number(s.new_order)),
+]
+for _case in WRITE_CASES:
+    _case.repeat = False
+
+CASES = READ_CASES + WRITE_CASES
+
+
+# ─────────────  Прогон  ─────────────
+@dataclass
+class Measure:
+    ms: float
+    calls: int
+    top: list[tuple[str, int]]
+    result: Any
+    error: str = ""
+
+
+def _measure(bridge, state, case: Case) -> Measure:
+    fake_1c.STATS.reset()
+    error, result = "", None
+    started = perf_counter()
+    with redirect_stdout(io.StringIO()):
+        try:
+            result = case.run(bridge, state)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    elapsed = (perf_counter() - started) * 1000
+    return Measure(elapsed, fake_1c.STATS.total, fake_1c.STATS.top(3), result, error)
+
+
+def _describe(result: Any) -> str:
+    if result is None or isinstance(result, (bool, int, float)):
+        return str(result)
+    if isinstance(result, str):
+        return repr(result[:24])
+    if isinstance(result, dict) and "rows" in result:
+        return f"{len(result['rows'])} строк"
+    if isinstance(result, dict) and "changed" in result:
+        return f"{len(result['changed'])} изм., {len(result['removed'])} удал."
+    try:
+        return f"{len(result)} эл."
+    except TypeError:
+        return type(result).__name__
+
+
+def _public(cls) -> set[str]:
+    return {n for n, v in vars(cls).items() if callable(v) and not n.startswith("_")}
+
+
+def _uncovered(targets: set[str]) -> list[str]:
+    from core.com_bridge import COM1CBridge
+    from core.orders_bridge import OrdersBridge
+    from core.wax_bridge import WaxBridge
+
+    missing = sorted(n for n in _public(COM1CBridge) if n not in targets)
+    for prefix, cls in (("orders_bridge", OrdersBridge), ("wax_bridge", WaxBridge)):
+        missing += sorted(
+            f"{prefix}.{n}" for n in _public(cls)
+            if n not in targets and f"{prefix}.{n}" not in targets
+        )
+    return missing
+
+
+def _scenario(db: fake_1c.Database) -> SimpleNamespace:
+    from core import queries
+
+    def middle(doc: str) -> fake_1c._Record:
+        records = list(db.documents[doc].records.values())
+        if not records:
+            raise SystemExit(f"В базе нет документов {doc}: увеличьте --orders")
+        return records[len(records) // 2]
+
+    def window(doc: str, last: int = 100):
+        dates = sorted(r.fields["Дата"] for r in db.documents[doc].records.values())
+        return dates[-min(last, len(dates))]
+
+    order = middle("ЗаказВПроизводство")
+    task = middle("ЗаданиеНаПроизводство")
+    job = middle("НарядВосковыеИзделия")
+    product = next(iter(db.catalogs["Номенклатура"].records.values()))
+    return SimpleNamespace(
+        queries=queries,
+        order_number=order.fields["Номер"], order_ref=order.ref,
+        task_number=task.fields["Номер"], task_ref=task.ref,
+        job_number=job.fields["Номер"], job_ref=job.ref,
+        article=product.fields["Артикул"], product=product.fields["Наименование"],
+        counterparty="Контрагент 0001",
+        order_versions={}, order_window=None, plan=None, windows={},
+        since={"sync_tasks": window("ЗаданиеНаПроизводство"),
+               "sync_wax_jobs": window("НарядВосковыеИзделия")},
+        new_order=None, new_task=None, new_task_ref=None, new_jobs=[],
+    )
+
+
+def _quiet_logging(verbose: bool) -> None:
+    """Журнал моста — только в консоль (gui1c.log не трогаем), по умолчанию выключен."""
+    from core import logger
+
+    logger.setup(file=None)
+    logger.logger.setLevel(logging.INFO if verbose else logging.CRITICAL)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Замеры COM-моста на имитации 1С")
+    parser.add_argument("--orders", type=int, default=100_000, help="заказов в базе")
+    parser.add_argument("--tasks", type=int, default=None, help="заданий (по умолчанию orders/4)")
+    parser.add_argument("--wax-jobs", type=int, default=None, help="нарядов (по умолчанию 2 на задание)")
+    parser.add_argument("--lines", type=int, default=2, help="строк в документе")
+    parser.add_argument("--only", default="", help="только методы, содержащие подстроку")
+    parser.add_argument("--detail", action="store_true", help="самые частые вызовы COM")
+    parser.add_argument("--json", type=Path, default=None, help="сохранить результаты в JSON")
+    parser.add_argument("--verbose", action="store_true", help="журнал моста в консоль")
+    args = parser.parse_args(argv)
+
+    started = perf_counter()
+    db = fake_1c.seed(args.orders, args.tasks, args.wax_jobs, args.lines)
+    counts = ", ".join(f"{name}: {len(t.records)}" for name, t in db.documents.items())
+    print(f"База: {counts} ({perf_counter() - started:.1f} с)")
+
+    # модули моста импортируются только после подмены COM
+    fake_1c.install(db)
+    import config  # noqa: F401  (config и core.com_bridge импортируют друг друга)
+    from core import catalog_cache
+    from core.com_bridge import COM1CBridge
+
+    _quiet_logging(args.verbose)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="gui1c-bench-") as cache_dir:
+        catalog_cache.CACHE_DIR = Path(cache_dir)
+        bridge = COM1CBridge("bench")
+        state = _scenario(db)
+
+        header = f"{'Метод':<48}{'мс':>10}{'COM':>10}{'повтор, мс':>12}{'COM':>10}  Результат"
+        print(header)
+        print("─" * len(header))
+        for case in CASES:
+            if args.only and args.only not in case.target:
+                continue
+            first = _measure(bridge, state, case)
+            again = _measure(bridge, state, case) if case.repeat else None
+            name = case.target + (f" ({case.label})" if case.label else "")
+            line = f"{name:<48}{first.ms:>10.1f}{first.calls:>10}"
+            line += f"{again.ms:>12.1f}{again.calls:>10}" if again else f"{'—':>12}{'—':>10}"
+            line += "  " + (f"ошибка: {first.error}" if first.error else _describe(first.result))
+            print(line)
+            if args.detail and first.top:
+                print(" " * 4 + ", ".join(f"{n}×{c}" for n, c in first.top))
+            results.append({
+                "method": case.target, "label": case.label,
+                "ms": round(first.ms, 3), "com_calls": first.calls,
+                "repeat_ms": round(again.ms, 3) if again else None,
+                "repeat_com_calls": again.calls if again else None,
+                "top": first.top, "result": _describe(first.result), "error": first.error,
+            })
+        bridge.catalog_cache.close()
+
+    missing = _uncovered({case.target for case in CASES})
+    if missing:
+        print(f"\nБез замера ({len(missing)}): " + ", ".join(missing))
+    if args.json:
+        args.json.write_text(
+            json.dumps({"orders": args.orders, "results": results}, ensure_ascii=False, indent=1),
+            encoding="utf-8",
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1569 @@
+# fake_1c.py • имитация COM-подключения 1С (V83.COMConnector) в памяти
+# -*- coding: utf-8 -*-
+"""Подмена ``win32com``/``pythoncom``/``pywintypes`` для замеров без 1С.
+
+Модель объектов повторяет то, чем пользуется мост: менеджеры
+``Catalogs``/``Documents``/``Enums``, выборки ``Select``/``Next``/
+``GetObject``, объекты с табличными частями и ``Write``, таблицы значений,
+массивы, транзакции и ``NewObject("Запрос")``. Запросы выполняются
+небольшим интерпретатором, который понимает тексты из ``core.queries``.
+
+Каждое обращение к публичному члену объекта имитации (свойство, метод,
+запись реквизита, шаг перебора коллекции) считается одним вызовом COM —
+см. ``STATS``. Счётчик не потокобезопасен: замеры выполняются в одном
+потоке.
+
+Порядок использования::
+
+    db = fake_1c.seed(orders=100_000)
+    fake_1c.install(db)      # до импорта core / config
+    import config
+    from core.com_bridge import COM1CBridge
+"""
+from __future__ import annotations
+import random
+import re
+import sys
+import types
+import uuid as uuidlib
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Any, Iterable
+
+DOC = "Документ"
+CAT = "Справочник"
+
+# ─────────────  Метаданные конфигурации  ─────────────
+_ROW = (
+    "Номенклатура", "ВариантИзготовления", "Размер", "Проба", "ЦветМеталла",
+    "ХарактеристикаВставок", "Количество", "Вес", "Примечание",
+)
+_TASK_ROW = _ROW + (
+    "ДатаНачала", "ДатаОкончания", "РабочийЦентр", "Заказ",
+    "КонечнаяПродукция", "ВариантИзготовленияПродукции", "АртикулГП",
+)
+_JOB_ROW = _ROW + ("ВидНорматива", "Партия")
+
+# справочник → дополнительные реквизиты
+CATALOGS: dict[str, tuple[str, ...]] = {
+    "Номенклатура": ("Артикул", "СреднийВес", "Размер1", "ТипНоменклатуры"),
+    "ВариантыИзготовленияНоменклатуры": (),
+    "Размеры": (),
+    "Пробы": (),
+    "ЦветаМеталла": (),
+    "ХарактеристикиВставок": (),
+    "Организации": (),
+    "Склады": (),
+    "Пользователи": (),
+    "Контрагенты": (),
+    "ДоговорыКонтрагентов": (),
+    "ФизическиеЛица": (),
+    "ТехОперации": (),
+    "ПроизводственныеУчастки": (),
+}
+
+# документ → (префикс номера, реквизиты шапки, табличные части)
+DOCUMENTS: dict[str, tuple[str, tuple[str, ...], dict[str, tuple[str, ...]]]] = {
+    "ЗаказВПроизводство": (
+        "00ЮП",
+        ("Организация", "Контрагент", "ДоговорКонтрагента", "Ответственный", "Склад",
+         "Комментарий", "ВидСтатусПродукции"),
+        {"Товары": _ROW},
+    ),
+    "ЗаданиеНаПроизводство": (
+        "ТП",
+        ("Организация", "Склад", "Ответственный", "ТехОперация", "ПроизводственныйУчасток",
+         "РабочийЦентр", "Комментарий", "ДокументОснование", "ЗаказВПроизводство",
+         "КонечнаяДатаЗадания"),
+        {"Продукция": _TASK_ROW, "ЗаданияНаВыполнениеТехОперации": _TASK_ROW + ("ТехОперация",)},
+    ),
+    "НарядВосковыеИзделия": (
+        "НВ",
+        ("Организация", "Склад", "Ответственный", "ТехОперация", "ПроизводственныйУчасток",
+         "Сотрудник", "Комментарий", "ДокументОснование", "ЗаданиеНаПроизводство", "Закрыт"),
+        {"ТоварыВыдано": _JOB_ROW, "ТоварыПринято": _JOB_ROW + ("Период",)},
+    ),
+}
+
+# перечисление → [(имя значения, синоним)]
+ENUMS: dict[str, tuple[tuple[str, str], ...]] = {
+    "ВидыСтатусыПродукции": (
+        ("СобствМеталлСобствКамни", "Собств металл, собств камни"),
+        ("СобствМеталлДавКамни", "Собств металл, дав камни"),
+        ("ДавМеталлСобствКамни", "Дав металл, собств камни"),
+        ("ДавМеталлДавКамни", "Дав металл, дав камни"),
+    ),
+    "ВидыНормативовНоменклатуры": (
+        ("Номенклатура", "Номенклатура"),
+        ("Комплектующее", "Комплектующее"),
+    ),
+    "ТипыНоменклатуры": (
+        ("Продукция", "Продукция"),
+        ("Материал", "Материал"),
+    ),
+}
+
+_SYNONYMS = {
+    "ЗаказВПроизводство": "Заказ в производство",
+    "ЗаданиеНаПроизводство": "Задание на производство",
+    "НарядВосковыеИзделия": "Наряд восковые изделия",
+}
+
+_DOC_FIELDS = ("Номер", "Дата", "Проведен", "ПометкаУдаления", "ВерсияДанных")
+_CAT_FIELDS = ("Код", "Наименование", "ПометкаУдаления", "ВерсияДанных")
+
+# английские имена стандартных реквизитов
+_ALIASES = {
+    "Number": "Номер",
+    "Date": "Дата",
+    "Posted": "Проведен",
+    "DeletionMark": "ПометкаУдаления",
+    "Ref": "Ссылка",
+    "DataVersion": "ВерсияДанных",
+    "Code": "Код",
+    "Description": "Наименование",
+}
+
+
+class FakeComError(Exception):
+    """Ошибка на стороне 1С (аналог ``pywintypes.com_error``)."""
+
+
+# ─────────────  Счётчик вызовов  ─────────────
+class CallCounter:
+    """Количество вызовов COM: всего и по именам членов."""
+
+    def __init__(self):
+        self.total = 0
+        self.names: Counter[str] = Counter()
+
+    def hit(self, name: str) -> None:
+        self.total += 1
+        self.names[name] += 1
+
+    def reset(self) -> None:
+        self.total = 0
+        self.names.clear()
+
+    def top(self, n: int = 3) -> list[tuple[str, int]]:
+        return self.names.most_common(n)
+
+
+STATS = CallCounter()
+
+
+class _Com:
+    """База объектов имитации: обращение к публичному члену — вызов COM."""
+
+    def __getattribute__(self, name):
+        if name[0] != "_":
+            STATS.hit(name)
+        return object.__getattribute__(self, name)
+
+    def __setattr__(self, name, value):
+        if name[0] == "_":
+            object.__setattr__(self, name, value)
+        else:
+            STATS.hit(name)
+            self._set(name, value)
+
+    def _set(self, name: str, value: Any) -> None:
+        raise AttributeError(f"Поле объекта не обнаружено ({name})")
+
+
+class FakeVariant:
+    """Аналог ``win32com.client.VARIANT``: значение с явным типом."""
+
+    def __init__(self, varianttype: int, value: Any):
+        self.varianttype = varianttype
+        self.value = value
+
+
+def _value(value: Any) -> Any:
+    """Значение, которое записывается в реквизит (объект → его ссылка)."""
+    if isinstance(value, FakeVariant):
+        value = value.value
+    if isinstance(value, FakeObject):
+        return value._ref()
+    return value
+
+
+def _presentation(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, FakeRef):
+        record = value._record()
+        if record is None:
+            return "<Объект не найден>" if value._uuid else ""
+        table = value._table
+        if table.kind == CAT:
+            return str(record.fields.get("Наименование") or "")
+        stamp = record.fields.get("Дата")
+        when = stamp.strftime("%d.%m.%Y %H:%M:%S") if stamp else ""
+        return f"{_SYNONYMS.get(table.name, table.name)} {record.fields.get('Номер')} от {when}"
+    if isinstance(value, bool):
+        return "Да" if value else "Нет"
+    if isinstance(value, datetime):
+        return value.strftime("%d.%m.%Y %H:%M:%S")
+    return str(value)
+
+
+# ─────────────  Хранилище  ─────────────
+class _Record:
+    """Записанный объект: реквизиты и строки табличных частей."""
+
+    __slots__ = ("table", "uuid", "fields", "sections", "ref")
+
+    def __init__(self, table, uid, fields, sections, ref):
+        self.table = table
+        self.uuid = uid
+        self.fields = fields
+        self.sections = sections
+        self.ref = ref
+
+
+class _Table:
+    """Объект метаданных (справочник или документ) с записями."""
+
+    def __init__(self, db, kind, name, attrs, sections=None, prefix=""):
+        self.db = db
+        self.kind = kind
+        self.name = name
+        standard = _DOC_FIELDS if kind == DOC else _CAT_FIELDS
+        self.attrs = frozenset(standard + tuple(attrs))
+        self.sections: dict[str, tuple[str, ...]] = dict(sections or {})
+        self.prefix = prefix
+        self.records: dict[str, _Record] = {}
+        # номер документа → УИДы (поиск по номеру)
+        self.by_number: dict[str, list[str]] = {}
+        self.counter = 0
+        self.empty = FakeRef(self, "")
+
+    def next_number(self) -> str:
+        self.counter += 1
+        return f"{self.prefix}-{self.counter:06d}"
+
+    def next_code(self) -> str:
+        self.counter += 1
+        return f"{self.counter:09d}"
+
+    def new_fields(self) -> dict:
+        if self.kind == DOC:
+            return {"Номер": "", "Дата": None, "Проведен": False, "ПометкаУдаления": False}
+        return {"Код": "", "Наименование": "", "ПометкаУдаления": False}
+
+
+class _Enum:
+    def __init__(self, name: str, values: Iterable[tuple[str, str]]):
+        self.name = name
+        self.values = {n: FakeEnumValue(self, n, s) for n, s in values}
+        self.empty = FakeEnumValue(self, "", "")
+
+
+class Database:
+    """Информационная база в памяти: справочники, документы, перечисления."""
+
+    def __init__(self):
+        self.catalogs = {name: _Table(self, CAT, name, attrs) for name, attrs in CATALOGS.items()}
+        self.documents = {
+            name: _Table(self, DOC, name, attrs, sections, prefix)
+            for name, (prefix, attrs, sections) in DOCUMENTS.items()
+        }
+        self.enums = {name: _Enum(name, values) for name, values in ENUMS.items()}
+        self._uuids = 0
+        self._tx: list | None = None
+        self._tx_depth = 0
+        self._statements: dict[str, list[_Statement]] = {}
+
+    # -------------------------------------------------------------
+    def new_uuid(self) -> str:
+        self._uuids += 1
+        return str(uuidlib.UUID(int=self._uuids))
+
+    def enum(self, enum_name: str, value_name: str) -> 'FakeEnumValue':
+        return self.enums[enum_name].values[value_name]
+
+    def add_item(self, catalog: str, description: str, **attrs) -> 'FakeRef':
+        """Добавляет элемент справочника (для наполнения базы)."""
+        table = self.catalogs[catalog]
+        fields = {"Код": table.next_code(), "Наименование": description,
+                  "ПометкаУдаления": False, "ВерсияДанных": 1}
+        fields.update(self._checked(table, attrs))
+        return self._put(table, self.new_uuid(), fields, {}).ref
+
+    def add_document(self, doc: str, stamp: datetime, sections: dict | None = None, **attrs) -> 'FakeRef':
+        """Добавляет документ с очередным номером (для наполнения базы)."""
+        table = self.documents[doc]
+        fields = {"Номер": table.next_number(), "Дата": stamp, "Проведен": False,
+                  "ПометкаУдаления": False, "ВерсияДанных": 1}
+        fields.update(self._checked(table, attrs))
+        rows = {name: [dict(r) for r in lines] for name, lines in (sections or {}).items()}
+        for name in rows:
+            if name not in table.sections:
+                raise ValueError(f"{doc}: нет табличной части {name}")
+        return self._put(table, self.new_uuid(), fields, rows).ref
+
+    @staticmethod
+    def _checked(table: _Table, attrs: dict) -> dict:
+        for name in attrs:
+            if name not in table.attrs:
+                raise ValueError(f"{table.name}: нет реквизита {name}")
+        return attrs
+
+    # -------------------------------------------------------------
+    def _store(self, table: _Table, uid: str, record: _Record | None) -> _Record | None:
+        """Заменяет (или удаляет) запись и поддерживает индекс номеров."""
+        previous = table.records.get(uid)
+        if record is None:
+            table.records.pop(uid, None)
+        else:
+            table.records[uid] = record
+        if table.kind == DOC:
+            if previous is not None:
+                uids = table.by_number.get(str(previous.fields.get("Номер")).strip())
+                if uids and uid in uids:
+                    uids.remove(uid)
+            if record is not None:
+                table.by_number.setdefault(str(record.fields.get("Номер")).strip(), []).append(uid)
+        return previous
+
+    def _put(self, table: _Table, uid: str, fields: dict, sections: dict) -> _Record:
+        previous = table.records.get(uid)
+        ref = previous.ref if previous is not None else FakeRef(table, uid)
+        record = _Record(table, uid, fields, sections, ref)
+        self._store(table, uid, record)
+        if self._tx is not None:
+            self._tx.append((table, uid, previous))
+        return record
+
+    def _remove(self, table: _Table, uid: str) -> None:
+        previous = self._store(table, uid, None)
+        if self._tx is not None and previous is not None:
+            self._tx.append((table, uid, previous))
+
+    def _begin(self) -> None:
+        self._tx_depth += 1
+        if self._tx is None:
+            self._tx = []
+
+    def _commit(self) -> None:
+        if not self._tx_depth:
+            raise FakeComError("Транзакция не активна")
+        self._tx_depth -= 1
+        if not self._tx_depth:
+            self._tx = None
+
+    def _rollback(self) -> None:
+        if not self._tx_depth:
+            raise FakeComError("Транзакция не активна")
+        undo, self._tx, self._tx_depth = self._tx or [], None, 0
+        for table, uid, previous in reversed(undo):
+            self._store(table, uid, previous)
+
+    def _compile(self, text: str) -> list['_Statement']:
+        statements = self._statements.get(text)
+        if statements is None:
+            body = "\n".join(
+                line for line in text.splitlines() if not line.strip().startswith("//")
+            )
+            statements = [_Statement(self, part) for part in body.split(";") if part.strip()]
+            if not statements:
+                raise FakeComError("Текст запроса пуст")
+            self._statements[text] = statements
+        return statements
+
+
+# ─────────────  Ссылки и объекты  ─────────────
+def _read(table: _Table, fields: dict, name: str) -> Any:
+    if name in fields:
+        return fields[name]
+    if name in table.attrs:
+        return None
+    raise AttributeError(f"Поле объекта не обнаружено ({name})")
+
+
+class FakeUUID(_Com):
+    def __init__(self, value: str):
+        self._value = str(value)
+
+    def __str__(self):
+        return self._value
+
+
+class FakeRef(_Com):
+    """Ссылка: равна другой ссылке на тот же объект, реквизиты читает из базы."""
+
+    def __init__(self, table: _Table, uid: str):
+        self._table = table
+        self._uuid = uid
+
+    def __eq__(self, other):
+        return isinstance(other, FakeRef) and other._table is self._table and other._uuid == self._uuid
+
+    def __hash__(self):
+        return hash((self._table.name, self._uuid))
+
+    def __str__(self):
+        return _presentation(self)
+
+    def __repr__(self):
+        return f"<FakeRef {self._table.kind}.{self._table.name} {self._uuid}>"
+
+    def _record(self) -> _Record | None:
+        return self._table.records.get(self._uuid) if self._uuid else None
+
+    def _object(self) -> 'FakeObject | None':
+        record = self._record()
+        return FakeObject._load(record) if record is not None else None
+
+    def __getattr__(self, name):
+        if name[0] == "_":
+            raise AttributeError(name)
+        name = _ALIASES.get(name, name)
+        if name == "Ссылка":
+            return self
+        table = self._table
+        record = self._record()
+        if name in table.sections:
+            rows = record.sections.get(name, ()) if record is not None else ()
+            return FakeTabularSection(None, name, table.sections[name], [dict(r) for r in rows])
+        if record is None:
+            if name in table.attrs:
+                return None
+            raise AttributeError(f"Поле объекта не обнаружено ({name})")
+        return _read(table, record.fields, name)
+
+    def UUID(self):
+        return FakeUUID(self._uuid or "00000000-0000-0000-0000-000000000000")
+
+    def IsEmpty(self):
+        return not self._uuid
+
+    def GetObject(self):
+        return self._object()
+
+
+class FakeObject(_Com):
+    """Объект справочника или документа: изменения попадают в базу по ``Write``."""
+
+    def __init__(self, table: _Table, uid: str | None, fields: dict, sections: dict):
+        self._table = table
+        self._uuid = uid
+        self._fields = fields
+        self._sections = {
+            name: FakeTabularSection(self, name, columns, [dict(r) for r in sections.get(name, ())])
+            for name, columns in table.sections.items()
+        }
+
+    @classmethod
+    def _load(cls, record: _Record) -> 'FakeObject':
+        return cls(record.table, record.uuid, dict(record.fields), record.sections)
+
+    def _ref(self) -> FakeRef:
+        if not self._uuid:
+            return self._table.empty
+        record = self._table.records.get(self._uuid)
+        return record.ref if record is not None else FakeRef(self._table, self._uuid)
+
+    def __getattr__(self, name):
+        if name[0] == "_":
+            raise AttributeError(name)
+        name = _ALIASES.get(name, name)
+        if name == "Ссылка":
+            return self._ref()
+        section = self._sections.get(name)
+        if section is not None:
+            return section
+        return _read(self._table, self._fields, name)
+
+    def _set(self, name, value):
+        name = _ALIASES.get(name, name)
+        if name not in self._table.attrs or name == "ВерсияДанных":
+            raise AttributeError(f"Поле объекта не обнаружено ({name})")
+        self._fields[name] = _value(value)
+
+    def _write(self) -> None:
+        table, fields = self._table, self._fields
+        if table.kind == DOC:
+            if not fields.get("Номер"):
+                fields["Номер"] = table.next_number()
+            if fields.get("Дата") is None:
+                fields["Дата"] = datetime.now()
+        elif not fields.get("Код"):
+            fields["Код"] = table.next_code()
+        if self._uuid is None:
+            self._uuid = table.db.new_uuid()
+        previous = table.records.get(self._uuid)
+        fields["ВерсияДанных"] = (previous.fields["ВерсияДанных"] if previous else 0) + 1
+        table.db._put(
+            table, self._uuid, dict(fields),
+            {name: [dict(r) for r in s._rows] for name, s in self._sections.items()},
+        )
+
+    def Write(self, *mode):
+        self._write()
+
+    def Delete(self):
+        if self._uuid:
+            self._table.db._remove(self._table, self._uuid)
+
+    def UndoPosting(self):
+        self._fields["Проведен"] = False
+        self._write()
+
+    def IsNew(self):
+        return self._uuid is None
+
+    def GetForm(self, *args):
+        raise FakeComError("Формы недоступны во внешнем соединении")
+
+
+# ─────────────  Коллекции  ─────────────
+class FakeRow(_Com):
+    """Строка табличной части или таблицы значений."""
+
+    def __init__(self, owner, data: dict):
+        self._owner = owner
+        self._data = data
+
+    def __getattr__(self, name):
+        if name[0] == "_":
+            raise AttributeError(name)
+        owner = self._owner
+        if name in self._data:
+            return self._data[name]
+        if name == "НомерСтроки" and isinstance(owner, FakeTabularSection):
+            return next(i for i, r in enumerate(owner._rows) if r is self._data) + 1
+        if name in owner._cols:
+            return None
+        raise AttributeError(f"Поле объекта не обнаружено ({name})")
+
+    def _set(self, name, value):
+        if name not in self._owner._cols:
+            raise AttributeError(f"Поле объекта не обнаружено ({name})")
+        self._data[name] = _value(value)
+
+
+def _row_index(rows: list[dict], row: Any) -> int:
+    if isinstance(row, int):
+        return row
+    data = row._data
+    return next(i for i, r in enumerate(rows) if r is data)
+
+
+class FakeTabularSection(_Com):
+    def __init__(self, owner: FakeObject | None, name: str, columns: tuple[str, ...], rows: list[dict]):
+        self._owner = owner
+        self._name = name
+        self._cols = columns
+        self._rows = rows
+
+    def __iter__(self):
+        for data in list(self._rows):
+            STATS.hit("<перебор>")
+            yield FakeRow(self, data)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def Add(self):
+        data: dict = {}
+        self._rows.append(data)
+        return FakeRow(self, data)
+
+    def Count(self):
+        return len(self._rows)
+
+    def Get(self, index):
+        return FakeRow(self, self._rows[index])
+
+    def Delete(self, row):
+        del self._rows[_row_index(self._rows, row)]
+
+    def Clear(self):
+        self._rows.clear()
+
+    def Unload(self):
+        return FakeValueTable(
+            ("НомерСтроки",) + self._cols,
+            [dict(r, НомерСтроки=i + 1) for i, r in enumerate(self._rows)],
+        )
+
+    def Load(self, table):
+        columns = set(self._cols)
+        self._rows[:] = [{k: v for k, v in r.items() if k in columns} for r in table._rows]
+
+    def ЗаполнитьПоВыданному(self):
+        owner = self._owner
+        issued = owner._sections.get("ТоварыВыдано") if owner is not None else None
+        if issued is None or issued is self:
+            raise FakeComError("Метод объекта не обнаружен (ЗаполнитьПоВыданному)")
+        columns = set(self._cols)
+        self._rows[:] = [{k: v for k, v in r.items() if k in columns} for r in issued._rows]
+
+
+class FakeColumn(_Com):
+    def __init__(self, name: str):
+        object.__setattr__(self, "Name", name)
+
+
+class FakeColumns(_Com):
+    def __init__(self, table: 'FakeValueTable'):
+        self._table = table
+
+    def __iter__(self):
+        for name in list(self._table._cols):
+            STATS.hit("<перебор>")
+            yield FakeColumn(name)
+
+    def Add(self, name, *args):
+        if name in self._table._cols:
+            raise FakeComError(f"Колонка с таким именем уже существует ({name})")
+        self._table._cols.append(name)
+        return FakeColumn(name)
+
+    def Find(self, name):
+        return FakeColumn(name) if name in self._table._cols else None
+
+    def Count(self):
+        return len(self._table._cols)
+
+    def Get(self, index):
+        return FakeColumn(self._table._cols[index])
+
+
+class FakeValueTable(_Com):
+    def __init__(self, columns: Iterable[str] = (), rows: list[dict] | None = None):
+        self._cols = list(columns)
+        self._rows = rows if rows is not None else []
+        object.__setattr__(self, "Columns", FakeColumns(self))
+
+    def __iter__(self):
+        for data in list(self._rows):
+            STATS.hit("<перебор>")
+            yield FakeRow(self, data)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _names(self, columns: str | None) -> list[str]:
+        if not columns:
+            return list(self._cols)
+        names = [c.strip() for c in str(columns).split(",") if c.strip()]
+        for name in names:
+            if name not in self._cols:
+                raise FakeComError(f"Колонка не найдена ({name})")
+        return names
+
+    def Add(self):
+        data: dict = {}
+        self._rows.append(data)
+        return FakeRow(self, data)
+
+    def Insert(self, index):
+        data: dict = {}
+        self._rows.insert(index, data)
+        return FakeRow(self, data)
+
+    def Count(self):
+        return len(self._rows)
+
+    def Get(self, index):
+        return FakeRow(self, self._rows[index])
+
+    def Delete(self, row):
+        del self._rows[_row_index(self._rows, row)]
+
+    def Clear(self):
+        self._rows.clear()
+
+    def FillValues(self, value, columns=None):
+        value = _value(value)
+        for name in self._names(columns):
+            for data in self._rows:
+                data[name] = value
+
+    def Total(self, column):
+        return sum(data.get(column) or 0 for data in self._rows)
+
+    def UnloadColumn(self, column):
+        return FakeArray([data.get(column) for data in self._rows])
+
+    def Copy(self, rows=None, columns=None):
+        names = self._names(columns)
+        if rows is None:
+            source = self._rows
+        else:
+            items = rows._items if isinstance(rows, FakeArray) else list(rows)
+            source = [row._data for row in items]
+        return FakeValueTable(names, [{k: d[k] for k in names if k in d} for d in source])
+
+
+class FakeArray(_Com):
+    def __init__(self, items: Iterable | None = None):
+        self._items = list(items) if items is not None else []
+
+    def __iter__(self):
+        for item in list(self._items):
+            STATS.hit("<перебор>")
+            yield item
+
+    def __len__(self):
+        return len(self._items)
+
+    def Add(self, value=None):
+        self._items.append(value)
+
+    def Insert(self, index, value=None):
+        self._items.insert(index, value)
+
+    def Count(self):
+        return len(self._items)
+
+    def Get(self, index):
+        return self._items[index]
+
+    def Set(self, index, value):
+        self._items[index] = value
+
+    def Find(self, value):
+        try:
+            return self._items.index(value)
+        except ValueError:
+            return None
+
+    def Delete(self, index):
+        del self._items[index]
+
+    def Clear(self):
+        self._items.clear()
+
+
+# ─────────────  Менеджеры  ─────────────
+class FakeObjectSelection(_Com):
+    """Выборка менеджера (``Справочники.X.Выбрать()``) в порядке записи."""
+
+    def __init__(self, records: list[_Record]):
+        self._records = records
+        self._pos = -1
+        self._current: _Record | None = None
+
+    def Next(self):
+        self._pos += 1
+        if self._pos < len(self._records):
+            self._current = self._records[self._pos]
+            return True
+        self._current = None
+        return False
+
+    def GetObject(self):
+        if self._current is None:
+            raise FakeComError("Нет текущей записи выборки")
+        return FakeObject._load(self._current)
+
+    def __getattr__(self, name):
+        if name[0] == "_":
+            raise AttributeError(name)
+        record = self._current
+        if record is None:
+            raise FakeComError("Нет текущей записи выборки")
+        name = _ALIASES.get(name, name)
+        if name == "Ссылка":
+            return record.ref
+        return _read(record.table, record.fields, name)
+
+
+class FakeManager(_Com):
+    """``Справочники.<Имя>`` / ``Документы.<Имя>``."""
+
+    def __init__(self, table: _Table):
+        self._table = table
+
+    def _create(self, kind: str) -> FakeObject:
+        if self._table.kind != kind:
+            raise FakeComError("Метод объекта не обнаружен")
+        return FakeObject(self._table, None, self._table.new_fields(), {})
+
+    def Select(self, *args):
+        return FakeObjectSelection(list(self._table.records.values()))
+
+    def CreateDocument(self):
+        return self._create(DOC)
+
+    def CreateItem(self):
+        return self._create(CAT)
+
+    def GetRef(self, uid):
+        return FakeRef(self._table, str(uid))
+
+    def EmptyRef(self):
+        return self._table.empty
+
+    def FindByNumber(self, number, *args):
+        table = self._table
+        uids = table.by_number.get(str(number).strip(), ())
+        records = [table.records[u] for u in uids]
+        if not records:
+            return table.empty
+        return max(records, key=lambda r: r.fields.get("Дата") or datetime.min).ref
+
+    def FindByDescription(self, description, *args):
+        for record in self._table.records.values():
+            if record.fields.get("Наименование") == description:
+                return record.ref
+        return self._table.empty
+
+    def FindByCode(self, code, *args):
+        for record in self._table.records.values():
+            if record.fields.get("Код") == code:
+                return record.ref
+        return self._table.empty
+
+
+class FakeManagers(_Com):
+    """``Справочники`` / ``Документы``: менеджер по имени объекта метаданных."""
+
+    def __init__(self, tables: dict[str, _Table]):
+        self._tables = tables
+        self._managers: dict[str, FakeManager] = {}
+
+    def __getattr__(self, name):
+        if name[0] == "_":
+            raise AttributeError(name)
+        manager = self._managers.get(name)
+        if manager is None:
+            table = self._tables.get(name)
+            if table is None:
+                raise AttributeError(name)
+            manager = self._managers[name] = FakeManager(table)
+        return manager
+
+
+class FakeEnumValue(_Com):
+    def __init__(self, enum: _Enum, name: str, synonym: str):
+        self._enum = enum
+        self._name = name
+        self._synonym = synonym
+
+    def __str__(self):
+        return self._synonym
+
+    def __repr__(self):
+        return f"<FakeEnumValue {self._enum.name}.{self._name}>"
+
+
+class FakeEnumManager(_Com):
+    def __init__(self, enum: _Enum):
+        self._enum = enum
+
+    def __getattr__(self, name):
+        if name[0] == "_":
+            raise AttributeError(name)
+        value = self._enum.values.get(name)
+        if value is None:
+            raise AttributeError(name)
+        return value
+
+    def EmptyRef(self):
+        return self._enum.empty
+
+
+class FakeEnums(_Com):
+    def __init__(self, enums: dict[str, _Enum]):
+        self._enums = enums
+
+    def __getattr__(self, name):
+        if name[0] == "_":
+            raise AttributeError(name)
+        enum = self._enums.get(name)
+        if enum is None:
+            raise AttributeError(name)
+        return FakeEnumManager(enum)
+
+
+class FakeMetaValue(_Com):
+    def __init__(self, name: str, synonym: str):
+        object.__setattr__(self, "Name", name)
+        object.__setattr__(self, "Synonym", synonym)
+
+
+class FakeMetaObject(_Com):
+    def __init__(self, name: str, values: Iterable[tuple[str, str]] = ()):
+        object.__setattr__(self, "Name", name)
+        object.__setattr__(self, "EnumValues", FakeArray(FakeMetaValue(n, s) for n, s in values))
+
+
+class FakeMetaCollection(_Com):
+    def __init__(self, objects: dict[str, Any]):
+        self._objects = objects
+
+    def Find(self, name):
+        return self._objects.get(name)
+
+    def Count(self):
+        return len(self._objects)
+
+    def __getattr__(self, name):
+        if name[0] == "_":
+            raise AttributeError(name)
+        meta = self._objects.get(name)
+        if meta is None:
+            raise AttributeError(name)
+        return meta
+
+
+class FakeMetadata(_Com):
+    def __init__(self, db: Database):
+        object.__setattr__(self, "Enums", FakeMetaCollection({
+            name: FakeMetaObject(name, ENUMS[name]) for name in db.enums
+        }))
+        object.__setattr__(self, "Catalogs", FakeMetaCollection({
+            name: FakeMetaObject(name) for name in db.catalogs
+        }))
+        object.__setattr__(self, "Documents", FakeMetaCollection({
+            name: FakeMetaObject(name) for name in db.documents
+        }))
+
+
+# ─────────────  Запросы  ─────────────
+class _Line:
+    """Строка табличной части в запросе к ``Документ.X.ТабличнаяЧасть``."""
+
+    __slots__ = ("record", "index", "data")
+
+    def __init__(self, record, index, data):
+        self.record = record
+        self.index = index
+        self.data = data
+
+
+class _Totals:
+    """Итоги по табличной части документа (левое соединение с СУММА)."""
+
+    __slots__ = ("record", "section", "sums")
+
+    def __init__(self, record, section, sums):
+        self.record = record
+        self.section = section
+        self.sums = sums
+
+
+def _field(value: Any, name: str) -> Any:
+    if isinstance(value, _Record):
+        return value.ref if name == "Ссылка" else value.fields.get(name)
+    if isinstance(value, _Line):
+        if name == "Ссылка":
+            return value.record.ref
+        if name == "НомерСтроки":
+            return value.index + 1
+        return value.data.get(name)
+    if isinstance(value, _Totals):
+        column = value.sums.get(name)
+        rows = value.record.sections.get(value.section)
+        if column is None or not rows:
+            return None
+        return sum(r.get(column) or 0 for r in rows)
+    if isinstance(value, FakeRef):
+        record = value._record()
+        return _field(record, name) if record is not None else None
+    return None
+
+
+_LIKE_CACHE: dict[tuple[str, str], re.Pattern] = {}
+
+
+def _like(value: Any, pattern: Any, escape: str = "") -> bool:
+    key = (str(pattern), escape)
+    regex = _LIKE_CACHE.get(key)
+    if regex is None:
+        text, out, i = key[0], [], 0
+        while i < len(text):
+            ch = text[i]
+            if escape and ch == escape and i + 1 < len(text):
+                out.append(re.escape(text[i + 1]))
+                i += 2
+                continue
+            if ch == "%":
+                out.append(".*")
+            elif ch == "_":
+                out.append(".")
+            elif ch == "[" and "]" in text[i + 1:]:
+                end = text.index("]", i + 1)
+                body = text[i + 1:end]
+                negate = body.startswith("^")
+                body = body[1:] if negate else body
+                out.append("[" + ("^" if negate else "") + body.replace("\\", "\\\\") + "]")
+                i = end + 1
+                continue
+            else:
+                out.append(re.escape(ch))
+            i += 1
+        regex = _LIKE_CACHE[key] = re.compile("".join(out), re.S | re.I)
+    return regex.fullmatch(_presentation(value) if not isinstance(value, str) else value) is not None
+
+
+def _isnull(value: Any, default: Any) -> Any:
+    return default if value is None else value
+
+
+def _sort_key(value: Any) -> tuple:
+    if value is None:
+        return (0, 0)
+    if isinstance(value, (bool, int, float)):
+        return (1, value)
+    if isinstance(value, datetime):
+        return (2, value)
+    if isinstance(value, str):
+        return (3, value)
+    return (4, _presentation(value))
+
+
+_HELPERS = {
+    "__builtins__": {},
+    "_field": _field,
+    "_present": _presentation,
+    "_isnull": _isnull,
+    "_like": _like,
+}
+_KEYWORDS = {
+    "И": "and", "ИЛИ": "or", "НЕ": "not", "ИСТИНА": "True", "ЛОЖЬ": "False",
+    "NULL": "None", "НЕОПРЕДЕЛЕНО": "None", "В": "in",
+}
+_FUNCTIONS = {"ПРЕДСТАВЛЕНИЕ": "_present", "ЕСТЬNULL": "_isnull", "_LIKE": "_like"}
+_TOKEN = re.compile(
+    r'\s*(?:(?P<str>"[^"]*")|(?P<num>\d+(?:\.\d+)?)|(?P<param>&\w+)'
+    r'|(?P<op><>|<=|>=|=|<|>)|(?P<punct>[(),])|(?P<name>\w+(?:\.\w+)*))'
+)
+_LIKE_OP = re.compile(r'(\S+)\s+ПОДОБНО\s+(&\w+|"[^"]*")(?:\s+СПЕЦСИМВОЛ\s+("[^"]*"))?')
+
+_SELECT = re.compile(r"\s*ВЫБРАТЬ\s+(?:РАЗЛИЧНЫЕ\s+)?(?:ПЕРВЫЕ\s+(\d+)\s+)?", re.S)
+_FROM = re.compile(r"\bИЗ\b")
+_SOURCE = re.compile(r"\s*(Документ|Справочник)\.(\w+)(?:\.(\w+))?\s+КАК\s+(\w+)", re.S)
+_JOIN = re.compile(r"ЛЕВОЕ\s+СОЕДИНЕНИЕ\s*\(")
+_JOIN_ALIAS = re.compile(r"\s*КАК\s+(\w+)\s+ПО\s*(?=\()")
+_SUM = re.compile(r"СУММА\(\s*\w+\.(\w+)\s*\)\s+КАК\s+(\w+)")
+_WHERE = re.compile(r"\bГДЕ\b(.*?)(?=\bУПОРЯДОЧИТЬ\s+ПО\b|\bСГРУППИРОВАТЬ\s+ПО\b|\Z)", re.S)
+_ORDER = re.compile(r"\bУПОРЯДОЧИТЬ\s+ПО\b(.*)\Z", re.S)
+_ALIAS = re.compile(r"(.*?)\s+КАК\s+(\w+)\s*\Z", re.S)
+# отборы, для которых записи берутся по индексу, а не перебором
+_BY_REF = re.compile(r"\s*(\w+)\.Ссылка\s*=\s*&(\w+)\s*\Z")
+_BY_REFS = re.compile(r"\s*(\w+)\.Ссылка\s+В\s*\(\s*&(\w+)\s*\)\s*\Z")
+_BY_NUMBER = re.compile(r"\s*(\w+)\.Номер\s*=\s*&(\w+)\s*\Z")
+
+
+def _closing(text: str, start: int) -> int:
+    """Позиция скобки, закрывающей открытую в ``start``."""
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == "(":
+            depth += 1
+        elif text[i] == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+    raise FakeComError("Синтаксическая ошибка: не закрыта скобка")
+
+
+def _split(text: str) -> list[str]:
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(text):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _expression(text: str, aliases: set[str]):
+    """Выражение языка запросов → функция ``(контекст, параметры)``."""
+
+    def like(m):
+        return f'_LIKE({m[1]}, {m[2]}, {m[3] or chr(34) * 2})'
+
+    text = _LIKE_OP.sub(like, text).strip()
+    out, pos = [], 0
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if m is None or m.end() == pos:
+            raise FakeComError(f"Синтаксическая ошибка: {text[pos:pos + 40]!r}")
+        pos = m.end()
+        kind = m.lastgroup
+        value = m[kind]
+        if kind == "str":
+            out.append(repr(value[1:-1]))
+        elif kind == "num":
+            out.append(value)
+        elif kind == "param":
+            out.append(f"p[{value[1:]!r}]")
+        elif kind == "op":
+            out.append({"=": "==", "<>": "!="}.get(value, value))
+        elif kind == "punct":
+            out.append(value)
+        elif value.upper() in _KEYWORDS:
+            out.append(_KEYWORDS[value.upper()])
+        elif value.upper() in _FUNCTIONS:
+            out.append(_FUNCTIONS[value.upper()])
+        else:
+            alias, *path = value.split(".")
+            if alias not in aliases:
+                raise FakeComError(f'Поле не найдено "{value}"')
+            expr = f"c[{alias!r}]"
+            for part in path:
+                expr = f"_field({expr}, {part!r})"
+            out.append(expr)
+    return eval(f"lambda c, p: ({' '.join(out)})", _HELPERS)
+
+
+class _Statement:
+    """Один запрос пакета: источник, отбор, сортировка, колонки."""
+
+    def __init__(self, db: Database, text: str):
+        m = _SELECT.match(text)
+        if m is None:
+            raise FakeComError(f"Ожидается ВЫБРАТЬ: {text.strip()[:40]!r}")
+        self.limit = int(m[1]) if m[1] else None
+        body = text[m.end():]
+
+        # ЛЕВОЕ СОЕДИНЕНИЕ (ВЫБРАТЬ ... СУММА ...) КАК Итоги ПО (...)
+        self.join = None
+        j = _JOIN.search(body)
+        if j is not None:
+            close = _closing(body, j.end() - 1)
+            sub = body[j.end():close]
+            alias = _JOIN_ALIAS.match(body, close + 1)
+            src = _SOURCE.match(sub, _FROM.search(sub).end()) if _FROM.search(sub) else None
+            if alias is None or src is None or not src[3]:
+                raise FakeComError("Соединение не поддерживается имитацией")
+            sums = {name: column for column, name in _SUM.findall(sub)}
+            self.join = (alias[1], src[3], sums)
+            body = body[:j.start()] + body[_closing(body, alias.end()) + 1:]
+
+        f = _FROM.search(body)
+        if f is None:
+            raise FakeComError("Ожидается ИЗ")
+        select, tail = body[:f.start()], body[f.end():]
+        src = _SOURCE.match(tail)
+        if src is None:
+            raise FakeComError(f"Источник не поддерживается: {tail.strip()[:40]!r}")
+        kind, name, self.section, self.alias = src.groups()
+        tables = db.documents if kind == DOC else db.catalogs
+        self.table = tables.get(name)
+        if self.table is None or (self.section and self.section not in self.table.sections):
+            raise FakeComError(f'Таблица не найдена "{kind}.{name}"')
+        aliases = {self.alias} | ({self.join[0]} if self.join else set())
+        after = tail[src.end():]
+
+        self.where = None
+        self.narrow = None
+        w = _WHERE.search(after)
+        if w is not None:
+            self.where = _expression(w[1], aliases)
+            for how, pattern in (("ref", _BY_REF), ("refs", _BY_REFS), ("number", _BY_NUMBER)):
+                n = pattern.match(w[1])
+                if n is not None and n[1] == self.alias and (how != "number" or not self.section):
+                    self.narrow = (how, n[2])
+                    break
+
+        self.order = []
+        o = _ORDER.search(after)
+        if o is not None:
+            for item in _split(o[1]):
+                desc = item.upper().endswith(" УБЫВ")
+                item = re.sub(r"\s+(УБЫВ|ВОЗР)\s*\Z", "", item)
+                self.order.append((_expression(item, aliases), desc))
+
+        self.columns, self.names = [], []
+        for part in _split(select):
+            a = _ALIAS.match(part)
+            expr, label = (a[1], a[2]) if a else (part, part.split(".")[-1])
+            self.columns.append(_expression(expr, aliases))
+            self.names.append(label)
+
+    def _records(self, params: dict) -> Iterable[_Record]:
+        table = self.table
+        if self.narrow is None:
+            return table.records.values()
+        how, name = self.narrow
+        value = params.get(name)
+        if how == "number":
+            return [table.records[u] for u in table.by_number.get(str(value).strip(), ())]
+        refs = (value,) if how == "ref" else (value or ())
+        return [
+            table.records[r._uuid] for r in refs
+            if isinstance(r, FakeRef) and r._table is table and r._uuid in table.records
+        ]
+
+    def _contexts(self, params: dict):
+        alias, section, join = self.alias, self.section, self.join
+        for record in self._records(params):
+            if section:
+                for i, data in enumerate(record.sections.get(section, ())):
+                    yield {alias: _Line(record, i, data)}
+            elif join:
+                yield {alias: record, join[0]: _Totals(record, join[1], join[2])}
+            else:
+                yield {alias: record}
+
+    def run(self, params: dict) -> list[tuple]:
+        try:
+            rows = self._contexts(params)
+            where = self.where
+            rows = [c for c in rows if where(c, params)] if where else list(rows)
+            for key, desc in reversed(self.order):
+                rows.sort(key=lambda c: _sort_key(key(c, params)), reverse=desc)
+            if self.limit is not None:
+                del rows[self.limit:]
+            columns = self.columns
+            return [tuple(col(c, params) for col in columns) for c in rows]
+        except KeyError as e:
+            raise FakeComError(f"Не задано значение параметра {e}") from None
+
+
+def _param(value: Any) -> Any:
+    if isinstance(value, FakeArray):
+        return frozenset(value._items)
+    if isinstance(value, (list, tuple, set)):
+        return frozenset(value)
+    return _value(value)
+
+
+class FakeQuerySelection(_Com):
+    def __init__(self, names: list[str], rows: list[tuple]):
+        self._index = {name: i for i, name in enumerate(names)}
+        self._rows = rows
+        self._pos = -1
+        self._row: tuple | None = None
+
+    def Next(self):
+        self._pos += 1
+        if self._pos < len(self._rows):
+            self._row = self._rows[self._pos]
+            return True
+        self._row = None
+        return False
+
+    def Count(self):
+        return len(self._rows)
+
+    def Reset(self):
+        self._pos = -1
+        self._row = None
+
+    def __getattr__(self, name):
+        if name[0] == "_":
+            raise AttributeError(name)
+        i = self._index.get(name)
+        if i is None:
+            raise AttributeError(f"Поле объекта не обнаружено ({name})")
+        if self._row is None:
+            raise FakeComError("Нет текущей записи выборки")
+        return self._row[i]
+
+
+class FakeQueryResult(_Com):
+    def __init__(self, names: list[str], rows: list[tuple]):
+        self._names = names
+        self._rows = rows
+
+    def Select(self, *args):
+        return FakeQuerySelection(self._names, self._rows)
+
+    def IsEmpty(self):
+        return not self._rows
+
+    def Unload(self):
+        return FakeValueTable(self._names, [dict(zip(self._names, row)) for row in self._rows])
+
+
+class FakeQuery(_Com):
+    """``NewObject("Запрос")``: текст, параметры, ``Execute``/``ExecuteBatch``."""
+
+    def __init__(self, db: Database, text: str = ""):
+        self._db = db
+        self._text = str(text)
+        self._params: dict[str, Any] = {}
+
+    def __getattr__(self, name):
+        if name == "Text":
+            return self._text
+        raise AttributeError(name)
+
+    def _set(self, name, value):
+        if name != "Text":
+            super()._set(name, value)
+        self._text = str(value)
+
+    def _result(self, statement: _Statement) -> FakeQueryResult:
+        return FakeQueryResult(statement.names, statement.run(self._params))
+
+    def SetParameter(self, name, value):
+        self._params[name] = _param(value)
+
+    def Execute(self):
+        return self._result(self._db._compile(self._text)[-1])
+
+    def ExecuteBatch(self):
+        return FakeArray(self._result(s) for s in self._db._compile(self._text))
+
+
+# ─────────────  Подключение  ─────────────
+_INTERNAL = re.compile(r'\{"#",(\w+)\.(\w+)(?:,([0-9a-f-]+)|\.(\w*))\}')
+# УИД типа «Массив» во внутренней строке 1С
+_ARRAY_TYPE = "51e7a0d2-530b-11d4-b98a-008048da3034"
+
+
+def _internal_item(value: Any) -> str:
+    """Элемент массива во внутренней строке, как её формирует 1С."""
+    if isinstance(value, FakeRef):
+        kind = uuidlib.uuid5(uuidlib.NAMESPACE_OID, f"{value._table.kind}.{value._table.name}")
+        a, b, c, d, e = value._uuid.split("-")
+        return f'{{"#",{kind},1:{d}{e}{c}{b}{a}}}'
+    if isinstance(value, str):
+        return '{"S","%s"}' % value.replace('"', '""')
+    if isinstance(value, bool):
+        return f'{{"B",{int(value)}}}'
+    if isinstance(value, (int, float)):
+        return f'{{"N",{value}}}'
+    raise FakeComError("Значение не может быть преобразовано во внутреннюю строку")
+
+
+class FakeConnection(_Com):
+    """Результат ``V83.COMConnector.Connect``."""
+
+    def __init__(self, db: Database):
+        self._db = db
+        object.__setattr__(self, "Catalogs", FakeManagers(db.catalogs))
+        object.__setattr__(self, "Documents", FakeManagers(db.documents))
+        object.__setattr__(self, "Enums", FakeEnums(db.enums))
+        object.__setattr__(self, "Metadata", FakeMetadata(db))
+
+    def NewObject(self, type_name, *args):
+        if type_name in ("Запрос", "Query"):
+            return FakeQuery(self._db, *args)
+        if type_name in ("Массив", "Array"):
+            return FakeArray()
+        if type_name in ("ТаблицаЗначений", "ValueTable"):
+            return FakeValueTable()
+        if type_name in ("УникальныйИдентификатор", "UUID"):
+            return FakeUUID(args[0] if args else str(uuidlib.uuid4()))
+        raise FakeComError(f"Тип не определен ({type_name})")
+
+    def String(self, value):
+        return _presentation(value)
+
+    def GetObject(self, ref):
+        if isinstance(ref, FakeRef):
+            return ref._object()
+        raise FakeComError("Неверный тип параметра GetObject")
+
+    def BeginTransaction(self):
+        self._db._begin()
+
+    def CommitTransaction(self):
+        self._db._commit()
+
+    def RollbackTransaction(self):
+        self._db._rollback()
+
+    def TransactionActive(self):
+        return self._db._tx is not None
+
+    def ValueToStringInternal(self, value):
+        if isinstance(value, FakeArray):
+            items = "".join("," + _internal_item(v) for v in value._items)
+            return f'{{"#",{_ARRAY_TYPE},{{{len(value._items)}{items}}}}}'
+        if isinstance(value, FakeRef):
+            return f'{{"#",{value._table.kind}.{value._table.name},{value._uuid}}}'
+        if isinstance(value, FakeEnumValue):
+            return f'{{"#",Перечисление.{value._enum.name}.{value._name}}}'
+        raise FakeComError("Значение не может быть преобразовано во внутреннюю строку")
+
+    def ValueFromStringInternal(self, text):
+        m = _INTERNAL.fullmatch(str(text))
+        if m is None:
+            raise FakeComError("Ошибка преобразования данных XDTO")
+        kind, name, uid, value = m.groups()
+        if kind == "Перечисление":
+            enum = self._db.enums[name]
+            return enum.values.get(value, enum.empty)
+        tables = self._db.documents if kind == DOC else self._db.catalogs
+        return FakeRef(tables[name], uid)
+
+
+class FakeConnector(_Com):
+    def Connect(self, connection_string):
+        if _DATABASE is None:
+            raise FakeComError("Информационная база не найдена")
+        return FakeConnection(_DATABASE)
+
+
+_DATABASE: Database | None = None
+
+
+def _dispatch(progid, *args, **kwargs):
+    if progid not in ("V83.COMConnector", "V82.COMConnector"):
+        raise FakeComError(f"Недопустимая строка с указанием класса ({progid})")
+    return FakeConnector()
+
+
+def _time(value):
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromtimestamp(value)
+
+
+def install(db: Database | None = None) -> Database:
+    """Регистрирует имитации ``win32com``/``pythoncom``/``pywintypes``.
+
+    Вызывается до импорта ``core``: модули моста импортируют COM при загрузке.
+    """
+    global _DATABASE
+    if "core.com_bridge" in sys.modules:
+        raise RuntimeError("core.com_bridge уже импортирован с настоящим COM")
+    _DATABASE = db if db is not None else Database()
+
+    client = types.ModuleType("win32com.client")
+    client.Dispatch = client.DispatchEx = _dispatch
+    client.VARIANT = FakeVariant
+    win32com = types.ModuleType("win32com")
+    win32com.client = client
+
+    pywintypes = types.ModuleType("pywintypes")
+    pywintypes.com_error = FakeComError
+    pywintypes.Time = _time
+
+    pythoncom = types.ModuleType("pythoncom")
+    pythoncom.VT_BOOL = 11
+    pythoncom.com_error = FakeComError
+    pythoncom.CoInitialize = lambda: None
+    pythoncom.CoUninitialize = lambda: None
+
+    sys.modules.update({
+        "win32com": win32com,
+        "win32com.client": client,
+        "pywintypes": pywintypes,
+        "pythoncom": pythoncom,
+    })
+    return _DATABASE
+
+
+# ─────────────  Наполнение  ─────────────
+def seed(
+    orders: int = 1000,
+    tasks: int | None = None,
+    wax_jobs: int | None = None,
+    lines: int = 2,
+    articles: int = 300,
+    counterparties: int = 200,
+    random_seed: int = 1,
+) -> Database:
+    """База с синтетическими справочниками, заказами, заданиями и нарядами.
+
+    По умолчанию заданий в четыре раза меньше заказов, нарядов — по два на
+    задание. Документы равномерно распределены по двум годам, номера и
+    даты возрастают вместе.
+    """
+    tasks = orders // 4 if tasks is None else tasks
+    wax_jobs = tasks * 2 if wax_jobs is None else wax_jobs
+    rng = random.Random(random_seed)
+    db = Database()
+    item = db.add_item
+
+    org = item("Организации", "ООО «Ювелир»")
+    warehouses = [item("Склады", name) for name in ("Основной склад", "Склад восковки")]
+    user = item("Пользователи", "Администратор")
+    employees = [item("ФизическиеЛица", name) for name in ("Иванов И.И.", "Петров П.П.", "Администратор")]
+    operations = {
+        name: item("ТехОперации", name)
+        for name in ("3D печать", "Пресс-форма", "работа с восковыми изделиями")
+    }
+    section = item("ПроизводственныеУчастки", "задание на производство")
+    assay = item("Пробы", "585")
+    color = item("ЦветаМеталла", "красный")
+    inserts = item("ХарактеристикиВставок", "без вставок")
+    sizes = [item("Размеры", f"{x / 2:.1f}") for x in range(30, 47)]
+    contragents = [item("Контрагенты", f"Контрагент {i:04d}") for i in range(1, counterparties + 1)]
+    for i in range(1, counterparties + 1):
+        item("ДоговорыКонтрагентов", f"Договор {i:04d}")
+    for name in ("3D печать", "Резина"):
+        item("ВариантыИзготовленияНоменклатуры", name)
+
+    product = db.enum("ТипыНоменклатуры", "Продукция")
+    material = db.enum("ТипыНоменклатуры", "Материал")
+    nomenclature, variants = [], []
+    for i in range(articles):
+        art = f"{1000 + i}" + ("д" if i % 3 == 0 else "")
+        nomenclature.append(item(
+            "Номенклатура", f"Кольцо {art}", Артикул=art,
+            СреднийВес=round(rng.uniform(1.5, 8.0), 2), Размер1="17.0",
+            ТипНоменклатуры=material if i % 10 == 9 else product,
+        ))
+        variants.append([item("ВариантыИзготовленияНоменклатуры", f"{art}-{k}") for k in (1, 2)])
+
+    statuses = list(db.enums["ВидыСтатусыПродукции"].values.values())
+    norm = db.enum("ВидыНормативовНоменклатуры", "Номенклатура")
+    start, span = datetime(2023, 1, 1), 2 * 365 * 24 * 3600
+
+    def stamp(i: int, total: int) -> datetime:
+        return start + timedelta(seconds=span * i // max(total, 1))
+
+    order_refs, order_lines = [], []
+    for i in range(orders):
+        rows = []
+        for _ in range(lines):
+            a = rng.randrange(articles)
+            qty = rng.randint(1, 5)
+            rows.append({
+                "Номенклатура": nomenclature[a], "ВариантИзготовления": variants[a][rng.randrange(2)],
+                "Размер": rng.choice(sizes), "Количество": qty,
+                "Вес": round(qty * rng.uniform(1.5, 8.0), 3), "Примечание": "",
+            })
+        order_lines.append(rows)
+        order_refs.append(db.add_document(
+            "ЗаказВПроизводство", stamp(i, orders), {"Товары": rows},
+            Организация=org, Контрагент=rng.choice(contragents), Ответственный=user,
+            Склад=warehouses[0], Комментарий="", ВидСтатусПродукции=rng.choice(statuses),
+            Проведен=rng.random() < 0.8, ПометкаУдаления=rng.random() < 0.02,
+        ))
+
+    task_refs, task_lines = [], []
+    for j in range(tasks):
+        k = j * orders // tasks if orders else 0
+        rows = [
+            dict(r, Проба=assay, ЦветМеталла=color, ХарактеристикаВставок=inserts)
+            for r in (order_lines[k] if orders else ())
+        ]
+        task_lines.append(rows)
+        base = order_refs[k] if orders else None
+        task_refs.append(db.add_document(
+            "ЗаданиеНаПроизводство", stamp(j, tasks) + timedelta(hours=1), {"Продукция": rows},
+            Организация=org, Склад=warehouses[1], Ответственный=user,
+            ТехОперация=operations["работа с восковыми изделиями"],
+            ПроизводственныйУчасток=section, РабочийЦентр=rng.choice(employees),
+            ДокументОснование=base, ЗаказВПроизводство=base, Комментарий="",
+            Проведен=rng.random() < 0.8,
+        ))
+
+    for n in range(wax_jobs):
+        t = n * tasks // wax_jobs if tasks else 0
+        method = "3D печать" if n % 2 == 0 else "Пресс-форма"
+        task = task_refs[t] if tasks else None
+        db.add_document(
+            "НарядВосковыеИзделия", stamp(n, wax_jobs) + timedelta(hours=2),
+            {"ТоварыВыдано": [
+                {k: v for k, v in dict(r, ВидНорматива=norm).items() if k in _JOB_ROW}
+                for r in (task_lines[t] if tasks else ())
+            ]},
+            Организация=org, Склад=warehouses[1], Ответственный=user,
+            ТехОперация=operations[method], ПроизводственныйУчасток=section,
+            Сотрудник=rng.choice(employees), ДокументОснование=task,
+            ЗаданиеНаПроизводство=task, Комментарий=f"Создан автоматически для {method}",
+            Проведен=rng.random() < 0.7,
+        )
+    return db
@@ -2,7 +2,9 @@ import os
 from pathlib import Path
 from core.logger import logger  # инициализация логирования
 from core.com_bridge import COM1CBridge
-from core import config_parser
+from core.com_pool import ComPool
+from core.com_metrics import METRICS
+from core.reference_data import ReferenceData
 
 # Base directory of the project
 BASE_DIR = Path(__file__).resolve().parent
@@ -10,16 +12,39 @@ BASE_DIR = Path(__file__).resolve().parent
 # Path to 1C database
 ONEC_PATH = os.getenv("ONEC_PATH", "C:/Users/Mor/Desktop/1C/proiz")
 
-# Глобальный экземпляр COM‑моста
+# Глобальный экземпляр COM‑моста (заместитель, вызовы идут в поток COM)
 BRIDGE = None
+# Пул потоков COM, которым принадлежат подключения к 1С
+COM_POOL = None
+# Размер пула: 1 — только подключение для записи, остальные — для чтения
+COM_POOL_SIZE = int(os.getenv("COM_POOL_SIZE", "2"))
+# Метрики обращений к COM (панель «Метрики COM» и выгрузка в JSONL), по умолчанию выкл.
+COM_METRICS = os.getenv("COM_METRICS", "") == "1"
+COM_METRICS_FILE = os.getenv("COM_METRICS_FILE", str(BASE_DIR / "com_metrics.jsonl"))
+# Окно списков заданий и нарядов, дней: обновление сверяет только документы окна
+# (0 — все документы базы, тогда каждое обновление читает версии всех)
+WAX_LIST_DAYS = int(os.getenv("WAX_LIST_DAYS", "90"))
+
+# Справочные списки для выпадающих меню (читаются при первом обращении)
+REFERENCE_DATA = ReferenceData(ONEC_PATH)
 
 
 def init_bridge(user: str, password: str, base_path: str | None = None):
-    """Инициализирует подключение к 1С с указанными учётными данными."""
-    global BRIDGE
+    """Инициализирует подключение к 1С с указанными учётными данными.
+
+    Подключения создаются и живут в потоках COM (``COM_POOL``); ``BRIDGE`` —
+    синхронный заместитель моста для кода в потоке GUI.
+    """
+    global BRIDGE, COM_POOL
     if base_path is None:
         base_path = ONEC_PATH
-    BRIDGE = COM1CBridge(base_path, usr=user, pwd=password)
+    if COM_POOL is not None:
+        COM_POOL.stop()
+    if COM_METRICS and not METRICS.enabled:
+        METRICS.enable(COM_METRICS_FILE)
+    COM_POOL = ComPool(lambda: COM1CBridge(base_path, usr=user, pwd=password), COM_POOL_SIZE)
+    BRIDGE = COM_POOL.proxy()
+    REFERENCE_DATA.bind(BRIDGE)
     return BRIDGE
 
 # Application
@@ -87,61 +112,24 @@ QPushButton:hover{background:#2563eb;}
 
 # Список логинов сотрудников для выпадающего меню
 def load_employee_logins() -> list[str]:
-
-    """Возвращает список логинов сотрудников через COM с резервным чтением."""
-    fallback = ["Администратор"]
-
-    try:
-        bridge = BRIDGE or COM1CBridge(ONEC_PATH, usr="Администратор", pwd="")
-        items = bridge.list_catalog_items("Пользователи", 1000)
-        logins = [it.get("Description", "") for it in items if it.get("Description")]
-        if logins:
-            return logins
-    except Exception as exc:
-        logger.error("Не удалось получить логины через COM: %s", exc)
-
-    try:
-        users = config_parser.get_catalog_items("Пользователи")
-        return users or fallback
-    except Exception as exc:
-        logger.error("Не удалось загрузить логины из XML: %s", exc)
-        return fallback
-
-
-    """Загружает логины сотрудников из дампа конфигурации."""
-    try:
-        users = config_parser.get_catalog_items("Пользователи")
-        return users or ["Администратор"]
-    except Exception as exc:  # безопасность на случай проблем парсинга
-        logger.error("Не удалось загрузить логины сотрудников: %s", exc)
-        return ["Администратор"]
-
-
-EMPLOYEE_LOGINS = load_employee_logins()
+    """Возвращает список логинов сотрудников (до входа — из кэша или XML)."""
+    return REFERENCE_DATA.get("logins")
 
 
 # ------------------------------------------------------------------
 # Список сотрудников из справочника "ФизическиеЛица"
 def load_employees(limit: int = 200) -> list[str]:
-    """Возвращает ФИО сотрудников через COM с резервным чтением."""
-    try:
-        bridge = BRIDGE or COM1CBridge(ONEC_PATH, usr="Администратор", pwd="")
-        items = bridge.list_catalog_items("ФизическиеЛица", limit)
-        names = [it.get("Description", "") for it in items if it.get("Description")]
-        if names:
-            return names
-    except Exception as exc:  # pragma: no cover - защита от падения COM
-        logger.error("Не удалось получить сотрудников через COM: %s", exc)
-
-    try:
-        names = config_parser.get_catalog_items("ФизическиеЛица")
-        return names
-    except Exception as exc:
-        logger.error("Не удалось загрузить сотрудников из XML: %s", exc)
-        return []
-
-
-EMPLOYEES = load_employees()
+    """Возвращает ФИО сотрудников из справочника 'ФизическиеЛица'."""
+    return REFERENCE_DATA.get("employees")[:limit]
+
+
+def __getattr__(name: str):
+    # EMPLOYEE_LOGINS / EMPLOYEES вычисляются при обращении, а не при импорте
+    if name == "EMPLOYEE_LOGINS":
+        return load_employee_logins()
+    if name == "EMPLOYEES":
+        return load_employees()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Style for tree widgets used on the wax page
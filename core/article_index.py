@@ -0,0 +1,109 @@
+# article_index.py • индекс артикулов номенклатуры для автодополнения
+# -*- coding: utf-8 -*-
+"""Неизменяемый индекс артикулов, построенный по кэшу справочника.
+
+Строится один раз на версию справочника ``Номенклатура`` (см.
+``CatalogCache.article_index``) и передаётся в поток GUI как есть: после
+построения он только читается. Поиск по началу — двоичный по
+отсортированным ключам, поиск по части строки — по спискам n-грамм, так что
+подсказка не перебирает весь справочник на каждое нажатие клавиши.
+"""
+from __future__ import annotations
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from typing import Iterator
+
+# Длина n-грамм индекса подстрок: запрос длиннее ищется по n-граммам этой длины
+GRAM = 3
+
+
+def _grams(text: str, n: int) -> set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class ArticleIndex(Mapping):
+    """Артикул → карточка (``name``, ``ref``, ``variant``, ``size``, ``w``).
+
+    ``complete(text)`` — подсказки: сначала артикулы, начинающиеся с
+    ``text``, затем содержащие его, без учёта регистра, по алфавиту.
+    ``article_for(key)`` — артикул по наименованию или УИД номенклатуры.
+    """
+
+    def __init__(self, rows: list[dict]):
+        cards: dict[str, dict] = {}
+        for row in rows:
+            attrs = row["attrs"]
+            cards[attrs.get("Артикул") or ""] = {
+                "ref": row["uuid"],
+                "name": row["Description"],
+                "variant": attrs.get("ВариантИзготовления") or "",
+                "size": attrs.get("Размер1", ""),
+                "w": attrs.get("СреднийВес") or 0,
+            }
+        self._cards = cards
+        # обратный индекс: наименование / УИД → артикул (первый встреченный)
+        by_name: dict[str, str] = {}
+        for art, card in cards.items():
+            for key in (card["name"], card["ref"]):
+                if key:
+                    by_name.setdefault(key, art)
+        self._by_name = by_name
+        # артикулы по алфавиту без учёта регистра и их ключи для bisect
+        self._sorted = sorted((a for a in cards if a), key=str.casefold)
+        self._keys = [a.casefold() for a in self._sorted]
+        # n-грамма (длиной 1..GRAM) → номера в _sorted по возрастанию
+        grams: dict[str, array] = {}
+        for i, key in enumerate(self._keys):
+            for n in range(1, GRAM + 1):
+                for gram in _grams(key, n):
+                    grams.setdefault(gram, array("I")).append(i)
+        self._grams = grams
+
+    # --- Mapping ---
+    def __getitem__(self, article: str) -> dict:
+        return self._cards[article]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._cards)
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    # --- поиск ---
+    def _prefixed(self, key: str) -> range:
+        start = bisect_left(self._keys, key)
+        end = bisect_left(self._keys, key + "\U0010ffff", start)
+        return range(start, end)
+
+    def _containing(self, key: str) -> list[int]:
+        """Номера ключей, содержащих ``key``, по возрастанию."""
+        n = min(len(key), GRAM)
+        postings = sorted((self._grams.get(g, ()) for g in _grams(key, n)), key=len)
+        if not postings or not postings[0]:
+            return []
+        found = set(postings[0])
+        for other in postings[1:]:
+            found.intersection_update(other)
+            if not found:
+                return []
+        return [i for i in sorted(found) if key in self._keys[i]]
+
+    def complete(self, text: str, limit: int = 50) -> list[str]:
+        """Подсказки для введённого текста: сначала по началу, затем по части."""
+        key = text.strip().casefold()
+        if not key:
+            return self._sorted[:limit]
+        prefixed = self._prefixed(key)
+        result = [self._sorted[i] for i in prefixed[:limit]]
+        if len(result) < limit:
+            for i in self._containing(key):
+                if i not in prefixed:
+                    result.append(self._sorted[i])
+                    if len(result) >= limit:
+                        break
+        return result
+
+    def article_for(self, key: str) -> str:
+        """Артикул по наименованию или УИД номенклатуры, '' если не найден."""
+        return self._by_name.get(key, "")
@@ -0,0 +1,378 @@
+# catalog_cache.py • локальный кэш справочников 1С (SQLite)
+# -*- coding: utf-8 -*-
+"""Постоянный кэш элементов справочников.
+
+Для каждого справочника хранится УИД, версия данных, код, наименование и
+набор реквизитов (``CATALOG_FIELDS``). При старте данные читаются с диска,
+а сверка с базой выполняется одним запросом на справочник: УИД и версии
+всех строк получаются одной внутренней строкой 1С, а строки с неизменной
+``ВерсияДанных`` не перечитываются.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from . import config_parser, queries
+from .article_index import ArticleIndex
+from .com_bridge import safe_str
+from .logger import get_logger
+
+_log = get_logger(__name__)
+
+# Каталог для файлов кэша (по одному на информационную базу)
+CACHE_DIR = Path(__file__).resolve().parent.parent / "data"
+
+# Дополнительные реквизиты, которые кэшируются для справочника
+# (реквизиты, которых нет в конфигурации, пропускаются — см. ``catalog_fields``)
+CATALOG_FIELDS: dict[str, tuple[str, ...]] = {
+    "Номенклатура": ("Артикул", "ВариантИзготовления", "СреднийВес", "Размер1"),
+}
+
+# Ссылка во внутренней строке 1С: {"#",<УИД типа>,<N>:<УИД в порядке хранения>}
+_REF_ID = re.compile(r'\{"#",[0-9a-f-]{36},\d+:([0-9a-f]{32})\}')
+# Строка или число во внутренней строке 1С: {"S","..."} / {"N",...}
+_PRIMITIVE = re.compile(r'\{"[SN]",("(?:[^"]|"")*"|[^{}]*)\}')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items(
+    catalog     TEXT NOT NULL,
+    uuid        TEXT NOT NULL,
+    version     TEXT,
+    code        TEXT,
+    description TEXT,
+    attrs       TEXT,
+    pos         INTEGER,
+    PRIMARY KEY (catalog, uuid)
+);
+CREATE TABLE IF NOT EXISTS catalogs(
+    catalog TEXT PRIMARY KEY,
+    fields  TEXT
+);
+"""
+
+
+def _plain(value: Any) -> Any:
+    """Приводит значение из 1С к типу, который можно сохранить в JSON."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return safe_str(value)
+
+
+def _ref_uuid(stored: str) -> str:
+    """УИД ссылки из 32 hex-символов внутренней строки (порядок хранения 1С)."""
+    h = stored
+    return f"{h[24:32]}-{h[20:24]}-{h[16:20]}-{h[0:4]}-{h[4:16]}"
+
+
+def _primitive(text: str) -> str:
+    return text[1:-1].replace('""', '"') if text.startswith('"') else text
+
+
+def _column_keys(connection: Any, table: Any) -> list[tuple[str, str]] | None:
+    """УИД и версия данных каждой строки выгрузки запроса.
+
+    Колонки ``Ссылка`` и ``ВерсияДанных`` выгружаются массивами и читаются
+    одной внутренней строкой 1С на колонку — число обращений к COM не
+    зависит от размера справочника. None — если строку разобрать не удалось.
+    """
+    count = table.Count()
+    refs = str(connection.ValueToStringInternal(table.UnloadColumn("Ссылка")))
+    versions = str(connection.ValueToStringInternal(table.UnloadColumn("ВерсияДанных")))
+    uuids = [_ref_uuid(h) for h in _REF_ID.findall(refs)]
+    stamps = [_primitive(v) for v in _PRIMITIVE.findall(versions)]
+    if len(uuids) != count or len(stamps) != count:
+        return None
+    return list(zip(uuids, stamps))
+
+
+def catalog_fields(catalog: str) -> tuple[str, ...]:
+    """Кэшируемые реквизиты справочника, которые есть в конфигурации.
+
+    Реквизиты сверяются с индексом метаданных (``config_parser``); без
+    выгрузки конфигурации берутся все из ``CATALOG_FIELDS``.
+    """
+    names = CATALOG_FIELDS.get(catalog, ())
+    known = config_parser.get_object_fields("Catalog", catalog)
+    return tuple(n for n in names if n in known) if known else names
+
+
+def cache_path(base_path: str) -> Path:
+    """Файл кэша для информационной базы по её пути."""
+    digest = hashlib.sha1(str(base_path).lower().encode("utf-8")).hexdigest()[:12]
+    return CACHE_DIR / f"catalog_cache_{digest}.sqlite"
+
+
+class CatalogCache:
+    """Кэш справочников с ленивым получением ссылок по УИД."""
+
+    def __init__(self, bridge: 'COM1CBridge | None', path: str | Path):
+        self.bridge = bridge
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._db: sqlite3.Connection | None = None
+        # справочник → строки в порядке выборки
+        self._rows: dict[str, list[dict]] = {}
+        # справочник → нормализованное наименование → УИД
+        self._by_desc: dict[str, dict[str, str]] = {}
+        # (справочник, УИД) → ссылка 1С
+        self._refs: dict[tuple[str, str], Any] = {}
+        # справочники, сверенные с базой в текущем сеансе
+        self._validated: set[str] = set()
+        # индекс артикулов номенклатуры, строится по первому запросу
+        self._articles: ArticleIndex | None = None
+
+    # -------------------------------------------------------------
+    def _conn(self) -> sqlite3.Connection | None:
+        if self._db is None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+                self._db.executescript(_SCHEMA)
+            except Exception as e:
+                _log.warning("[CatalogCache] Кэш на диске недоступен (%s): %s", self.path, e)
+                self._db = None
+        return self._db
+
+    @staticmethod
+    def _key(catalog: str, description: Any) -> str:
+        key = str(description).strip().lower()
+        if catalog == "Размеры":
+            key = key.replace(",", ".")
+        return key
+
+    def _set_rows(self, catalog: str, rows: list[dict]) -> None:
+        self._rows[catalog] = rows
+        by_desc: dict[str, str] = {}
+        for row in rows:
+            by_desc[self._key(catalog, row["Description"])] = row["uuid"]
+        self._by_desc[catalog] = by_desc
+        if catalog == "Номенклатура":
+            self._articles = None
+
+    def _load_disk(self, catalog: str) -> list[dict] | None:
+        db = self._conn()
+        if db is None:
+            return None
+        fields = json.dumps(catalog_fields(catalog), ensure_ascii=False)
+        with self._lock:
+            stored = db.execute(
+                "SELECT fields FROM catalogs WHERE catalog = ?", (catalog,)
+            ).fetchone()
+            if stored is None or stored[0] != fields:
+                return None
+            cur = db.execute(
+                "SELECT uuid, version, code, description, attrs FROM items "
+                "WHERE catalog = ? ORDER BY pos",
+                (catalog,),
+            )
+            return [
+                {
+                    "uuid": uuid,
+                    "version": version,
+                    "Code": code,
+                    "Description": description,
+                    "attrs": json.loads(attrs or "{}"),
+                }
+                for uuid, version, code, description, attrs in cur
+            ]
+
+    def _save_disk(self, catalog: str, rows: list[dict]) -> None:
+        db = self._conn()
+        if db is None:
+            return
+        fields = json.dumps(catalog_fields(catalog), ensure_ascii=False)
+        with self._lock:
+            try:
+                with db:
+                    db.execute("DELETE FROM items WHERE catalog = ?", (catalog,))
+                    db.executemany(
+                        "INSERT INTO items(catalog, uuid, version, code, description, attrs, pos) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (
+                                catalog, r["uuid"], r["version"], r["Code"], r["Description"],
+                                json.dumps(r["attrs"], ensure_ascii=False), pos,
+                            )
+                            for pos, r in enumerate(rows)
+                        ],
+                    )
+                    db.execute(
+                        "INSERT OR REPLACE INTO catalogs(catalog, fields) VALUES (?, ?)",
+                        (catalog, fields),
+                    )
+            except Exception as e:
+                _log.warning("[CatalogCache] Не удалось сохранить '%s': %s", catalog, e)
+
+    # -------------------------------------------------------------
+    def _read_query(self, catalog: str, known: dict[str, dict]) -> list[dict]:
+        """Сверка одним запросом: построчно читаются только изменённые строки.
+
+        УИД и версии всех строк берутся из ``_column_keys``; если внутреннюю
+        строку разобрать не удалось, они читаются из каждой строки выгрузки.
+        """
+        names = catalog_fields(catalog)
+        extra = "".join(f",\n    Т.{name} КАК {name}" for name in names)
+        connection = self.bridge.connection
+        query = connection.NewObject("Запрос")
+        query.Text = queries.CATALOG_ITEMS.format(catalog=catalog, fields=extra)
+        table = query.Execute().Unload()
+        keys = _column_keys(connection, table)
+        if keys is None:
+            _log.warning("[CatalogCache] Ключи '%s' читаются построчно", catalog)
+            keys = []
+            for line in table:
+                ref = line.Ссылка
+                uuid = str(connection.String(ref.UUID()))
+                self._refs[(catalog, uuid)] = ref
+                keys.append((uuid, str(line.ВерсияДанных)))
+        rows = []
+        for i, (uuid, version) in enumerate(keys):
+            row = known.get(uuid)
+            if row is None or row["version"] != version:
+                line = table.Get(i)
+                row = {
+                    "uuid": uuid,
+                    "version": version,
+                    "Code": str(line.Код),
+                    "Description": str(line.Наименование),
+                    "attrs": {name: _plain(getattr(line, name)) for name in names},
+                }
+                self._refs[(catalog, uuid)] = line.Ссылка
+            rows.append(row)
+        return rows
+
+    def _read_objects(self, catalog: str) -> list[dict]:
+        """Резервное чтение через объекты (если запрос не выполнился)."""
+        manager = getattr(self.bridge.catalogs, catalog, None)
+        if manager is None:
+            return []
+        to_string = self.bridge.connection.String
+        rows = []
+        selection = manager.Select()
+        while selection.Next():
+            obj = selection.GetObject()
+            uuid = str(to_string(obj.Ref.UUID()))
+            rows.append({
+                "uuid": uuid,
+                "version": str(getattr(obj, "DataVersion", "")),
+                "Code": str(obj.Code),
+                "Description": str(obj.Description),
+                "attrs": {
+                    name: _plain(getattr(obj, name, None))
+                    for name in catalog_fields(catalog)
+                },
+            })
+            self._refs[(catalog, uuid)] = obj.Ref
+        return rows
+
+    def revalidate(self, catalog: str) -> bool:
+        """Сверяет справочник с базой и обновляет кэш. False — справочника нет."""
+        if getattr(self.bridge.catalogs, catalog, None) is None:
+            _log.error("[CatalogCache] Справочник '%s' не найден", catalog)
+            self._validated.add(catalog)
+            return False
+        known = {r["uuid"]: r for r in self._rows.get(catalog) or self._load_disk(catalog) or []}
+        try:
+            rows = self._read_query(catalog, known)
+        except Exception as e:
+            _log.warning("[CatalogCache] Запрос по '%s' не выполнен, читаем объекты: %s", catalog, e)
+            try:
+                rows = self._read_objects(catalog)
+            except Exception as exc:
+                _log.error("[CatalogCache] Ошибка чтения '%s': %s", catalog, exc)
+                return False
+
+        changed = len(rows) != len(known) or any(
+            known.get(r["uuid"]) is not r for r in rows
+        )
+        self._set_rows(catalog, rows)
+        self._validated.add(catalog)
+        if changed:
+            self._save_disk(catalog, rows)
+            _log.info("[CatalogCache] ✅ '%s' обновлён: %s элементов", catalog, len(rows))
+        return True
+
+    def _disk_catalogs(self) -> list[str]:
+        db = self._conn()
+        if db is None:
+            return []
+        with self._lock:
+            return [name for (name,) in db.execute("SELECT catalog FROM catalogs ORDER BY catalog")]
+
+    def revalidate_all(self) -> None:
+        """Сверяет с базой справочники, прочитанные в этом сеансе или лежащие в кэше на диске."""
+        for catalog in dict.fromkeys([*self._rows, *self._disk_catalogs()]):
+            if catalog not in self._validated:
+                self.revalidate(catalog)
+
+    def invalidate(self, catalog: str) -> None:
+        """Сбрасывает признак сверки — следующий промах перечитает справочник."""
+        self._validated.discard(catalog)
+
+    # -------------------------------------------------------------
+    def items(self, catalog: str) -> list[dict]:
+        """Элементы справочника: с диска, а при отсутствии кэша — из базы."""
+        rows = self.peek(catalog)
+        if rows is None:
+            self.revalidate(catalog)
+            rows = self._rows.get(catalog, [])
+        return rows
+
+    def peek(self, catalog: str) -> list[dict] | None:
+        """Элементы справочника только из памяти/с диска, без обращения к 1С."""
+        rows = self._rows.get(catalog)
+        if rows is None:
+            rows = self._load_disk(catalog)
+            if rows is not None:
+                self._set_rows(catalog, rows)
+        return rows
+
+    def article_index(self) -> ArticleIndex:
+        """Индекс артикулов номенклатуры; перестраивается после обновления справочника."""
+        rows = self.items("Номенклатура")
+        if self._articles is None:
+            self._articles = ArticleIndex(rows)
+        return self._articles
+
+    def ref(self, catalog: str, uuid: str):
+        """Ссылка на элемент по УИД (создаётся при первом обращении)."""
+        key = (catalog, uuid)
+        ref = self._refs.get(key)
+        if ref is None:
+            manager = getattr(self.bridge.catalogs, catalog, None)
+            if manager is None:
+                return None
+            try:
+                ref = manager.GetRef(
+                    self.bridge.connection.NewObject("УникальныйИдентификатор", uuid)
+                )
+            except Exception as e:
+                _log.error("[CatalogCache] Ссылка %s %s: %s", catalog, uuid, e)
+                return None
+            self._refs[key] = ref
+        return ref
+
+    def find_uuid(self, catalog: str, description: Any) -> str | None:
+        """УИД элемента по наименованию; при промахе справочник сверяется с базой."""
+        self.items(catalog)
+        key = self._key(catalog, description)
+        uuid = self._by_desc.get(catalog, {}).get(key)
+        if uuid is None and catalog not in self._validated:
+            self.revalidate(catalog)
+            uuid = self._by_desc.get(catalog, {}).get(key)
+        return uuid
+
+    def find_ref(self, catalog: str, description: Any):
+        """Ссылка на элемент справочника по наименованию или None."""
+        uuid = self.find_uuid(catalog, description)
+        return self.ref(catalog, uuid) if uuid else None
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
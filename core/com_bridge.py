@@ -7,12 +7,16 @@ import tempfile
 from typing import Any, Dict, List
 from win32com.client import VARIANT
 from pythoncom import VT_BOOL
+from bisect import bisect_left
 from collections import defaultdict
+from itertools import islice
 from datetime import datetime, timedelta
 
-from .logger import logger
+from .logger import get_logger
 import config
 
+_log = get_logger(__name__)
+
 # ---------------------------
 # Маппинг описаний в системные имена перечисления
 # ---------------------------
@@ -44,21 +48,13 @@ def safe_str(val: Any) -> str:
         
        
 
-def log(msg: str) -> None:
-    """Выводит сообщение через модуль logging с определением уровня."""
-    text = str(msg)
-    lower = text.lower()
-    if "❌" in text or "error" in lower or "ошибка" in lower:
-        logger.error(text)
-    elif "⚠" in text or "warning" in lower:
-        logger.warning(text)
-    else:
-        logger.info(text)
-
-
-
 from .orders_bridge import OrdersBridge
 from .wax_bridge import WaxBridge
+from .doc_index import DocumentIndex
+from .catalog_cache import CatalogCache, cache_path
+from .enum_index import EnumIndex
+from .com_metrics import METRICS
+from .numbering import NumberAllocator
 
 class COM1CBridge:
     PRODUCTION_STATUSES = [
@@ -71,14 +67,22 @@ class COM1CBridge:
     
     def __init__(self, base_path, usr="Администратор", pwd=""):
         self.connector = win32com.client.Dispatch("V83.COMConnector")
-        self.connection = self.connector.Connect(
+        # при включённых метриках подключение считает обращения к COM
+        self.connection = METRICS.wrap(self.connector.Connect(
             f'File="{base_path}";Usr="{usr}";Pwd="{pwd}"'
-        )
+        ))
         self.catalogs = self.connection.Catalogs
         self.documents = self.connection.Documents
         self.enums = self.connection.Enums
-        # Кэш ссылок на элементы справочников
-        self._ref_cache: dict[str, dict[str, Any]] = {}
+        # Значения перечислений по метаданным (имя/представление → значение)
+        self.enum_index = EnumIndex(self)
+        # Локальный кэш справочников (SQLite в data/)
+        self.catalog_cache = CatalogCache(self, cache_path(base_path))
+        # Индекс документов: номер + дата → ссылка
+        self.doc_index = DocumentIndex(self)
+        # Последние номера заказов и заданий (для форм новых документов)
+        self.order_numbers = NumberAllocator(self, "ЗаказВПроизводство", "00ЮП")
+        self.task_numbers = NumberAllocator(self, "ЗаданиеНаПроизводство", "ТП")
 
         # Разделённые мосты для разных страниц
         self.orders_bridge = OrdersBridge(self)
@@ -88,28 +92,25 @@ class COM1CBridge:
         
     def get_wax_job_lines(self, doc_num: str) -> list[dict]:
         """Возвращает табличную часть 'ТоварыВыдано' по номеру наряда"""
-        result = []
-        doc_manager = getattr(self.connection.Documents, "НарядВосковыеИзделия", None)
-        if not doc_manager:
-            return result
+        return self.wax_bridge.get_wax_job_lines(doc_num)
+
+    def query_select(self, text: str, **params):
+        """Выполняет запрос 1С и возвращает выборку из его результата."""
+        query = self.connection.NewObject("Запрос")
+        query.Text = text
+        for name, value in params.items():
+            query.SetParameter(name, value)
+        return query.Execute().Select()
+
+    def query_batch(self, text: str, **params) -> list:
+        """Выполняет пакетный запрос 1С, возвращает выборки по каждому запросу пакета."""
+        query = self.connection.NewObject("Запрос")
+        query.Text = text
+        for name, value in params.items():
+            query.SetParameter(name, value)
+        results = query.ExecuteBatch()
+        return [results.Get(i).Select() for i in range(results.Count())]
 
-        selection = doc_manager.Select()
-        while selection.Next():
-            doc = selection.GetObject()
-            if str(doc.Number) == doc_num:
-                for row in doc.ТоварыВыдано:
-                    result.append({
-                        "norm": self.safe(row, "ВидНорматива"),
-                        "nomen": self.safe(row, "Номенклатура"),
-                        "size": self.safe(row, "Размер"),
-                        "sample": self.safe(row, "Проба"),
-                        "color": self.safe(row, "ЦветМеталла"),
-                        "qty": row.Количество,
-                        "weight": round(float(row.Вес), config.WEIGHT_DECIMALS) if hasattr(row, "Вес") else "",
-                    })
-                break
-        return result    
-        
     def safe(self, obj, attr):
         try:
             val = getattr(obj, attr, None)
@@ -130,35 +131,20 @@ class COM1CBridge:
         return self.orders_bridge.print_order_preview_pdf(number, date)
 
     def _find_document_by_number(self, doc_name: str, number: str, date: str | None = None):
-        doc = getattr(self.documents, doc_name, None)
-        if not doc:
-            log(f"[ERROR] Документ '{doc_name}' не найден")
+        if getattr(self.documents, doc_name, None) is None:
+            _log.error("Документ '%s' не найден", doc_name)
             return None
-        selection = doc.Select()
-        found = None
-        while selection.Next():
-            obj = selection.GetObject()
-            if str(obj.Number).strip() == number.strip():
-                if date:
-                    if str(obj.Date)[:10] == str(date)[:10]:
-                        return obj
-                elif not found or obj.Date > found.Date:
-                    found = obj
-        return found
-        
+        return self.doc_index.find_object(doc_name, number, date)
+
     def _find_doc(self, doc_name: str, num: str):
         """Находит документ по имени и номеру"""
-        try:
-            docs = getattr(self.connection.Documents, doc_name)
-        except AttributeError:
+        if getattr(self.connection.Documents, doc_name, None) is None:
             raise Exception(f"Документ '{doc_name}' не найден")
 
-        selection = docs.Select()
-        while selection.Next():
-            doc = selection.GetObject()
-            if str(doc.Number).strip() == str(num).strip():
-                return doc
-        raise Exception(f"Документ '{doc_name}' с номером {num} не найден")    
+        doc = self.doc_index.find_object(doc_name, num)
+        if doc is None:
+            raise Exception(f"Документ '{doc_name}' с номером {num} не найден")
+        return doc
 
     def undo_posting(self, number: str, date: str | None = None) -> bool:
         """Снимает проведение заказа через OrdersBridge."""
@@ -182,45 +168,39 @@ class COM1CBridge:
         return self.orders_bridge.unmark_order_deletion(number, date)
 
     def get_articles(self):
-        result = {}
-        catalog = getattr(self.catalogs, "Номенклатура", None)
-        if not catalog:
-            return result
-        selection = catalog.Select()
-        while selection.Next():
-            obj = selection.GetObject()
-            art = safe_str(getattr(obj, "Артикул", ""))
-            result[art] = {
-                "name": safe_str(obj.Description),
-                "variant": safe_str(getattr(obj, "ВариантИзготовления", "")),
-                "size": getattr(obj, "Размер1", ""),
-                "w": getattr(obj, "СреднийВес", 0),
-            }
-        return result
+        return dict(self.catalog_cache.article_index())
+
+    def get_article_index(self):
+        """Индекс артикулов для подсказок (см. ``core.article_index``)."""
+        return self.catalog_cache.article_index()
 
     def get_size_ref(self, size_value):
         """Возвращает ссылку на размер с учётом кеша."""
         desc = str(size_value).strip().replace(",", ".")
         ref = self.get_ref_by_description("Размеры", desc)
         if not ref:
-            log(f"❌ Размер '{size_value}' не найден в справочнике 'Размеры'")
+            _log.error("Размер '%s' не найден в справочнике 'Размеры'", size_value)
         return ref
 
     def cache_variants(self):
-        self._all_variants = []
-        catalog = getattr(self.catalogs, "ВариантыИзготовленияНоменклатуры", None)
-        if catalog is None:
-            return
-        selection = catalog.Select()
-        while selection.Next():
-            item = selection.GetObject()
-            self._all_variants.append(str(item.Description))
+        """Строит индекс вариантов изготовления: отсортированный список имён
+        для поиска по префиксу «артикул-» двоичным поиском."""
+        self._all_variants = sorted(
+            item["Description"]
+            for item in self.catalog_cache.items("ВариантыИзготовленияНоменклатуры")
+        )
 
     def get_variants_by_article(self, article_prefix: str) -> list[str]:
         if not hasattr(self, "_all_variants"):
             self.cache_variants()
         prefix = article_prefix.strip() + "-"
-        return [name for name in self._all_variants if name.startswith(prefix)]
+        variants = self._all_variants
+        result = []
+        for i in range(bisect_left(variants, prefix), len(variants)):
+            if not variants[i].startswith(prefix):
+                break
+            result.append(variants[i])
+        return result
 
 
     def get_ref(self, catalog_name, description):
@@ -229,80 +209,23 @@ class COM1CBridge:
 
 
     def get_enum_by_description(self, enum_name: str, description: str):
-        """Возвращает элемент перечисления по его представлению"""
-        enum = getattr(self.enums, enum_name, None)
-        if not enum:
-            log(f"Перечисление '{enum_name}' не найдено")
+        """Возвращает элемент перечисления по имени или представлению (см. EnumIndex)."""
+        if not self.enum_index.exists(enum_name):
+            _log.info("Перечисление '%s' не найдено", enum_name)
             return None
         if description is None:
             return None
-
-        desc = str(description).strip()
-        # Попытка прямого доступа по имени атрибута
-        try:
-            if hasattr(enum, desc):
-                return getattr(enum, desc)
-        except Exception:
-            pass
-
-        low_desc = desc.lower()
-        try:
-            for attr in dir(enum):
-                if attr.startswith("_"):
-                    continue
-                try:
-                    val = getattr(enum, attr)
-                except Exception:
-                    continue
-                pres = ""
-                try:
-                    if hasattr(val, "GetPresentation"):
-                        pres = str(val.GetPresentation())
-                    elif hasattr(val, "Presentation"):
-                        pres = str(val.Presentation)
-                    else:
-                        pres = str(val)
-                except Exception:
-                    pres = str(val)
-
-                if pres.strip().lower() == low_desc or attr.lower() == low_desc:
-                    return val
-        except Exception as e:
-            log(f"[Enum] Ошибка поиска {description} в {enum_name}: {e}")
-
-        log(f"[{enum_name}] Не найдено значение: {description}")
-        return None
+        value = self.enum_index.find(enum_name, description)
+        if value is None:
+            _log.info("[%s] Не найдено значение: %s", enum_name, description)
+        return value
 
     def list_enum_values(self, enum_name: str) -> list[str]:
         """Возвращает список представлений элементов перечисления."""
-        enum = getattr(self.enums, enum_name, None)
-        if not enum:
-            log(f"Перечисление '{enum_name}' не найдено")
+        if not self.enum_index.exists(enum_name):
+            _log.info("Перечисление '%s' не найдено", enum_name)
             return []
-        values: list[str] = []
-        try:
-            for attr in dir(enum):
-                if attr.startswith("_"):
-                    continue
-                try:
-                    val = getattr(enum, attr)
-                except Exception:
-                    continue
-                pres = ""
-                try:
-                    if hasattr(val, "GetPresentation"):
-                        pres = str(val.GetPresentation())
-                    elif hasattr(val, "Presentation"):
-                        pres = str(val.Presentation)
-                    else:
-                        pres = str(val)
-                except Exception:
-                    pres = str(val)
-                if pres:
-                    values.append(pres)
-        except Exception as e:
-            log(f"[list_enum_values] Ошибка чтения {enum_name}: {e}")
-        return values
+        return self.enum_index.presentations(enum_name)
 
     def get_last_order_number(self):
         """Возвращает последний номер заказа через OrdersBridge."""
@@ -315,35 +238,18 @@ class COM1CBridge:
     # ------------------------------------------------------------------
     def get_last_task_number(self):
         """Возвращает номер последнего документа 'ЗаданиеНаПроизводство'."""
-        doc = getattr(self.documents, "ЗаданиеНаПроизводство", None)
-        if not doc:
-            return "ТП-000000"
-        selection = doc.Select()
-        number = "ТП-000000"
-        while selection.Next():
-            try:
-                obj = selection.GetObject()
-                number = str(obj.Number)
-            except Exception:
-                continue
-        return number
+        return self.task_numbers.last()
 
     def get_next_task_number(self):
         """Возвращает следующий номер задания на производство."""
-        last = self.get_last_task_number()
-        try:
-            prefix, num = last.split("-")
-            next_num = int(num) + 1
-            return f"{prefix}-{next_num:06d}"
-        except Exception:
-            return "ТП-000001"
-            
+        return self.task_numbers.next()
+
     def to_string(self, value):
         """Возвращает строковое представление значения через 1С Application"""
         try:
             return str(self.connection.String(value))
         except Exception as e:
-            log(f"[to_string] Ошибка получения строки: {e}")
+            _log.error("[to_string] Ошибка получения строки: %s", e)
             return "[??]"     
             
     def get_catalog_object_by_description(self, catalog_name, description):
@@ -356,270 +262,131 @@ class COM1CBridge:
             }
             internal = predefined.get(description.strip())
             if internal:
-                enum = getattr(self.enums, "ВидыСтатусыПродукции", None)
-                if enum:
-                    try:
-                        val = getattr(enum, internal)
-                        log(f"[{catalog_name}] Найден (Enum): {description} → {internal}")
+                try:
+                    val = self.enum_index.value(catalog_name, internal)
+                    if val is not None:
+                        _log.debug("[%s] Найден (Enum): %s → %s", catalog_name, description, internal)
                         return val
-                    except Exception as e:
-                        log(f"[Enum Error] {catalog_name}.{internal}: {e}")
-            log(f"[{catalog_name}] Не найден по описанию: {description}")
+                except Exception as e:
+                    _log.error("[Enum Error] %s.%s: %s", catalog_name, internal, e)
+            _log.info("[%s] Не найден по описанию: %s", catalog_name, description)
             return None
 
         catalog = getattr(self.catalogs, catalog_name, None)
         if not catalog:
-            log(f"Каталог '{catalog_name}' не найден")
+            _log.info("Каталог '%s' не найден", catalog_name)
             return None
         selection = catalog.Select()
         while selection.Next():
             obj = selection.GetObject()
             if str(obj.Description).strip() == str(description).strip():
-                log(f"[{catalog_name}] Найден: {description}")
+                _log.debug("[%s] Найден: %s", catalog_name, description)
                 return obj
-        log(f"[{catalog_name}] Не найден: {description}")
+        _log.info("[%s] Не найден: %s", catalog_name, description)
         return None        
 
     def update_order(self, number: str, fields: dict, items: list, date: str | None = None) -> bool:
-        obj = self._find_document_by_number("ЗаказВПроизводство", number, date)
-        if not obj:
-            log(f"[Обновление] Заказ №{number} не найден")
-            return False
-
-        # Установка полей
-        for k, v in fields.items():
-            try:
-                if k == "ВидСтатусПродукции":
-                    ref = self.get_ref("ВидыСтатусыПродукции", v)
-                    if ref:
-                        setattr(obj, k, ref)
-                    continue
-                if k in ["Организация", "Контрагент", "ДоговорКонтрагента", "Ответственный", "Склад"]:
-                    ref = self.get_ref(k + "ы" if not k.endswith("т") else k + "а", v)
-                    if ref:
-                        setattr(obj, k, ref)
-                    continue
-                setattr(obj, k, v)
-            except Exception as e:
-                log(f"[Обновление] Ошибка установки поля {k}: {e}")
-
-        # Очищаем старые строки
-        while len(obj.Товары) > 0:
-            obj.Товары.Delete(0)
-
-        # Добавляем новые строки
-        for row in items:
-            try:
-                new_row = obj.Товары.Add()
-                new_row.Номенклатура = self.get_ref("Номенклатура", row.get("Номенклатура"))
-                variant = row.get("ВариантИзготовления")
-                if variant and variant != "—":
-                    new_row.ВариантИзготовления = self.get_ref("ВариантыИзготовленияНоменклатуры", variant)
-                size_val = row.get("Размер", 0)
-                new_row.Размер = self.get_size_ref(size_val)
-                new_row.Количество = int(row.get("Количество", 1))
-                new_row.Вес = float(row.get("Вес", 0))
-                new_row.Примечание = row.get("Примечание", "")
-            except Exception as e:
-                log(f"[Обновление] Ошибка в строке заказа: {e}")
-
-        try:
-            obj.Write()
-            log(f"✔ Обновлён заказ №{number}")
-            return True
-        except Exception as e:
-            log(f"[Обновление] Ошибка при записи: {e}")
-            return False        
-   
+        """Обновляет заказ через OrdersBridge (строки пишутся одной загрузкой)."""
+        return self.orders_bridge.update_order(number, fields, items, date)
 
     def create_order(self, fields, items):
-        doc = self.documents.ЗаказВПроизводство.CreateDocument()
-        # Справочники (поле 'ВидСтатусПродукции' обрабатывается отдельно)
-        catalog_fields_map = {
-            "Организация": "Организации",
-            "Контрагент": "Контрагенты",
-            "ДоговорКонтрагента": "ДоговорыКонтрагентов",
-            "Ответственный": "Пользователи",
-            "Склад": "Склады",
-        }
-
-        # ← ВАЖНО: внутри метода, чтобы можно было использовать self
-
-        log("Создание заказа. Поля:")
-        for k, v in fields.items():
-            try:
-                log(f"  -> {k} = {v}")
-
-                if k == "ВидСтатусПродукции":
-                    # Если передано внутреннее имя — преобразуем в описание
-                    reverse_map = {val: key for key, val in PRODUCTION_STATUS_MAP.items()}
-                    if v in reverse_map:
-                        v = reverse_map[v]
-
-                    ref = self.get_ref("ВидыСтатусыПродукции", v)
-                    log(f"[ref] {k}: {v} => {ref}")
-                    if ref:
-                        setattr(doc, k, ref)
-                        log(f"    Установлено: {k} (Ref: {ref})")
-                    else:
-                        log(f"    ❌ {k} '{v}' не найден.")
-                    continue
-
-                if k in catalog_fields_map:
-                    ref = self.get_ref(catalog_fields_map[k], v)
-                    log(f"[ref] {k}: {v} => {ref}")
-                    if ref:
-                        setattr(doc, k, ref)
-                        log(f"    Установлено: {k} (Ref: {ref})")
-                    else:
-                        log(f"    ❌ {k} '{v}' не найден.")
-                    continue
-
-                setattr(doc, k, v)
-            except Exception as e:
-                log(f"    ❌ Ошибка установки поля {k}: {e}")
+        """Создаёт заказ через OrdersBridge (строки пишутся одной загрузкой)."""
+        return self.orders_bridge.create_order(fields, items)
 
-        log("Добавление строк заказа:")
-        for row in items:
-            try:
-                log(f"  -> строка: {row}")
-                new_row = doc.Товары.Add()
-                new_row.Номенклатура = self.get_ref("Номенклатура", row.get("Номенклатура"))
-
-                variant = row.get("ВариантИзготовления")
-                if variant and variant != "—":
-                    new_row.ВариантИзготовления = self.get_ref("ВариантыИзготовленияНоменклатуры", variant)
-
-                size_val = row.get("Размер", 0)
-                size_ref = self.get_size_ref(size_val)
-                if size_ref:
-                    new_row.Размер = size_ref
-                else:
-                    log(f"    ❌ Размер '{size_val}' не найден, пропущен")
-
-                new_row.Количество = int(row.get("Количество", 1))
-                new_row.Вес = float(row.get("Вес", 0))
-                log(f"    -> Примечание: {row.get('Примечание')}")
-                new_row.Примечание = row.get("Примечание", "")
-
-            except Exception as e:
-                log(f"    ❌ Ошибка в строке заказа: {e}")
-
-        try:
-            log("Проводим документ...")
-            doc.Write()
-            log(f"✅ Документ проведён. Номер: {doc.Number}")
-            return str(doc.Number)
-        except Exception as e:
-            log(f"❌ Ошибка при записи документа: {e}")
-            return f"Ошибка: {e}"
-            
     def get_doc_object_by_number(self, doc_type: str, number: str, date: str | None = None):
         try:
-            catalog = getattr(self.connection.Documents, doc_type)
-            selection = catalog.Select()
-            while selection.Next():
-                doc = selection.GetObject()
-                if str(doc.Number).strip() == str(number).strip():
-                    if date is None or str(doc.Date)[:10] == str(date)[:10]:
-                        log(f"[get_doc_object_by_number] ✅ Найден объект документа {doc_type} №{number}")
-                        return doc
-            log(f"[get_doc_object_by_number] ❌ Документ {doc_type} №{number} не найден")
+            doc = self.doc_index.find_object(doc_type, number, date)
+            if doc is not None:
+                _log.debug("[get_doc_object_by_number] ✅ Найден объект документа %s №%s", doc_type, number)
+                return doc
+            _log.error("[get_doc_object_by_number] Документ %s №%s не найден", doc_type, number)
         except Exception as e:
-            log(f"[get_doc_object_by_number] ❌ Ошибка: {e}")
+            _log.error("[get_doc_object_by_number] Ошибка: %s", e)
         return None
 
     def get_doc_ref(self, doc_name: str, number: str, date: str | None = None):
         """Возвращает ссылку на документ по номеру."""
         docs = getattr(self.connection.Documents, doc_name, None)
         if docs is None:
-            log(f"[get_doc_ref] Документ '{doc_name}' не найден")
+            _log.info("[get_doc_ref] Документ '%s' не найден", doc_name)
             return None
 
-        selection = docs.Select()
-        while selection.Next():
-            doc = selection.GetObject()
-            if str(doc.Number).strip() == str(number).strip():
-                if date is None or str(doc.Date)[:10] == str(date)[:10]:
-                    log(f"[get_doc_ref] ✅ Найден документ {doc_name} №{number}")
-                    return doc.Ref
+        ref = self.doc_index.find_ref(doc_name, number, date)
+        if ref is not None:
+            _log.debug("[get_doc_ref] ✅ Найден документ %s №%s", doc_name, number)
+            return ref
 
-        log(f"[get_doc_ref] ❌ Документ {doc_name} №{number} не найден")
+        _log.error("[get_doc_ref] Документ %s №%s не найден", doc_name, number)
         return None
 
-    def list_documents(self, doc_name: str) -> list:
-        """Возвращает список объектов документов указанного типа."""
-        result: list = []
+    def iter_documents(self, doc_name: str):
+        """Объекты документов указанного типа по мере чтения выборки."""
         docs = getattr(self.connection.Documents, doc_name, None)
         if docs is None:
-            log(f"[list_documents] Документ '{doc_name}' не найден")
-            return result
+            _log.info("[list_documents] Документ '%s' не найден", doc_name)
+            return
 
         selection = docs.Select()
         while selection.Next():
             try:
-                obj = selection.GetObject()
-                result.append(obj)
+                yield selection.GetObject()
             except Exception as e:
-                log(f"[list_documents] ❌ Ошибка: {e}")
-        return result
+                _log.error("[list_documents] Ошибка: %s", e)
+
+    def list_documents(self, doc_name: str) -> list:
+        """Возвращает список объектов документов указанного типа."""
+        return list(self.iter_documents(doc_name))
+
     # ------------------------------------------------------------------
     def list_orders(self):
-        result = []
-        orders = self.connection.Documents.ЗаказВПроизводство.Select()
-        while orders.Next():
-            doc = orders.GetObject()
-            rows = []
-            for row in doc.Товары:
-                rows.append({
-                    "nomenclature": safe_str(row.Номенклатура),
-                    "size": safe_str(row.Размер),
-                    "qty": row.Количество,
-                    "w": row.Вес,
-                    "variant": safe_str(row.ВариантИзготовления),
-                    "note": row.Примечание,
-                })
-            result.append({
-                "Ref": doc.Ref,  # ← вот правильное место для Ref
-                "num": doc.Номер,
-                "date": str(doc.Дата),
-                "org": safe_str(doc.Организация),
-                "contragent": safe_str(doc.Контрагент),
-                "contract": safe_str(doc.ДоговорКонтрагента),
-                "comment": safe_str(doc.Комментарий),
-                "prod_status": self.to_string(doc.ВидСтатусПродукции),
-                "posted": doc.Проведен,
-                "deleted": doc.ПометкаУдаления,
-                "qty": sum([r["qty"] for r in rows]),
-                "weight": sum([r["w"] for r in rows]),
-                "rows": rows
-            })
-        return result
+        """Список заказов для страницы заказов (см. OrdersBridge.list_orders)."""
+        return self.orders_bridge.list_orders()
+
+    def sync_orders(
+        self, known: dict[str, str] | None = None, filters: dict | None = None, since=None
+    ) -> dict:
+        """Изменения списка заказов (см. OrdersBridge.sync_orders)."""
+        return self.orders_bridge.sync_orders(known, filters, since)
+
+    def list_orders_filtered(
+        self, filters: dict | None = None, cursor: tuple | None = None, page_size: int = 100
+    ) -> dict:
+        """Страница заказов с отбором (см. OrdersBridge.list_orders_filtered)."""
+        return self.orders_bridge.list_orders_filtered(filters, cursor, page_size)
+
+    def get_order_rows(self, ref) -> list[dict]:
+        """Строки заказа по ссылке (см. OrdersBridge.get_order_rows)."""
+        return self.orders_bridge.get_order_rows(ref)
+
+    def iter_orders(self, page_size: int = 200):
+        """Заказы страницами (см. OrdersBridge.iter_orders)."""
+        return self.orders_bridge.iter_orders(page_size)
+
+    def list_orders_page(self, cursor: tuple | None = None, page_size: int = 200) -> dict:
+        """Страница списка заказов (см. OrdersBridge.list_orders_page)."""
+        return self.orders_bridge.list_orders_page(cursor, page_size)
+
+    def iter_catalog_items(self, catalog_name: str):
+        """Элементы справочника из локального кэша, по одному."""
+        try:
+            items = self.catalog_cache.items(catalog_name)
+        except Exception as e:
+            _log.info("[Catalog Exception] %s: %s", catalog_name, e)
+            return
+        for item in items:
+            ref = self.catalog_cache.ref(catalog_name, item["uuid"])
+            yield {
+                "Ref": "" if ref is None else str(ref), "Code": item["Code"], "Description": item["Description"],
+                "uuid": item["uuid"],
+            }
 
     def list_catalog_items(self, catalog_name: str, limit: int = 1000) -> list[dict]:
-        """Возвращает список элементов справочника"""
-        result = []
-        try:
-            catalog = getattr(self.connection.Catalogs, catalog_name, None)
-            if catalog is None:
-                log(f"[Catalog Error] Справочник '{catalog_name}' не найден")
-                return result
+        """Возвращает список элементов справочника (из локального кэша).
 
-            selection = catalog.Select()
-            count = 0
-            while selection.Next() and count < limit:
-                obj = selection.GetObject()
-                item = {
-                    "Ref": str(obj.Ref),
-                    "Code": str(obj.Code),
-                    "Description": str(obj.Description)
-                }
-                result.append(item)
-                count += 1
-            return result
-        except Exception as e:
-            log(f"[Catalog Exception] {catalog_name}: {e}")
-            return []
+        ``Ref``, ``Code``, ``Description`` — как прежде; ``uuid`` — УИД
+        элемента, ссылку по нему даёт ``catalog_cache.ref``.
+        """
+        return list(islice(self.iter_catalog_items(catalog_name), limit))
             
     def log_catalog_contents(self, catalog_name: str, limit: int = 1000):
         """Логирует все элементы указанного справочника по имени"""
@@ -632,24 +399,20 @@ class COM1CBridge:
             print(f" - {item.get('Description', '?')} (Код: {item.get('Code', '?')}, Ref: {item.get('Ref', '?')})")       
         
     def list_tasks(self) -> list[dict]:
-        result = []
-        doc_manager = getattr(self.connection.Documents, "ЗаданиеНаПроизводство", None)
-        if doc_manager is None:
-            return result
-        selection = doc_manager.Select()
-        while selection.Next():
-            doc = selection.GetObject()
-            result.append({
-                "ref": str(doc.Ref),
-                "num": str(doc.Number),
-                "date": str(doc.Date.strftime("%d.%m.%Y")),
-                "employee": self.safe(doc, "Ответственный"),
-                "tech_op": self.safe(doc, "ТехОперация"),
-                "section": self.safe(doc, "ПроизводственныйУчасток"),
-                "posted": getattr(doc, "Проведен", False),
-                "deleted": getattr(doc, "ПометкаУдаления", False),
-            })
-        return result
+        """Список заданий на производство (см. WaxBridge.list_tasks)."""
+        return self.wax_bridge.list_tasks()
+
+    def sync_tasks(self, known: dict[str, str] | None = None, since=None) -> dict:
+        """Изменения списка заданий (см. WaxBridge.sync_tasks)."""
+        return self.wax_bridge.sync_tasks(known, since)
+
+    def iter_tasks(self, page_size: int = 200):
+        """Задания страницами (см. WaxBridge.iter_tasks)."""
+        return self.wax_bridge.iter_tasks(page_size)
+
+    def list_tasks_page(self, cursor: tuple | None = None, page_size: int = 200) -> dict:
+        """Страница списка заданий (см. WaxBridge.list_tasks_page)."""
+        return self.wax_bridge.list_tasks_page(cursor, page_size)
         
     def detect_method_from_items(self, items: list[dict]) -> str:
         """Автоматически определяет метод производства по названию номенклатуры"""
@@ -665,12 +428,12 @@ class COM1CBridge:
         if not method_ref:
             self.log_catalog_contents("ВариантыИзготовленияНоменклатуры")
         if method_ref is None:
-            log(f"[find_production_task_ref_by_method] Не найден вариант {method}")
+            _log.info("[find_production_task_ref_by_method] Не найден вариант %s", method)
             return None
 
         doc_manager = getattr(self.connection.Documents, "ЗаданиеНаПроизводство", None)
         if doc_manager is None:
-            log("[find_production_task_ref_by_method] Документ 'ЗаданиеНаПроизводство' не найден")
+            _log.info("[find_production_task_ref_by_method] Документ 'ЗаданиеНаПроизводство' не найден")
             return None
 
         tasks = doc_manager.Select()
@@ -683,42 +446,20 @@ class COM1CBridge:
         
 
     def list_wax_jobs(self) -> list[dict]:
-        """Возвращает список нарядов на восковые изделия из 1С."""
-        result = []
-        docs = self.connection.Documents.НарядВосковыеИзделия.Select()
-        while docs.Next():
-            obj = docs.GetObject()
+        """Возвращает список нарядов на восковые изделия (см. WaxBridge.list_wax_jobs)."""
+        return self.wax_bridge.list_wax_jobs()
 
+    def sync_wax_jobs(self, known: dict[str, str] | None = None, since=None) -> dict:
+        """Изменения списка нарядов (см. WaxBridge.sync_wax_jobs)."""
+        return self.wax_bridge.sync_wax_jobs(known, since)
 
-            rows = getattr(obj, "ТоварыВыдано", [])
-            rows = getattr(obj, "Выдано", [])
-            weight = 0.0
-            qty = 0
-            for r in rows:
-                weight += getattr(r, "Вес", 0)
-                qty += getattr(r, "Количество", 0)
+    def iter_wax_jobs(self, page_size: int = 200):
+        """Наряды страницами (см. WaxBridge.iter_wax_jobs)."""
+        return self.wax_bridge.iter_wax_jobs(page_size)
 
-            result.append({
-                "Номер": str(obj.Номер),
-                "Дата": obj.Дата.strftime("%d.%m.%Y"),
-                "Сотрудник": safe_str(obj.Сотрудник.Description),
-                "Вес": weight,
-                "Кол-во": qty,
-                "Проведен": obj.Проведен,
-                "ПометкаУдаления": getattr(obj, "ПометкаУдаления", False),
-                "Закрыт": "✅" if getattr(obj, "Проведен", False) else "—",
-                "Сотрудник": safe_str(obj.Сотрудник),
-                "ТехОперация": safe_str(obj.ТехОперация),
-                "Комментарий": safe_str(obj.Комментарий),
-                "Склад": safe_str(obj.Склад),
-                "ПроизводственныйУчасток": safe_str(obj.ПроизводственныйУчасток),
-                "Организация": safe_str(obj.Организация),
-                "Задание": safe_str(getattr(obj, "ЗаданиеНаПроизводство", "")) or "—",
-                "Ответственный": safe_str(obj.Ответственный),
-                "Вес": round(weight, 2),
-                "Кол-во": qty,
-            })
-        return result
+    def list_wax_jobs_page(self, cursor: tuple | None = None, page_size: int = 200) -> dict:
+        """Страница списка нарядов (см. WaxBridge.list_wax_jobs_page)."""
+        return self.wax_bridge.list_wax_jobs_page(cursor, page_size)
 
     def find_wax_jobs_by_task(self, task_ref) -> list:
         """Возвращает наряды, связанные с заданием, через WaxBridge."""
@@ -727,6 +468,10 @@ class COM1CBridge:
     def close_wax_jobs(self, job_refs: list) -> list[str]:
         """Закрывает наряды через WaxBridge."""
         return self.wax_bridge.close_wax_jobs(job_refs)
+
+    def close_wax_jobs_batch(self, job_refs: list) -> list[dict]:
+        """Закрывает наряды одной транзакцией через WaxBridge."""
+        return self.wax_bridge.close_wax_jobs_batch(job_refs)
         
     def get_ref_by_description(self, catalog_name: str, description: str):
         """Возвращает ссылку на элемент каталога по описанию с кешированием."""
@@ -739,38 +484,18 @@ class COM1CBridge:
             }
             internal = predefined.get(str(description).strip())
             if internal:
-                enum = getattr(self.enums, "ВидыСтатусыПродукции", None)
-                if enum is not None:
-                    try:
-                        return getattr(enum, internal)
-                    except Exception as e:
-                        log(f"[Enum Error] {catalog_name}.{internal}: {e}")
-            log(f"[{catalog_name}] Не найден по описанию: {description}")
+                try:
+                    val = self.enum_index.value(catalog_name, internal)
+                    if val is not None:
+                        return val
+                except Exception as e:
+                    _log.error("[Enum Error] %s.%s: %s", catalog_name, internal, e)
+            _log.info("[%s] Не найден по описанию: %s", catalog_name, description)
             return None
 
-        desc = str(description).strip().lower()
-        if catalog_name == "Размеры":
-            desc = desc.replace(",", ".")
-
-        cache = self._ref_cache.get(catalog_name)
-        if cache is None:
-            catalog = getattr(self.connection.Catalogs, catalog_name, None)
-            if catalog is None:
-                log(f"[get_ref_by_description] Каталог '{catalog_name}' не найден")
-                return None
-            cache = {}
-            selection = catalog.Select()
-            while selection.Next():
-                obj = selection.GetObject()
-                key = str(obj.Description).strip().lower()
-                if catalog_name == "Размеры":
-                    key = key.replace(",", ".")
-                cache[key] = obj.Ref
-            self._ref_cache[catalog_name] = cache
-
-        ref = cache.get(desc)
+        ref = self.catalog_cache.find_ref(catalog_name, description)
         if ref is None:
-            log(f"[get_ref_by_description] Не найден элемент '{description}' в каталоге '{catalog_name}'")
+            _log.info("[get_ref_by_description] Не найден элемент '%s' в каталоге '%s'", description, catalog_name)
         return ref
         
         
@@ -778,11 +503,11 @@ class COM1CBridge:
     def create_production_task(self, order_ref, rows: list[dict]) -> dict:
         doc_manager = getattr(self.connection.Documents, "ЗаданиеНаПроизводство", None)
         if doc_manager is None:
-            log("❌ Документ 'ЗаданиеНаПроизводство' не найден")
+            _log.error("Документ 'ЗаданиеНаПроизводство' не найден")
             return {}
 
         if not order_ref:
-            log("❌ order_ref = None. Задание не может быть создано.")
+            _log.error("order_ref = None. Задание не может быть создано.")
             return {}
 
         try:
@@ -794,10 +519,10 @@ class COM1CBridge:
             elif isinstance(order_ref, str):
                 base_doc = self._find_document_by_number("ЗаказВПроизводство", order_ref)
                 if base_doc is None:
-                    log(f"[create_production_task] ❌ Не удалось найти заказ №{order_ref}")
+                    _log.error("[create_production_task] Не удалось найти заказ №%s", order_ref)
                     return {}
             else:
-                log("❌ order_ref — неизвестного типа")
+                _log.error("order_ref — неизвестного типа")
                 return {}
 
             base_doc_ref = base_doc.Ref  # ссылка на заказ
@@ -811,25 +536,25 @@ class COM1CBridge:
                 try:
                     doc.Заказ = base_doc_ref
                 except Exception as e:
-                    log(f"[create_production_task] ⚠ Не удалось установить поле 'Заказ': {e}")
+                    _log.warning("[create_production_task] Не удалось установить поле 'Заказ': %s", e)
 
             if hasattr(doc, "ЗаказВПроизводство"):
                 try:
                     doc.ЗаказВПроизводство = base_doc_ref
                 except Exception as e:
-                    log(f"[create_production_task] ⚠ Не удалось установить поле 'ЗаказВПроизводство': {e}")
+                    _log.warning("[create_production_task] Не удалось установить поле 'ЗаказВПроизводство': %s", e)
 
             if hasattr(base_doc, "Организация") and hasattr(doc, "Организация"):
                 try:
                     doc.Организация = base_doc.Организация
                 except Exception as e:
-                    log(f"[create_production_task] ⚠ Не удалось установить организацию: {e}")
+                    _log.warning("[create_production_task] Не удалось установить организацию: %s", e)
 
             if hasattr(base_doc, "Склад") and hasattr(doc, "Склад"):
                 try:
                     doc.Склад = base_doc.Склад
                 except Exception as e:
-                    log(f"[create_production_task] ⚠ Не удалось установить склад: {e}")
+                    _log.warning("[create_production_task] Не удалось установить склад: %s", e)
 
             doc.ПроизводственныйУчасток = self.get_ref("ПроизводственныеУчастки", "задание на производство")
             operation = rows[0].get("operation", "работа с восковыми изделиями")
@@ -862,7 +587,7 @@ class COM1CBridge:
                     if hasattr(item, "АртикулГП"):
                         item.АртикулГП = row.get("article", "")
                 except Exception as e:
-                    log(f"❌ Ошибка в строке 'Продукция': {e}")
+                    _log.error("Ошибка в строке 'Продукция': %s", e)
 
             for row in rows:
                 try:
@@ -883,10 +608,12 @@ class COM1CBridge:
                     z.КонечнаяПродукция = z.Номенклатура
                     z.ВариантИзготовленияПродукции = z.ВариантИзготовления
                 except Exception as e:
-                    log(f"❌ Ошибка в строке 'ЗаданияНаВыполнениеТехОперации': {e}")
+                    _log.error("Ошибка в строке 'ЗаданияНаВыполнениеТехОперации': %s", e)
 
             doc.Write()
-            log(f"✅ Задание создано: №{doc.Номер}")
+            self.doc_index.register("ЗаданиеНаПроизводство", doc.Номер, doc.Дата, doc.Ref)
+            self.task_numbers.observe(doc.Номер)
+            _log.info("✅ Задание создано: №%s", doc.Номер)
             return {
                 "Ref": doc.Ref,
                 "Номер": str(doc.Номер),
@@ -894,7 +621,7 @@ class COM1CBridge:
             }
 
         except Exception as e:
-            log(f"❌ Ошибка при создании задания: {e}")
+            _log.error("Ошибка при создании задания: %s", e)
             return {}
             
     def calculate_batches(self, order_lines: list[dict]) -> list[dict]:
@@ -922,17 +649,17 @@ class COM1CBridge:
         try:
             catalog = getattr(self.connection.Catalogs, catalog_name, None)
             if not catalog:
-                log(f"Каталог '{catalog_name}' не найден")
+                _log.info("Каталог '%s' не найден", catalog_name)
                 return None
             selection = catalog.Select()
             while selection.Next():
                 item = selection.GetObject()
                 if safe_str(item.Description) == description or safe_str(item) == description:
-                    log(f"[{catalog_name}] Найден: {description}")
+                    _log.debug("[%s] Найден: %s", catalog_name, description)
                     return item.Ref
-            log(f"[{catalog_name}] Не найден: {description}")
+            _log.info("[%s] Не найден: %s", catalog_name, description)
         except Exception as e:
-            log(f"[{catalog_name}] Ошибка: {e}")
+            _log.error("[%s] Ошибка: %s", catalog_name, e)
         return None
         
     def get_wax_job_rows(self, num: str) -> list[dict]:
@@ -958,7 +685,7 @@ class COM1CBridge:
     def get_order_lines(self, doc_number: str, date: str | None = None) -> list[dict]:
         doc = self._find_document_by_number("ЗаказВПроизводство", doc_number, date)
         if not doc:
-            log(f"❌ Заказ №{doc_number} не найден")
+            _log.error("Заказ №%s не найден", doc_number)
             return []
 
         rows = []
@@ -978,27 +705,7 @@ class COM1CBridge:
         
     def get_task_lines(self, doc_num: str) -> list[dict]:
         """Возвращает табличную часть 'Продукция' по номеру задания"""
-        result = []
-        doc_manager = getattr(self.connection.Documents, "ЗаданиеНаПроизводство", None)
-        if not doc_manager:
-            return result
-
-        selection = doc_manager.Select()
-        while selection.Next():
-            doc = selection.GetObject()
-            if str(doc.Number) == doc_num:
-                for row in doc.Продукция:
-                    result.append({
-                        "nomen": self.safe(row, "Номенклатура"),
-                        "article": safe_str(getattr(row.Номенклатура, "Артикул", "")),
-                        "size": self.safe(row, "Размер"),
-                        "sample": self.safe(row, "Проба"),
-                        "color": self.safe(row, "ЦветМеталла"),
-                        "qty": row.Количество,
-                        "weight": row.Вес if hasattr(row, "Вес") else ""
-                    })
-                break
-        return result
+        return self.wax_bridge.get_task_lines(doc_num)
 
     def get_wax_job_lines_by_ref(self, ref):
         """Возвращает табличную часть 'ТоварыВыдано' по ссылке на наряд"""
@@ -1016,7 +723,7 @@ class COM1CBridge:
                 })
             return result
         except Exception as e:
-            log(f"[get_wax_job_lines_by_ref] ❌ Ошибка: {e}")
+            _log.error("[get_wax_job_lines_by_ref] Ошибка: %s", e)
             return []
 
     # ------------------------------------------------------------------
@@ -1024,13 +731,13 @@ class COM1CBridge:
         """Создаёт 'НарядВосковыеИзделия' на основании задания."""
         task = self._find_document_by_number("ЗаданиеНаПроизводство", task_number)
         if not task:
-            log(f"❌ Задание №{task_number} не найдено")
+            _log.error("Задание №%s не найдено", task_number)
             return ""
 
         try:
             doc = self.documents.НарядВосковыеИзделия.CreateDocument()
         except Exception as e:
-            log(f"[1C] Не удалось создать НарядВосковыеИзделия: {e}")
+            _log.info("[1C] Не удалось создать НарядВосковыеИзделия: %s", e)
             return ""
 
         try:
@@ -1050,9 +757,9 @@ class COM1CBridge:
             if order_ref and hasattr(order_ref, "GetObject"):
                 try:
                     order_obj = order_ref.GetObject()
-                    log("[create_wax_job_from_task] ✅ Получен заказ-основание")
+                    _log.debug("[create_wax_job_from_task] ✅ Получен заказ-основание")
                 except Exception as exc:
-                    log(f"[create_wax_job_from_task] ⚠ Ошибка получения заказа: {exc}")
+                    _log.error("[create_wax_job_from_task] Ошибка получения заказа: %s", exc)
 
             # Подстановка организации и склада ТОЛЬКО из заказа
             if order_obj:
@@ -1060,17 +767,17 @@ class COM1CBridge:
                     org = getattr(order_obj, "Организация", None)
                     if org:
                         doc.Организация = org if hasattr(org, "Ref") else org
-                        log(f"[create_wax_job_from_task] ✅ Установлена организация: {safe_str(org)}")
+                        _log.debug("[create_wax_job_from_task] ✅ Установлена организация: %s", org)
                 except Exception as e:
-                    log(f"[create_wax_job_from_task] ⚠ Не удалось установить организацию: {e}")
+                    _log.warning("[create_wax_job_from_task] Не удалось установить организацию: %s", e)
 
                 try:
                     wh = getattr(order_obj, "Склад", None)
                     if wh:
                         doc.Склад = wh if hasattr(wh, "Ref") else wh
-                        log(f"[create_wax_job_from_task] ✅ Установлен склад: {safe_str(wh)}")
+                        _log.debug("[create_wax_job_from_task] ✅ Установлен склад: %s", wh)
                 except Exception as e:
-                    log(f"[create_wax_job_from_task] ⚠ Не удалось установить склад: {e}")
+                    _log.warning("[create_wax_job_from_task] Не удалось установить склад: %s", e)
 
             # --- Табличная часть
             for row in task.Продукция:
@@ -1085,17 +792,19 @@ class COM1CBridge:
 
             doc.Проведен = True
             doc.Write()
-            log(f"✅ Создан НарядВосковыеИзделия №{doc.Number}")
+            self.doc_index.register("НарядВосковыеИзделия", doc.Number, doc.Date, doc.Ref)
+            self.wax_bridge.invalidate_task_jobs(task.Ref)
+            _log.info("✅ Создан НарядВосковыеИзделия №%s", doc.Number)
             return str(doc.Number)
         except Exception as e:
-            log(f"❌ Ошибка создания Наряда: {e}")
+            _log.error("Ошибка создания Наряда: %s", e)
             return ""
             
     def _get_object_from_ref(self, ref):
         try:
             return self.connection.GetObject(ref)
         except Exception as e:
-            log(f"[get_object_from_ref] ❌ Ошибка получения объекта по ссылке: {e}")
+            _log.error("[get_object_from_ref] Ошибка получения объекта по ссылке: %s", e)
             return None
 
     def get_object_from_ref(self, ref):
@@ -1104,10 +813,10 @@ class COM1CBridge:
                 obj = ref.GetObject()
             else:
                 obj = self.connection.GetObject(ref)
-            log(f"[get_object_from_ref] ✅ Получен объект из ссылки")
+            _log.debug("[get_object_from_ref] ✅ Получен объект из ссылки")
             return obj
         except Exception as e:
-            log(f"[get_object_from_ref] ❌ Ошибка получения объекта по ссылке: {e}")
+            _log.error("[get_object_from_ref] Ошибка получения объекта по ссылке: %s", e)
             return None
 
     def get_object_property(self, obj, prop_name: str):
@@ -1118,7 +827,7 @@ class COM1CBridge:
                 target = target.GetObject()
             return getattr(target, prop_name, None)
         except Exception as e:
-            log(f"[get_object_property] Ошибка получения {prop_name}: {e}")
+            _log.error("[get_object_property] Ошибка получения %s: %s", prop_name, e)
             return None
     # ------------------------------------------------------------------
 
@@ -1130,118 +839,23 @@ class COM1CBridge:
         warehouse: str | None = None,
         norm_type: str = "Номенклатура",
     ) -> list[str]:
-        """Создаёт два наряда из одного задания по артикулу."""
-        mapping = {"3D печать": master_3d, "Пресс-форма": master_form}
-        result: list[str] = []
-
-        # Получаем объект и ссылку задания
-        try:
-            if isinstance(task_ref, str):
-                task = self.connection.GetObject(task_ref)
-            elif hasattr(task_ref, "Продукция"):
-                task = task_ref
-            elif hasattr(task_ref, "GetObject"):
-                task = task_ref.GetObject()
-            else:
-                log("[create_wax_jobs_from_task] ❌ Неверный тип ссылки")
-                return []
-            task_ref_link = task.Ref
-        except Exception as exc:
-            log(f"[create_wax_jobs_from_task] ❌ Ошибка доступа к заданию: {exc}")
-            return []
-
-        # Получаем данные для шапки наряда
-        org = getattr(task, "Организация", None)
-        wh = getattr(task, "Склад", None)
-        responsible = getattr(task, "Ответственный", None)
+        """Создаёт два наряда из одного задания по артикулу через WaxBridge."""
+        return self.wax_bridge.create_wax_jobs_from_task(
+            task_ref, master_3d, master_form, warehouse, norm_type
+        )
 
-        # Попытка получить значения из связанного заказа, если их нет в задании
-        order_ref = (
-            getattr(task, "ЗаказВПроизводство", None)
-            or getattr(task, "ДокументОснование", None)
+    def create_wax_jobs_from_task_number(
+        self,
+        number: str,
+        master_3d: str,
+        master_form: str,
+        warehouse: str | None = None,
+        norm_type: str = "Номенклатура",
+    ) -> list[str]:
+        """Создаёт наряды по номеру задания через WaxBridge."""
+        return self.wax_bridge.create_wax_jobs_from_task_number(
+            number, master_3d, master_form, warehouse, norm_type
         )
-        if (org is None or wh is None) and order_ref and hasattr(order_ref, "GetObject"):
-            try:
-                order_obj = order_ref.GetObject()
-                org = org or getattr(order_obj, "Организация", None)
-                wh = wh or getattr(order_obj, "Склад", None)
-                responsible = responsible or getattr(order_obj, "Ответственный", None)
-            except Exception as e:
-                log(
-                    f"[create_wax_jobs_from_task] ⚠ Не удалось получить данные из заказа: {e}"
-                )
-
-        section = getattr(task, "ПроизводственныйУчасток", None)
-        if warehouse:
-            wh = self.get_ref_by_description("Склады", warehouse) or wh
-
-        rows_by_method = {"3D печать": [], "Пресс-форма": []}
-        for row in task.Продукция:
-            art = safe_str(getattr(row.Номенклатура, "Артикул", "")).lower()
-            method = "3D печать" if "д" in art or "d" in art else "Пресс-форма"
-            rows_by_method[method].append(row)
-
-        for method, rows in rows_by_method.items():
-            if not rows:
-                continue
-            try:
-                job = self.documents.НарядВосковыеИзделия.CreateDocument()
-
-                # Заполнение шапки наряда
-                job.Дата = datetime.now()
-                job.ДокументОснование = task_ref_link
-                job.ЗаданиеНаПроизводство = task_ref_link
-                if org is not None:
-                    try:
-                        job.Организация = org
-                    except Exception as exc:
-                        log(
-                            f"[create_wax_jobs_from_task] ⚠ Не удалось установить организацию: {exc}"
-                        )
-                if wh is not None:
-                    try:
-                        job.Склад = wh
-                    except Exception as exc:
-                        log(
-                            f"[create_wax_jobs_from_task] ⚠ Не удалось установить склад: {exc}"
-                        )
-                if section:
-                    job.ПроизводственныйУчасток = section
-                if responsible:
-                    job.Ответственный = responsible
-                job.ТехОперация = self.get_ref("ТехОперации", method)
-                job.Сотрудник = self.get_ref("ФизическиеЛица", mapping.get(method, ""))
-                job.Комментарий = f"Создан автоматически для {method}"
-
-                # Заполнение табличной части вручную
-                for r in rows:
-                    row = job.ТоварыВыдано.Add()
-                    row.Номенклатура = r.Номенклатура
-                    row.Количество = r.Количество
-                    row.Размер = r.Размер
-                    row.Проба = r.Проба
-                    row.ЦветМеталла = r.ЦветМеталла
-                    if hasattr(r, "ХарактеристикаВставок"):
-                        row.ХарактеристикаВставок = r.ХарактеристикаВставок
-                    if hasattr(r, "Вес"):
-                        row.Вес = r.Вес
-
-                # ---- Подстановка вида норматива для всех строк
-                enum_norm = self.get_enum_by_description(
-                    "ВидыНормативовНоменклатуры", norm_type
-                )
-                if enum_norm:
-                    for row in job.ТоварыВыдано:
-                        row.ВидНорматива = enum_norm
-
-
-                job.Проведен = True
-                job.Write()
-                result.append(str(job.Номер))
-                log(f"[create_wax_jobs_from_task] ✅ Создан наряд {method}: №{job.Номер}")
-            except Exception as exc:
-                log(f"[create_wax_jobs_from_task] ❌ Ошибка для {method}: {exc}")
-        return result
 
     def _find_task_by_number(self, number: str):
         """Ищет задание по номеру через WaxBridge."""
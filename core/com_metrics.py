@@ -0,0 +1,357 @@
+# com_metrics.py • учёт обращений к COM и длительности операций моста
+# -*- coding: utf-8 -*-
+"""Необязательные метрики COM-подключения (включаются ``COM_METRICS=1``).
+
+``ComMetrics.wrap`` заворачивает подключение к 1С в ``MeteredCom``: каждое
+чтение и запись свойства и каждый вызов метода объекта 1С засчитываются
+операции моста, которая выполняется в этом потоке (``operation``). По
+операциям копятся число вызовов, ошибки, гистограмма времени и обращения к
+COM; каждая завершённая операция дописывается строкой в JSONL-файл — запись
+в файл выполняет отдельный поток, потоки COM только кладут её в очередь.
+
+Пока метрики не включены, ``wrap`` возвращает объект как есть, а
+``operation`` — пустой контекст.
+"""
+from __future__ import annotations
+import inspect
+import json
+import queue
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from .logger import logger
+
+# Простые значения: возвращаются из COM без обёртки и передаются между
+# потоками как есть (см. также com_worker)
+PLAIN_TYPES = (type(None), bool, int, float, str, bytes, date, datetime, Decimal)
+# Верхние границы интервалов гистограммы, мс (последний интервал — всё дольше)
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+# Строка сводки для обращений к COM вне операций моста
+OUTSIDE = "(вне операций)"
+
+
+def operation_name(fn: Any) -> str:
+    """Имя операции для метода моста: ``COM1CBridge.list_orders``."""
+    return getattr(fn, "__qualname__", None) or getattr(fn, "__name__", None) or repr(fn)
+
+
+class _Frame:
+    """Счётчики операции, выполняющейся в текущем потоке."""
+
+    __slots__ = ("name", "gets", "sets", "calls")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.gets = self.sets = self.calls = 0
+
+
+class _Stat:
+    """Накопленные метрики одной операции."""
+
+    __slots__ = ("count", "errors", "total", "max", "gets", "sets", "calls", "buckets")
+
+    def __init__(self):
+        self.count = self.errors = self.gets = self.sets = self.calls = 0
+        self.total = self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def percentile(self, q: float) -> float:
+        """Оценка перцентиля по гистограмме (верхняя граница интервала)."""
+        need, seen = q * self.count, 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= need:
+                return min(BUCKETS_MS[i], self.max) if i < len(BUCKETS_MS) else self.max
+        return self.max
+
+
+class _Exporter:
+    """Поток записи JSONL: операции только кладут запись в очередь."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="com-metrics", daemon=True)
+        self._thread.start()
+
+    def put(self, record: dict) -> None:
+        self._queue.put(record)
+
+    def close(self) -> None:
+        """Дописывает очередь и останавливает поток."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        file = None
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            if self.path is None:
+                continue  # выгрузка отключена после ошибки: очередь только опустошается
+            try:
+                if file is None:
+                    file = open(self.path, "a", encoding="utf-8")
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                if self._queue.empty():
+                    file.flush()
+            except OSError as e:
+                logger.warning("[ComMetrics] Выгрузка в %s отключена: %s", self.path, e)
+                self.path = None
+        if file is not None:
+            file.close()
+
+
+class ComMetrics:
+    """Реестр метрик операций моста (общий для всех потоков COM)."""
+
+    def __init__(self):
+        self.enabled = False
+        self.path: Path | None = None
+        self._exporter: _Exporter | None = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats: dict[str, _Stat] = {}
+        self._outside = _Stat()
+
+    def enable(self, path: str | Path | None = None) -> None:
+        """Включает учёт; ``path`` — файл JSONL для построчной выгрузки операций."""
+        self.enabled = True
+        self.path = Path(path) if path else None
+        if self.path is not None and self._exporter is None:
+            self._exporter = _Exporter(self.path)
+        if self.path:
+            logger.info("[ComMetrics] ✅ Метрики COM включены, выгрузка в %s", self.path)
+        else:
+            logger.info("[ComMetrics] ✅ Метрики COM включены")
+
+    def close(self) -> None:
+        with self._lock:
+            exporter, self._exporter = self._exporter, None
+        if exporter is not None:
+            exporter.close()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._outside = _Stat()
+
+    # -------------------------------------------------------------
+    def wrap(self, obj: Any) -> Any:
+        """Заворачивает объект 1С в ``MeteredCom`` (если метрики включены)."""
+        if not self.enabled or isinstance(obj, PLAIN_TYPES):
+            return obj
+        return MeteredCom(obj, self)
+
+    def operation(self, name: str):
+        """Контекст операции моста: обращения к COM внутри засчитываются ей.
+
+        Вложенные операции (метод моста вызывает другой) учитываются во внешней.
+        """
+        if not self.enabled or getattr(self._local, "frame", None) is not None:
+            return nullcontext()
+        return self._operation(name)
+
+    @contextmanager
+    def _operation(self, name: str):
+        frame = self._local.frame = _Frame(name)
+        started = time.perf_counter()
+        error = None
+        try:
+            yield frame
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._local.frame = None
+            self._finish(frame, (time.perf_counter() - started) * 1000, error)
+
+    def hit(self, kind: str) -> None:
+        """Засчитывает обращение к COM: ``gets``, ``sets`` или ``calls``."""
+        frame = getattr(self._local, "frame", None)
+        if frame is not None:
+            setattr(frame, kind, getattr(frame, kind) + 1)
+            return
+        with self._lock:
+            setattr(self._outside, kind, getattr(self._outside, kind) + 1)
+
+    def _finish(self, frame: _Frame, ms: float, error: BaseException | None) -> None:
+        with self._lock:
+            stat = self._stats.get(frame.name)
+            if stat is None:
+                stat = self._stats[frame.name] = _Stat()
+            stat.count += 1
+            stat.errors += error is not None
+            stat.total += ms
+            stat.max = max(stat.max, ms)
+            stat.gets += frame.gets
+            stat.sets += frame.sets
+            stat.calls += frame.calls
+            stat.buckets[bisect_left(BUCKETS_MS, ms)] += 1
+            exporter = self._exporter
+        if exporter is not None:
+            exporter.put(self._record(frame, ms, error))
+
+    @staticmethod
+    def _record(frame: _Frame, ms: float, error: BaseException | None) -> dict:
+        return {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "op": frame.name,
+            "thread": threading.current_thread().name,
+            "ms": round(ms, 3),
+            "gets": frame.gets,
+            "sets": frame.sets,
+            "calls": frame.calls,
+            "error": f"{type(error).__name__}: {error}" if error is not None else None,
+        }
+
+    # -------------------------------------------------------------
+    def snapshot(self) -> list[dict]:
+        """Сводка по операциям, самые медленные (по p95) — первыми."""
+        with self._lock:
+            rows = [self._row(name, stat) for name, stat in self._stats.items()]
+            outside = self._outside
+            com_outside = outside.gets + outside.sets + outside.calls
+        rows.sort(key=lambda r: (r["p95_ms"], r["max_ms"]), reverse=True)
+        if com_outside:
+            rows.append({**self._row(OUTSIDE, outside), "com": com_outside})
+        return rows
+
+    @staticmethod
+    def _row(name: str, stat: _Stat) -> dict:
+        com = stat.gets + stat.sets + stat.calls
+        return {
+            "op": name,
+            "count": stat.count,
+            "errors": stat.errors,
+            "total_ms": round(stat.total, 1),
+            "avg_ms": round(stat.total / stat.count, 1) if stat.count else 0.0,
+            "p50_ms": round(stat.percentile(0.5), 1),
+            "p95_ms": round(stat.percentile(0.95), 1),
+            "max_ms": round(stat.max, 1),
+            "gets": stat.gets,
+            "sets": stat.sets,
+            "calls": stat.calls,
+            "com": com,
+            "com_per_call": round(com / stat.count, 1) if stat.count else 0.0,
+            "histogram": list(stat.buckets),
+        }
+
+    def log_summary(self, limit: int = 10) -> None:
+        """Пишет в журнал операции с наибольшим суммарным временем."""
+        rows = sorted(self.snapshot(), key=lambda r: r["total_ms"], reverse=True)
+        for r in rows[:limit]:
+            logger.info(
+                "[ComMetrics] %s: %s выз., всего %s мс, p95 %s мс, макс. %s мс, COM %s",
+                r["op"], r["count"], r["total_ms"], r["p95_ms"], r["max_ms"], r["com"],
+            )
+
+
+class MeteredCom:
+    """Заместитель объекта 1С, засчитывающий каждое обращение к нему.
+
+    Возвращаемые объекты 1С тоже заворачиваются; при передаче в COM
+    заместители снимаются (см. ``_unwrap``).
+    """
+
+    __slots__ = ("_obj", "_metrics")
+
+    def __init__(self, obj: Any, metrics: ComMetrics):
+        object.__setattr__(self, "_obj", obj)
+        object.__setattr__(self, "_metrics", metrics)
+
+    def __getattr__(self, name: str):
+        value = getattr(self._obj, name)
+        if inspect.ismethod(value) or inspect.isbuiltin(value):
+            return _MeteredMethod(value, self._metrics)
+        self._metrics.hit("gets")
+        return _wrap(self._metrics, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._metrics.hit("sets")
+        setattr(self._obj, name, _unwrap(value))
+
+    def __call__(self, *args, **kwargs):
+        self._metrics.hit("calls")
+        return _wrap(self._metrics, self._obj(*_unwrap(args), **_unwrap(kwargs)))
+
+    def __iter__(self):
+        for item in self._obj:
+            self._metrics.hit("calls")
+            yield _wrap(self._metrics, item)
+
+    def __len__(self) -> int:
+        self._metrics.hit("calls")
+        return len(self._obj)
+
+    def __getitem__(self, key):
+        self._metrics.hit("calls")
+        return _wrap(self._metrics, self._obj[_unwrap(key)])
+
+    def __bool__(self) -> bool:
+        return bool(self._obj)
+
+    def __str__(self) -> str:
+        self._metrics.hit("calls")
+        return str(self._obj)
+
+    def __eq__(self, other) -> bool:
+        return self._obj == _unwrap(other)
+
+    def __ne__(self, other) -> bool:
+        return self._obj != _unwrap(other)
+
+    def __hash__(self) -> int:
+        return hash(self._obj)
+
+    def __repr__(self) -> str:
+        return f"<MeteredCom {self._obj!r}>"
+
+
+class _MeteredMethod:
+    """Метод объекта 1С: вызов засчитывается как обращение к COM."""
+
+    __slots__ = ("_fn", "_metrics")
+
+    def __init__(self, fn, metrics: ComMetrics):
+        self._fn = fn
+        self._metrics = metrics
+
+    def __call__(self, *args, **kwargs):
+        self._metrics.hit("calls")
+        return _wrap(self._metrics, self._fn(*_unwrap(args), **_unwrap(kwargs)))
+
+
+def _wrap(metrics: ComMetrics, value: Any) -> Any:
+    if isinstance(value, PLAIN_TYPES):
+        return value
+    if isinstance(value, tuple):
+        return tuple(_wrap(metrics, v) for v in value)
+    if isinstance(value, list):
+        return [_wrap(metrics, v) for v in value]
+    return MeteredCom(value, metrics)
+
+
+def _unwrap(value: Any) -> Any:
+    if isinstance(value, MeteredCom):
+        return value._obj
+    if isinstance(value, _MeteredMethod):
+        return value._fn
+    if isinstance(value, list):
+        return [_unwrap(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_unwrap(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _unwrap(v) for k, v in value.items()}
+    return value
+
+
+# Общий реестр: подключения моста и потоки COM пишут в него
+METRICS = ComMetrics()
@@ -0,0 +1,101 @@
+# com_pool.py • пул COM-подключений к 1С с разделением чтения и записи
+# -*- coding: utf-8 -*-
+"""Пул потоков COM, у каждого — своё подключение к информационной базе.
+
+Первое подключение («писатель») обслуживает синхронный мост ``config.BRIDGE``
+и все изменяющие вызовы. Остальные («читатели») берут на себя долгие
+асинхронные чтения: списки документов, сверку справочников. Так обновление
+списка не ждёт проведения документа, и наоборот.
+"""
+from __future__ import annotations
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from .logger import get_logger
+from .com_worker import ComProxy, ComWorker
+
+_log = get_logger(__name__)
+
+# Вызовы, которые только читают данные и могут уйти в подключение-читатель.
+# ``catalog_cache.*`` сюда не входит: кэш справочников у каждого подключения
+# свой, и сверять нужно кэш писателя, которым пользуется ``config.BRIDGE``.
+READ_PREFIXES = ("list_", "sync_", "iter_", "find_", "get_")
+
+
+def is_read(method: str) -> bool:
+    return method.startswith(READ_PREFIXES)
+
+
+class ComPool:
+    """Набор ``ComWorker`` с маршрутизацией вызовов."""
+
+    def __init__(self, factory: Callable[[], Any], size: int = 2):
+        size = max(1, int(size))
+        self.writer = ComWorker(factory, name="com-writer")
+        self.readers = [ComWorker(factory, name=f"com-reader-{i}") for i in range(1, size)]
+        self._keys: dict[str, Future] = {}
+        self._keys_lock = threading.Lock()
+
+    def wait_ready(self):
+        """Ждёт подключений. Ошибка писателя пробрасывается, неудачные читатели
+        исключаются из пула (чтение тогда идёт через писателя)."""
+        started = time.perf_counter()
+        bridge = self.writer.wait_ready()
+        alive = []
+        for worker in self.readers:
+            try:
+                worker.wait_ready()
+                alive.append(worker)
+            except Exception as e:
+                _log.warning("[ComPool] %s: подключение не создано: %s", worker.name, e)
+                worker.stop()
+        self.readers = alive
+        _log.info(
+            "[ComPool] ✅ Подключений: %s, готовы за %.1f с",
+            1 + len(alive), time.perf_counter() - started,
+        )
+        return bridge
+
+    # -------------------------------------------------------------
+    def route(self, method: str) -> ComWorker:
+        """Подключение для вызова: читатель с самой короткой очередью или писатель."""
+        if self.readers and is_read(method):
+            return min(self.readers, key=lambda w: w.pending())
+        return self.writer
+
+    def call(self, method: str, *args, key: str | None = None, **kwargs) -> Future:
+        """Асинхронный вызов метода моста в подходящем подключении."""
+        future = self.route(method).call(method, *args, **kwargs)
+        if key is not None:
+            with self._keys_lock:
+                previous = self._keys.get(key)
+                self._keys[key] = future
+            if previous is not None and previous.cancel():
+                _log.info("[ComPool] запрос '%s' вытеснен новым", key)
+        return future
+
+    def is_current(self, key: str, future: Future) -> bool:
+        with self._keys_lock:
+            return self._keys.get(key) is future
+
+    def proxy(self) -> ComProxy:
+        """Синхронный мост для потока GUI (работает через писателя)."""
+        return ComProxy(self.writer, self.wait_ready())
+
+    # -------------------------------------------------------------
+    def stats(self) -> list[dict]:
+        """Метрики ожидания в очереди по каждому подключению."""
+        return [w.stats() for w in (self.writer, *self.readers)]
+
+    def log_stats(self) -> None:
+        for s in self.stats():
+            _log.info(
+                "[ComPool] %s: выполнено %s, в очереди %s, ожидание ср. %s мс, макс. %s мс",
+                s["name"], s["executed"], s["pending"], s["wait_avg_ms"], s["wait_max_ms"],
+            )
+
+    def stop(self) -> None:
+        for worker in (*self.readers, self.writer):
+            worker.stop()
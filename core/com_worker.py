@@ -0,0 +1,335 @@
+# com_worker.py • отдельный поток-владелец COM-подключения к 1С
+# -*- coding: utf-8 -*-
+"""Поток COM (STA), которому принадлежит ``COM1CBridge``.
+
+Все обращения к 1С выполняются в этом потоке по очереди. Интерфейс потока
+GUI остаётся прежним: ``ComProxy`` пересылает любой вызов в поток COM и
+ждёт результата, а ``ComWorker.call`` возвращает ``Future`` без ожидания.
+COM-объекты в результатах заворачиваются в ``ComProxy``, поэтому никогда не
+используются вне своего потока. Ссылка из другого подключения выгружается
+в строку в потоке-владельце, а вызов ставится в очередь, когда выгрузка
+готова, — вызывающий поток не ждёт ни одну из очередей.
+"""
+from __future__ import annotations
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import nullcontext
+from functools import reduce
+from inspect import ismethod
+from itertools import islice
+from typing import Any, Callable
+
+import pythoncom
+
+from .article_index import ArticleIndex
+from .logger import get_logger
+from .com_metrics import METRICS, PLAIN_TYPES, operation_name
+
+_log = get_logger(__name__)
+
+# Сколько элементов забирать из потока COM за один переход при переборе
+_ITER_CHUNK = 256
+
+
+class ComProxy:
+    """Заместитель объекта, живущего в потоке COM.
+
+    Чтение и запись атрибутов, вызовы и перебор выполняются в потоке-владельце.
+    """
+
+    __slots__ = ("_worker", "_obj")
+
+    def __init__(self, worker: 'ComWorker', obj: Any):
+        object.__setattr__(self, "_worker", worker)
+        object.__setattr__(self, "_obj", obj)
+
+    def __getattr__(self, name: str):
+        obj = self._obj
+        return self._worker.run_sync(lambda: getattr(obj, name))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        obj, worker = self._obj, self._worker
+        value = _unwrap(value, worker)
+        worker.run_sync(
+            lambda: setattr(obj, name, _materialize(worker, value)), after=_exports(value)
+        )
+
+    def __call__(self, *args, **kwargs):
+        obj, worker = self._obj, self._worker
+        args, kwargs = _unwrap(args, worker), _unwrap(kwargs, worker)
+
+        def run():
+            # синхронный вызов метода моста — отдельная операция в метриках
+            with METRICS.operation(operation_name(obj)) if ismethod(obj) else nullcontext():
+                return obj(*_materialize(worker, args), **_materialize(worker, kwargs))
+
+        return worker.run_sync(run, after=_exports((args, kwargs)))
+
+    def __iter__(self):
+        # элементы забираются порциями: генераторы моста не читаются целиком
+        obj, worker = self._obj, self._worker
+        state = {}
+
+        def chunk():
+            if "it" not in state:
+                state["it"] = iter(obj)
+            return list(islice(state["it"], _ITER_CHUNK))
+
+        while True:
+            items = worker.run_sync(chunk)
+            if not items:
+                return
+            yield from items
+
+    def __len__(self) -> int:
+        obj = self._obj
+        return self._worker.run_sync(lambda: len(obj))
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __str__(self) -> str:
+        obj = self._obj
+        return self._worker.run_sync(lambda: str(obj))
+
+    def __repr__(self) -> str:
+        return f"<ComProxy {self._worker.name}: {type(self._obj).__name__}>"
+
+
+class _Foreign:
+    """Значение из другого подключения, сериализованное ЗначениеВСтрокуВнутр."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: str):
+        self.data = data
+
+
+def _wrap(worker: 'ComWorker', value: Any) -> Any:
+    """Оставляет простые данные как есть, объекты заворачивает в ComProxy."""
+    if isinstance(value, PLAIN_TYPES) or isinstance(value, (ComProxy, _Foreign, ArticleIndex)):
+        return value
+    if isinstance(value, list):
+        return [_wrap(worker, v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_wrap(worker, v) for v in value)
+    if isinstance(value, dict):
+        return {k: _wrap(worker, v) for k, v in value.items()}
+    return ComProxy(worker, value)
+
+
+def _unwrap(value: Any, target: 'ComWorker | None' = None) -> Any:
+    """Достаёт исходные объекты из ComProxy перед вызовом в потоке ``target``.
+
+    Ссылка, принадлежащая другому подключению, заменяется Future её выгрузки
+    в строку (``ComWorker.export``); вызов ставится в очередь ``target`` после
+    выгрузки (``_exports``), а ссылка восстанавливается в ``_materialize``.
+    """
+    if isinstance(value, ComProxy):
+        owner = value._worker
+        if target is None or owner is target:
+            return value._obj
+        return owner.export(value._obj)
+    if isinstance(value, list):
+        return [_unwrap(v, target) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_unwrap(v, target) for v in value)
+    if isinstance(value, dict):
+        return {k: _unwrap(v, target) for k, v in value.items()}
+    return value
+
+
+def _exports(value: Any) -> list[Future]:
+    """Future выгрузок ссылок из других подключений внутри аргументов."""
+    if isinstance(value, Future):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return [f for v in value for f in _exports(v)]
+    if isinstance(value, dict):
+        return [f for v in value.values() for f in _exports(v)]
+    return []
+
+
+def _materialize(worker: 'ComWorker', value: Any) -> Any:
+    """Восстанавливает значения из других подключений (в потоке ``worker``)."""
+    if isinstance(value, Future):
+        value = value.result()  # выгрузка уже завершена: вызов ждал её в _enqueue
+    if isinstance(value, _Foreign):
+        return worker.bridge.connection.ValueFromStringInternal(value.data)
+    if isinstance(value, list):
+        return [_materialize(worker, v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_materialize(worker, v) for v in value)
+    if isinstance(value, dict):
+        return {k: _materialize(worker, v) for k, v in value.items()}
+    return value
+
+
+class ComWorker:
+    """Поток с очередью запросов к собственному COM-подключению.
+
+    ``factory`` создаёт мост уже внутри потока. Запросы с одинаковым ``key``
+    вытесняют друг друга: ожидающий запрос отменяется, а результат уже
+    выполняющегося считается устаревшим (см. ``is_current``).
+    """
+
+    def __init__(self, factory: Callable[[], Any], name: str = "com-worker"):
+        self.name = name
+        self._factory = factory
+        self._queue: queue.Queue = queue.Queue()
+        self._keys: dict[str, Future] = {}
+        self._keys_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._error: BaseException | None = None
+        self.bridge = None
+        # метрики: сколько запросов выполнено и сколько они ждали в очереди
+        self._stats_lock = threading.Lock()
+        self.executed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    # -------------------------------------------------------------
+    def _run(self) -> None:
+        pythoncom.CoInitialize()
+        try:
+            try:
+                self.bridge = self._factory()
+            except BaseException as e:
+                self._error = e
+                return
+            finally:
+                self._ready.set()
+
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                future, fn, queued_at = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                self._account(time.perf_counter() - queued_at)
+                try:
+                    future.set_result(_wrap(self, fn()))
+                except BaseException as e:
+                    future.set_exception(e)
+        finally:
+            self.bridge = None
+            pythoncom.CoUninitialize()
+
+    def wait_ready(self, timeout: float | None = None):
+        """Ждёт подключения к 1С; пробрасывает ошибку подключения."""
+        self._ready.wait(timeout)
+        if self._error is not None:
+            raise self._error
+        return self.bridge
+
+    def in_worker(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    # -------------------------------------------------------------
+    def submit(self, fn: Callable[[], Any], key: str | None = None, after=()) -> Future:
+        """Ставит функцию в очередь потока COM и возвращает Future.
+
+        Если заданы ``after`` (Future других потоков), функция попадает в
+        очередь, когда они все завершатся; вызывающий поток не ждёт.
+        """
+        future: Future = Future()
+        if key is not None:
+            with self._keys_lock:
+                previous = self._keys.get(key)
+                self._keys[key] = future
+            if previous is not None and previous.cancel():
+                _log.info("[ComWorker] запрос '%s' вытеснен новым", key)
+        self._enqueue(future, fn, [f for f in after if not f.done()])
+        return future
+
+    def _enqueue(self, future: Future, fn: Callable[[], Any], after: list[Future]) -> None:
+        if not after:
+            self._queue.put((future, fn, time.perf_counter()))
+            return
+        lock, left = threading.Lock(), [len(after)]
+
+        def ready(_):
+            with lock:
+                left[0] -= 1
+                if left[0]:
+                    return
+            self._queue.put((future, fn, time.perf_counter()))
+
+        for f in after:
+            f.add_done_callback(ready)
+
+    def call(self, method: str, *args, key: str | None = None, **kwargs) -> Future:
+        """Асинхронно вызывает метод моста (допускается путь 'a.b.method')."""
+        args, kwargs = _unwrap(args, self), _unwrap(kwargs, self)
+
+        def run():
+            target = reduce(getattr, method.split("."), self.bridge)
+            with METRICS.operation(operation_name(target)):
+                return target(*_materialize(self, args), **_materialize(self, kwargs))
+
+        return self.submit(run, key=key, after=_exports((args, kwargs)))
+
+    def run_sync(self, fn: Callable[[], Any], after=()) -> Any:
+        """Выполняет функцию в потоке COM и ждёт результата."""
+        if self.in_worker():
+            for f in after:
+                f.result()
+            return _wrap(self, fn())
+        return self.submit(fn, after=after).result()
+
+    def is_current(self, key: str, future: Future) -> bool:
+        """True, если future — последний запрос с этим ключом."""
+        with self._keys_lock:
+            return self._keys.get(key) is future
+
+    def export(self, obj: Any) -> Future:
+        """Ставит в очередь выгрузку ссылки этого подключения для передачи в другое.
+
+        В собственном потоке выгрузка выполняется сразу: очередь занята
+        текущим запросом, и ожидание выгрузки в ней не завершилось бы.
+        """
+        def run():
+            return _Foreign(str(self.bridge.connection.ValueToStringInternal(obj)))
+
+        if not self.in_worker():
+            return self.submit(run)
+        future: Future = Future()
+        try:
+            future.set_result(run())
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    # -------------------------------------------------------------
+    def _account(self, wait: float) -> None:
+        with self._stats_lock:
+            self.executed += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def pending(self) -> int:
+        """Количество запросов в очереди."""
+        return self._queue.qsize()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "name": self.name,
+                "executed": self.executed,
+                "pending": self.pending(),
+                "wait_avg_ms": round(1000 * self.wait_total / self.executed, 1) if self.executed else 0.0,
+                "wait_max_ms": round(1000 * self.wait_max, 1),
+            }
+
+    def proxy(self) -> ComProxy:
+        """Синхронный заместитель моста для кода, работающего в потоке GUI."""
+        return ComProxy(self, self.wait_ready())
+
+    def stop(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
@@ -1,67 +1,164 @@
 # config_parser.py
 # ─────────────────────────────────────────────────────────────
+import pickle
 import xml.etree.ElementTree as ET
 from pathlib import Path
 
 CONFIG_XML = Path("data/Configuration.xml")
 DUMP_XML = Path("data/ConfigDumpInfo.xml")
+# Разобранный индекс метаданных (пересобирается при изменении XML)
+INDEX_CACHE = Path("data/config_index.pickle")
 
-# ─────────────────────── Список документов из Configuration.xml ──────────────
-def extract_document_names() -> list[str]:
-    """Возвращает все имена документов из Configuration.xml."""
+_V8 = "{http://v8.1c.ru/8.1/data/core}"
+# Виды объектов, для которых индексируются реквизиты/табличные части/значения
+_INDEXED_KINDS = ("Catalog", "Document", "Enum")
+_INDEX_VERSION = 1
+
+_index: dict | None = None
+_index_key: tuple | None = None
+
+
+# ─────────────────────── Индекс метаданных ───────────────────────
+def _signature() -> tuple:
+    """Ключ актуальности индекса: размер и время изменения исходных XML."""
+    key = [_INDEX_VERSION]
+    for path in (CONFIG_XML, DUMP_XML):
+        try:
+            st = path.stat()
+            key.append((str(path), st.st_mtime_ns, st.st_size))
+        except OSError:
+            key.append((str(path), None, None))
+    return tuple(key)
+
+
+def _scan_configuration(index: dict) -> None:
+    """Один потоковый проход по Configuration.xml: документы и справочники."""
     if not CONFIG_XML.exists():
-        return []
+        return
+    documents = index["documents"]
+    for _, elem in ET.iterparse(CONFIG_XML, events=("end",)):
+        if elem.tag.endswith("Document") and not len(elem) and elem.text:
+            documents.append(elem.text)
+        elif elem.tag == f"{_V8}Catalog":
+            name = elem.attrib.get("name") or elem.findtext(f"{_V8}Name", default="")
+            synonym = elem.findtext(f"{_V8}Synonym/{_V8}item/{_V8}content", default="")
+            if name and synonym:
+                index["catalogs"][name] = synonym
+
+
+def _scan_dump(index: dict) -> None:
+    """Один потоковый проход по ConfigDumpInfo.xml.
+
+    Из записей ``<Metadata name="Вид.Имя.Подвид.Имя">`` собираются реквизиты,
+    табличные части и значения перечислений; из ``v8:CatalogObject`` —
+    элементы справочников. Обработанные элементы сразу очищаются.
+    """
+    if not DUMP_XML.exists():
+        return
+    objects = index["objects"]
+    items = index["catalog_items"]
+    in_catalog = 0
+    for event, elem in ET.iterparse(DUMP_XML, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag == f"{_V8}CatalogObject":
+                in_catalog += 1
+            elif tag.endswith("}Metadata"):
+                parts = elem.attrib.get("name", "").split(".")
+                if parts[0] in _INDEXED_KINDS and len(parts) in (2, 4):
+                    fields = objects[parts[0]].setdefault(parts[1], {})
+                    if len(parts) == 4:
+                        fields.setdefault(parts[2], []).append(parts[3])
+            continue
+
+        if tag == f"{_V8}CatalogObject":
+            in_catalog -= 1
+            name = elem.attrib.get("name")
+            values = items.setdefault(name, set()) if name else set()
+            for el in elem.findall(f"{_V8}Items/{_V8}Item"):
+                val = el.findtext(f"{_V8}Description", default="")
+                if val:
+                    values.add(val)
+        if not in_catalog:
+            elem.clear()
+
+
+def _build_index() -> dict:
+    index = {
+        "documents": [],
+        "catalogs": {},
+        "catalog_items": {},
+        "objects": {kind: {} for kind in _INDEXED_KINDS},
+    }
+    _scan_configuration(index)
+    _scan_dump(index)
+    index["catalog_items"] = {k: sorted(v) for k, v in index["catalog_items"].items()}
+    index["document_set"] = frozenset(index["documents"])
+    return index
+
 
-    tree = ET.parse(CONFIG_XML)
-    root = tree.getroot()
+def config_index() -> dict:
+    """Индекс метаданных конфигурации.
 
-    names = []
-    for elem in root.iter():
-        if elem.tag.endswith("Document") and not list(elem) and elem.text:
-            names.append(elem.text)
-    return names
+    Хранится в памяти и в ``INDEX_CACHE``; XML разбирается заново только
+    если изменились размер или время изменения исходных файлов.
+    """
+    global _index, _index_key
+    key = _signature()
+    if _index is not None and _index_key == key:
+        return _index
+
+    index = None
+    try:
+        with INDEX_CACHE.open("rb") as f:
+            cached_key, cached = pickle.load(f)
+        if cached_key == key:
+            index = cached
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError):
+        pass
+
+    if index is None:
+        index = _build_index()
+        try:
+            tmp = INDEX_CACHE.with_suffix(".tmp")
+            with tmp.open("wb") as f:
+                pickle.dump((key, index), f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp.replace(INDEX_CACHE)
+        except OSError:
+            pass  # кэш на диске необязателен
+
+    _index, _index_key = index, key
+    return index
+
+
+# ─────────────────────── Список документов из Configuration.xml ──────────────
+def extract_document_names() -> list[str]:
+    """Возвращает все имена документов из Configuration.xml."""
+    return list(config_index()["documents"])
 
 def has_document(name: str) -> bool:
     """Проверяет наличие документа с указанным именем."""
-    return name in extract_document_names()
+    return name in config_index()["document_set"]
 
 # ─────────────────────── Реальная загрузка значений справочников ───────────────────────
 def get_catalog_items(name: str) -> list[str]:
-    """Чтение значений конкретного справочника из ConfigDumpInfo.xml"""
-    if not DUMP_XML.exists():
-        return []
-
-    ns = {'v8': 'http://v8.1c.ru/8.1/data/core'}
-    tree = ET.parse(DUMP_XML)
-    root = tree.getroot()
-
-    result = set()
-
-    for obj in root.findall(".//v8:CatalogObject", ns):
-        if obj.attrib.get("name") == name:
-            for el in obj.findall("v8:Items/v8:Item", ns):
-                val = el.findtext("v8:Description", default="", namespaces=ns)
-                if val:
-                    result.add(val)
-    return sorted(result)
+    """Значения конкретного справочника из ConfigDumpInfo.xml"""
+    return list(config_index()["catalog_items"].get(name, []))
 
 # ─────────────────────── Найти список всех справочников ───────────────────────
 def extract_catalog_names() -> dict:
     """Извлекает список всех справочников с русским именем (синонимом)."""
-    if not CONFIG_XML.exists():
-        return {}
-
-    ns = {'v8': 'http://v8.1c.ru/8.1/data/core'}
-    tree = ET.parse(CONFIG_XML)
-    root = tree.getroot()
-
-    catalogs = {}
-    for elem in root.findall(".//v8:Catalog", ns):
-        name = elem.attrib.get("name") or elem.findtext("v8:Name", default="", namespaces=ns)
-        synonym = elem.findtext("v8:Synonym/v8:item/v8:content", default="", namespaces=ns)
-        if name and synonym:
-            catalogs[name] = synonym
-    return catalogs
+    return dict(config_index()["catalogs"])
+
+# ─────────────────────── Реквизиты и значения перечислений ───────────────────────
+def get_object_fields(kind: str, name: str, part: str = "Attribute") -> list[str]:
+    """Имена подчинённых объектов метаданных: ``get_object_fields("Catalog",
+    "Номенклатура")`` — реквизиты, ``part="TabularSection"`` — табличные части."""
+    return list(config_index()["objects"].get(kind, {}).get(name, {}).get(part, []))
+
+def get_enum_values(name: str) -> list[str]:
+    """Имена значений перечисления."""
+    return get_object_fields("Enum", name, "EnumValue")
 
 # ─────────────────────── Пример CLI-отладки ───────────────────────
 if __name__ == "__main__":
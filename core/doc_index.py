@@ -0,0 +1,135 @@
+# doc_index.py • индекс документов 1С по номеру и дате
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import time
+from typing import Any
+
+from . import queries
+from .logger import get_logger
+
+_log = get_logger(__name__)
+
+# Сколько секунд помнить, что документа с номером нет, прежде чем спросить 1С снова
+MISS_TTL = 30.0
+
+
+def _day(value: Any) -> str:
+    """Приводит дату 1С/строку к виду 'ГГГГ-ММ-ДД'."""
+    return str(value)[:10] if value else ""
+
+
+class DocumentIndex:
+    """Индекс «вид документа → номер → [(дата, ссылка)]».
+
+    Промах по индексу закрывается одним запросом по номеру (или
+    ``FindByNumber``, если запрос выполнить не удалось), поэтому поиск
+    документа не зависит от количества документов в базе. Отсутствие номера
+    запоминается на ``MISS_TTL`` секунд: повторный поиск того же номера не
+    выполняет запрос, пока документ не зарегистрирован через мост.
+    """
+
+    def __init__(self, bridge: 'COM1CBridge'):
+        self.bridge = bridge
+        self._index: dict[str, dict[str, list[tuple[str, Any]]]] = {}
+        self._misses: dict[tuple[str, str], float] = {}
+
+    # -------------------------------------------------------------
+    def register(self, doc_name: str, number: Any, date: Any, ref: Any) -> None:
+        """Добавляет (или заменяет) документ в индексе."""
+        key = str(number).strip()
+        day = _day(date)
+        self._misses.pop((doc_name, key), None)
+        entries = self._index.setdefault(doc_name, {}).setdefault(key, [])
+        entries[:] = [e for e in entries if e[0] != day]
+        entries.append((day, ref))
+        entries.sort(key=lambda e: e[0], reverse=True)
+
+    def forget(self, doc_name: str, number: Any, date: Any = None) -> None:
+        """Удаляет документ из индекса (все даты, если дата не указана)."""
+        numbers = self._index.get(doc_name)
+        if not numbers:
+            return
+        key = str(number).strip()
+        if date is None:
+            numbers.pop(key, None)
+            return
+        day = _day(date)
+        entries = [e for e in numbers.get(key, []) if e[0] != day]
+        if entries:
+            numbers[key] = entries
+        else:
+            numbers.pop(key, None)
+
+    def clear(self, doc_name: str | None = None) -> None:
+        if doc_name is None:
+            self._index.clear()
+            self._misses.clear()
+        else:
+            self._index.pop(doc_name, None)
+            self._misses = {k: t for k, t in self._misses.items() if k[0] != doc_name}
+
+    # -------------------------------------------------------------
+    def _pick(self, doc_name: str, key: str, date: Any):
+        entries = self._index.get(doc_name, {}).get(key)
+        if not entries:
+            return None
+        if date:
+            day = _day(date)
+            return next((ref for d, ref in entries if d == day), None)
+        return entries[0][1]
+
+    def _load_number(self, doc_name: str, key: str) -> None:
+        """Подтягивает в индекс все документы с указанным номером."""
+        try:
+            selection = self.bridge.query_select(
+                queries.DOC_BY_NUMBER.format(doc=doc_name), Номер=key
+            )
+            while selection.Next():
+                self.register(doc_name, selection.Номер, selection.Дата, selection.Ссылка)
+            return
+        except Exception as e:
+            _log.warning("[DocumentIndex] Запрос по номеру %s №%s не выполнен: %s", doc_name, key, e)
+
+        manager = getattr(self.bridge.documents, doc_name, None)
+        if manager is None:
+            return
+        try:
+            ref = manager.FindByNumber(key)
+            if ref is not None and not ref.IsEmpty():
+                self.register(doc_name, key, ref.Дата, ref)
+        except Exception as e:
+            _log.error("[DocumentIndex] FindByNumber %s №%s: %s", doc_name, key, e)
+
+    def find_ref(self, doc_name: str, number: Any, date: Any = None):
+        """Возвращает ссылку на документ по номеру (и дате) или None.
+
+        Без даты возвращается самый поздний документ с этим номером.
+        """
+        key = str(number).strip()
+        ref = self._pick(doc_name, key, date)
+        if ref is None:
+            missed = self._misses.get((doc_name, key))
+            if missed is not None and time.monotonic() - missed < MISS_TTL:
+                return None
+            self._load_number(doc_name, key)
+            ref = self._pick(doc_name, key, date)
+            if ref is None:
+                self._misses[(doc_name, key)] = time.monotonic()
+        return ref
+
+    def find_object(self, doc_name: str, number: Any, date: Any = None):
+        """Возвращает объект документа по номеру (и дате) или None."""
+        for attempt in range(2):
+            ref = self.find_ref(doc_name, number, date)
+            if ref is None:
+                return None
+            try:
+                obj = ref.GetObject()
+            except Exception as e:
+                _log.warning("[DocumentIndex] Ссылка %s №%s устарела: %s", doc_name, number, e)
+                obj = None
+            if obj is not None:
+                return obj
+            # документ удалён в другом сеансе — сбрасываем запись и ищем заново
+            self.forget(doc_name, number, date)
+        return None
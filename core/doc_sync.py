@@ -0,0 +1,138 @@
+# doc_sync.py • инкрементальное обновление списков документов
+# -*- coding: utf-8 -*-
+"""Сверка списков документов по ``ВерсияДанных``.
+
+Состояние хранит вызывающая сторона (страница): словарь «ключ → версия»,
+где ключ — номер и дата документа. Мост остаётся без состояния, поэтому
+синхронизацию можно выполнять в любом подключении пула.
+
+Сверка читает версии всех документов, подходящих под отбор, поэтому её
+стоимость определяется окном списка (``since``), а не всей базой; без окна
+и отбора сверяется каждый документ вида.
+"""
+from __future__ import annotations
+from typing import Any, Callable, Iterator
+
+from . import queries
+
+
+def doc_key(number: Any, date: Any) -> str:
+    """Ключ документа в списке: номер и дата."""
+    return f"{str(number).strip()}|{date}"
+
+
+def diff_versions(
+    bridge: 'COM1CBridge',
+    doc_name: str,
+    known: dict[str, str],
+    filters: str = "",
+    **params,
+):
+    """Сравнивает версии документов с известными.
+
+    ``filters`` и ``params`` ограничивают сверку документами, которые
+    показывает список (отбор, окно дат ``queries.DOC_SINCE``): документ,
+    вышедший из отбора, попадает в удалённые.
+
+    Возвращает (массив ссылок изменённых/новых документов, ключи удалённых,
+    актуальные версии).
+    """
+    selection = bridge.query_select(
+        queries.DOC_VERSIONS.format(doc=doc_name, filters=filters), **params
+    )
+    changed = bridge.connection.NewObject("Массив")
+    versions: dict[str, str] = {}
+    while selection.Next():
+        key = doc_key(selection.Номер, selection.Дата)
+        version = str(selection.ВерсияДанных)
+        versions[key] = version
+        if known.get(key) != version:
+            changed.Add(selection.Ссылка)
+    removed = [key for key in known if key not in versions]
+    return changed, removed, versions
+
+
+def sync_list(
+    bridge: 'COM1CBridge',
+    doc_name: str,
+    known: dict[str, str] | None,
+    read: Callable[[Any], list[tuple[str, dict]]],
+    filters: str = "",
+    since: Any = None,
+    **params,
+) -> dict:
+    """Изменения списка с момента, описанного ``known``.
+
+    ``read(refs)`` возвращает пары (ключ, строка списка); ``refs=None`` —
+    весь список. ``filters``/``params`` — см. ``diff_versions``; ``since`` —
+    дата начала окна списка (``queries.DOC_SINCE``). Результат: ``full``
+    (список целиком), ``changed`` — пары [ключ, строка], ``removed`` —
+    ключи, ``versions`` — новое состояние.
+    """
+    known = known or {}
+    if since is not None:
+        condition, param = queries.DOC_SINCE
+        filters += condition
+        params[param] = since
+    changed, removed, versions = diff_versions(bridge, doc_name, known, filters, **params)
+    if not known and not filters:
+        rows = read(None)
+    elif changed.Count():
+        rows = read(changed)
+    else:
+        rows = []
+    return {
+        "full": not known,
+        "changed": [[key, row] for key, row in rows],
+        "removed": removed,
+        "versions": versions,
+    }
+
+
+def read_page(
+    bridge: 'COM1CBridge',
+    doc_name: str,
+    read: Callable[[Any], list[tuple[str, dict]]],
+    cursor: tuple | None = None,
+    page_size: int = 200,
+) -> dict:
+    """Страница списка по ключу (дата, номер), без смещений.
+
+    ``cursor`` — значение ``next`` предыдущей страницы (None — с начала).
+    Результат: ``rows`` — пары [ключ, строка], ``next`` — курсор следующей
+    страницы или None, если список закончился.
+    """
+    where = queries.PAGE_AFTER if cursor is not None else ""
+    params = {"Дата": cursor[0], "Номер": cursor[1]} if cursor is not None else {}
+    selection = bridge.query_select(
+        queries.DOC_PAGE.format(doc=doc_name, limit=int(page_size), where=where), **params
+    )
+    refs = bridge.connection.NewObject("Массив")
+    last = None
+    while selection.Next():
+        refs.Add(selection.Ссылка)
+        last = (selection.Дата, selection.Номер)
+    count = refs.Count()
+    if not count:
+        return {"rows": [], "next": None}
+    return {
+        "rows": [[key, row] for key, row in read(refs)],
+        "next": last if count >= page_size else None,
+    }
+
+
+def iter_list(
+    bridge: 'COM1CBridge',
+    doc_name: str,
+    read: Callable[[Any], list[tuple[str, dict]]],
+    page_size: int = 200,
+) -> Iterator[dict]:
+    """Строки списка страницами по ``page_size``: в памяти одна страница."""
+    cursor = None
+    while True:
+        page = read_page(bridge, doc_name, read, cursor, page_size)
+        for _, row in page["rows"]:
+            yield row
+        cursor = page["next"]
+        if cursor is None:
+            return
@@ -0,0 +1,79 @@
+# enum_index.py • индекс значений перечислений 1С по метаданным
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+from typing import Any
+
+from .logger import get_logger
+
+_log = get_logger(__name__)
+
+
+class EnumIndex:
+    """Индекс «перечисление → имя/представление → значение».
+
+    Имена и синонимы значений читаются один раз из
+    ``Metadata.Enums.<Имя>.EnumValues`` (по одному перечислению, при первом
+    обращении). Ключи поиска — имя и представление в ``casefold``, поэтому
+    поиск не требует перебора ``dir()`` и вызовов ``GetPresentation``.
+    Сами значения получаются при первом запросе и запоминаются.
+    """
+
+    def __init__(self, bridge: 'COM1CBridge'):
+        self.bridge = bridge
+        # перечисление → ключ поиска → имя значения (None — перечисления нет)
+        self._keys: dict[str, dict[str, str] | None] = {}
+        # перечисление → [(имя значения, представление)] в порядке метаданных
+        self._labels: dict[str, list[tuple[str, str]]] = {}
+        self._values: dict[tuple[str, str], Any] = {}
+
+    # -------------------------------------------------------------
+    def _load(self, enum_name: str) -> dict[str, str] | None:
+        if enum_name in self._keys:
+            return self._keys[enum_name]
+        keys: dict[str, str] | None = None
+        try:
+            meta = self.bridge.connection.Metadata.Enums.Find(enum_name)
+            if meta is not None:
+                keys, labels = {}, []
+                for value in meta.EnumValues:
+                    name = str(value.Name)
+                    label = str(value.Synonym or "").strip() or name
+                    labels.append((name, label))
+                    keys.setdefault(name.casefold(), name)
+                    keys.setdefault(label.casefold(), name)
+                self._labels[enum_name] = labels
+                _log.info("[EnumIndex] %s: %s значений", enum_name, len(labels))
+        except Exception as e:
+            _log.error("[EnumIndex] Ошибка чтения метаданных %s: %s", enum_name, e)
+            return None
+        self._keys[enum_name] = keys
+        return keys
+
+    def value(self, enum_name: str, name: str):
+        """Значение перечисления по имени (``Перечисления.<enum>.<name>``)."""
+        key = (enum_name, name)
+        if key not in self._values:
+            enum = getattr(self.bridge.enums, enum_name, None)
+            self._values[key] = getattr(enum, name, None) if enum is not None else None
+        return self._values[key]
+
+    def find(self, enum_name: str, description: Any):
+        """Значение по имени или представлению (без учёта регистра)."""
+        keys = self._load(enum_name)
+        if not keys or description is None:
+            return None
+        name = keys.get(str(description).strip().casefold())
+        return self.value(enum_name, name) if name else None
+
+    def exists(self, enum_name: str) -> bool:
+        return self._load(enum_name) is not None
+
+    def presentations(self, enum_name: str) -> list[str]:
+        """Представления значений в порядке метаданных."""
+        self._load(enum_name)
+        return [label for _, label in self._labels.get(enum_name, [])]
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._labels.clear()
+        self._values.clear()
@@ -1,16 +1,105 @@
+# logger.py • журнал приложения: очередь + поток записи с ротацией файла
+# -*- coding: utf-8 -*-
+"""Настройка журнала ``gui1c``.
+
+Вызов ``logger.info(...)`` только кладёт запись в очередь: оформление строки
+и запись в консоль и ``gui1c.log`` выполняет отдельный поток
+(``QueueListener``), поэтому журнал не тормозит поток GUI и потоки COM.
+Файл ротируется по размеру.
+
+Уровень задаётся явно при вызове; аргументы передаются отдельно
+(``log.debug("строка %s", row)``) и превращаются в текст, только если
+запись пройдёт по уровню. Подробность настраивается по модулям::
+
+    LOG_LEVEL=INFO LOG_LEVELS="core.orders_bridge=DEBUG,core.catalog_cache=WARNING"
+"""
+import atexit
+import copy
 import logging
+import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 LOG_FILE = Path(__file__).resolve().parent.parent / "gui1c.log"
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler(LOG_FILE, encoding="utf-8"),
-    ],
-)
+# Ротация gui1c.log: размер файла и число архивных копий (gui1c.log.1 …)
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+LOG_BACKUPS = int(os.getenv("LOG_BACKUPS", "3"))
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(threadName)s %(name)s: %(message)s"
 
 logger = logging.getLogger("gui1c")
+
+
+class _QueueHandler(QueueHandler):
+    """Кладёт запись в очередь, подставив аргументы в вызывающем потоке.
+
+    Аргументами бывают объекты COM: превращать их в текст можно только в
+    потоке-владельце, а оформление строки и запись — уже в потоке журнала.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: QueueListener | None = None
+
+
+def setup(file: Path | None = LOG_FILE, console: bool = True) -> None:
+    """(Пере)настраивает вывод журнала: консоль и/или файл с ротацией."""
+    global _listener
+    shutdown()
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers: list[logging.Handler] = []
+    if console:
+        handlers.append(logging.StreamHandler(sys.stdout))
+    if file is not None:
+        handlers.append(RotatingFileHandler(
+            file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8", delay=True,
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_QueueHandler(records))
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown() -> None:
+    """Дописывает очередь и останавливает поток журнала."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def configure_levels(default: str | None = None, levels: str | None = None) -> None:
+    """Уровни журнала: общий для ``gui1c`` и по модулям (``"модуль=УРОВЕНЬ,…"``)."""
+    logger.setLevel((default or os.getenv("LOG_LEVEL", "INFO")).upper())
+    spec = levels if levels is not None else os.getenv("LOG_LEVELS", "")
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.partition("=")
+        get_logger(name.strip()).setLevel(level.strip().upper() or "INFO")
+
+
+def get_logger(module: str) -> logging.Logger:
+    """Журнал модуля: ``get_logger(__name__)`` → ``gui1c.core.orders_bridge``."""
+    return logger.getChild(module)
+
+
+setup()
+configure_levels()
+atexit.register(shutdown)
@@ -0,0 +1,86 @@
+# numbering.py • номера документов без перебора базы
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import threading
+import time
+
+from . import queries
+from .logger import get_logger
+
+_log = get_logger(__name__)
+
+# Сколько секунд доверять запомненному номеру, прежде чем перечитать его из 1С
+NUMBER_TTL = 60.0
+
+
+class NumberAllocator:
+    """Последний и следующий номер документа одного вида.
+
+    Наибольший номер читается одним запросом (``ПЕРВЫЕ 1 … Номер УБЫВ``) и
+    запоминается на ``NUMBER_TTL`` секунд; номера документов, записанных
+    через мост, учитываются локально (``observe``). Поэтому форма нового
+    документа получает номер без обращения к 1С. Сам номер при записи
+    по-прежнему присваивает 1С.
+    """
+
+    def __init__(self, bridge: 'COM1CBridge', doc_name: str, prefix: str, width: int = 6):
+        self.bridge = bridge
+        self.doc_name = doc_name
+        self.prefix = prefix
+        self.width = width
+        self._last: int | None = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------------------
+    def _parse(self, number: str) -> int | None:
+        prefix, _, digits = str(number).strip().rpartition("-")
+        if not digits.isdigit():
+            return None
+        if prefix:
+            self.prefix, self.width = prefix, len(digits)
+        return int(digits)
+
+    def _format(self, value: int) -> str:
+        return f"{self.prefix}-{value:0{self.width}d}"
+
+    def _query_last(self) -> int:
+        try:
+            selection = self.bridge.query_select(queries.LAST_NUMBER.format(doc=self.doc_name))
+            if selection.Next():
+                value = self._parse(selection.Номер)
+                if value is not None:
+                    return value
+        except Exception as e:
+            _log.warning("[NumberAllocator] Последний номер %s не прочитан: %s", self.doc_name, e)
+        return 0
+
+    def _current(self, refresh: bool = False) -> int:
+        if refresh or self._last is None or time.monotonic() - self._loaded_at > NUMBER_TTL:
+            last = self._query_last()
+            self._last = last if refresh or self._last is None else max(last, self._last)
+            self._loaded_at = time.monotonic()
+        return self._last
+
+    # -------------------------------------------------------------
+    def last(self, refresh: bool = False) -> str:
+        """Наибольший номер документа в базе (с учётом записанных через мост)."""
+        with self._lock:
+            return self._format(self._current(refresh))
+
+    def next(self) -> str:
+        """Номер, который получит следующий документ."""
+        with self._lock:
+            return self._format(self._current() + 1)
+
+    def observe(self, number: str) -> None:
+        """Учитывает номер записанного документа."""
+        with self._lock:
+            value = self._parse(number)
+            if value is not None and self._last is not None:
+                self._last = max(self._last, value)
+
+    def invalidate(self) -> None:
+        """Следующий запрос номера перечитает его из 1С."""
+        with self._lock:
+            self._last = None
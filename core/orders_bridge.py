@@ -5,7 +5,12 @@ import tempfile
 from typing import Any
 from win32com.client import VARIANT
 from pythoncom import VT_BOOL
-from .com_bridge import safe_str, log
+from .com_bridge import safe_str, PRODUCTION_STATUS_MAP
+from .logger import get_logger
+from . import queries
+from .doc_sync import doc_key, sync_list, read_page, iter_list
+
+_log = get_logger(__name__)
 
 
 class OrdersBridge:
@@ -17,7 +22,7 @@ class OrdersBridge:
     def print_order_preview_pdf(self, number: str, date: str | None = None) -> bool:
         obj = self.bridge._find_document_by_number("ЗаказВПроизводство", number, date)
         if not obj:
-            log(f"[Печать] Заказ №{number} не найден")
+            _log.info("[Печать] Заказ №%s не найден", number)
             return False
         try:
             form = obj.GetForm("ФормаДокумента")
@@ -25,37 +30,20 @@ class OrdersBridge:
             pdf_path = os.path.join(temp_dir, f"Заказ_{number}.pdf")
             form.PrintFormToFile("Заказ в производство с фото", pdf_path)
             if os.path.exists(pdf_path):
-                log(f"📄 PDF сформирован: {pdf_path}")
+                _log.info("📄 PDF сформирован: %s", pdf_path)
                 os.startfile(pdf_path)
                 return True
-            log("❌ Не удалось сохранить PDF")
+            _log.error("Не удалось сохранить PDF")
             return False
         except Exception as e:
-            log(f"❌ Ошибка при формировании PDF: {e}")
+            _log.error("Ошибка при формировании PDF: %s", e)
             return False
 
     def get_last_order_number(self) -> str:
-        doc = getattr(self.bridge.documents, "ЗаказВПроизводство", None)
-        if not doc:
-            return "00ЮП-000000"
-        selection = doc.Select()
-        number = "00ЮП-000000"
-        while selection.Next():
-            try:
-                obj = selection.GetObject()
-                number = str(obj.Number)
-            except Exception:
-                continue
-        return number
+        return self.bridge.order_numbers.last()
 
     def get_next_order_number(self) -> str:
-        last = self.get_last_order_number()
-        try:
-            prefix, num = last.split("-")
-            next_num = int(num) + 1
-            return f"{prefix}-{next_num:06d}"
-        except Exception:
-            return "00ЮП-000001"
+        return self.bridge.order_numbers.next()
 
     # -------------------------------------------------------------
     # Методы работы с документом "ЗаказВПроизводство"
@@ -64,92 +52,201 @@ class OrdersBridge:
     def undo_posting(self, number: str, date: str | None = None) -> bool:
         obj = self.bridge._find_document_by_number("ЗаказВПроизводство", number, date)
         if not obj:
-            log(f"[UndoPosting] Документ №{number} не найден")
+            _log.info("[UndoPosting] Документ №%s не найден", number)
             return False
         try:
             obj.UndoPosting()
             obj.Write()
-            log(f"✔ Проведение снято для заказа №{number}")
+            _log.info("✔ Проведение снято для заказа №%s", number)
             return True
         except Exception as e:
-            log(f"❌ UndoPosting error: {e}")
+            _log.error("UndoPosting error: %s", e)
             return False
 
     def delete_order_by_number(self, number: str, date: str | None = None) -> bool:
         obj = self.bridge._find_document_by_number("ЗаказВПроизводство", number, date)
         if not obj:
-            log(f"[Удаление] Заказ №{number} не найден")
+            _log.info("[Удаление] Заказ №%s не найден", number)
             return False
         try:
             if getattr(obj, "Проведен", False):
-                log("⚠ Документ проведён, снимаем проведение...")
+                _log.warning("Документ проведён, снимаем проведение...")
                 self.undo_posting(number)
             obj.Delete()
-            log("🗑 Документ удалён полностью")
+            self.bridge.doc_index.forget("ЗаказВПроизводство", number, date)
+            _log.info("🗑 Документ удалён полностью")
             return True
         except Exception as e:
-            log(f"❌ Ошибка при удалении: {e}")
+            _log.error("Ошибка при удалении: %s", e)
             return False
 
     def post_order(self, number: str, date: str | None = None) -> bool:
         obj = self.bridge._find_document_by_number("ЗаказВПроизводство", number, date)
         if not obj:
-            log(f"[Проведение] Заказ №{number} не найден")
+            _log.info("[Проведение] Заказ №%s не найден", number)
             return False
         try:
             obj.Проведен = True
             obj.Write()
             if getattr(obj, "Проведен", False):
-                log(f"[Проведение] Заказ №{number} успешно проведён через флаг Проведен")
+                _log.info("[Проведение] Заказ №%s успешно проведён через флаг Проведен", number)
                 return True
-            log(f"[Проведение] Не удалось провести заказ №{number}")
+            _log.info("[Проведение] Не удалось провести заказ №%s", number)
             return False
         except Exception as e:
-            log(f"[Проведение] Ошибка при установке Проведен: {e}")
+            _log.error("[Проведение] Ошибка при установке Проведен: %s", e)
             return False
 
     def mark_order_for_deletion(self, number: str, date: str | None = None) -> bool:
         obj = self.bridge._find_document_by_number("ЗаказВПроизводство", number, date)
         if not obj:
-            log(f"[Пометка] Документ №{number} не найден")
+            _log.info("[Пометка] Документ №%s не найден", number)
             return False
         try:
             if getattr(obj, "Проведен", False):
-                log("⚠ Документ проведён. Снимаем проведение перед пометкой")
+                _log.warning("Документ проведён. Снимаем проведение перед пометкой")
                 obj.UndoPosting()
                 obj.Write()
             obj.DeletionMark = VARIANT(VT_BOOL, True)
             obj.Write()
             if getattr(obj, "DeletionMark", False):
-                log(f"🗑 Документ №{number} помечен на удаление")
+                _log.info("🗑 Документ №%s помечен на удаление", number)
                 return True
-            log("❌ Не удалось установить пометку на удаление")
+            _log.error("Не удалось установить пометку на удаление")
             return False
         except Exception as e:
-            log(f"❌ Ошибка при установке пометки: {e}")
+            _log.error("Ошибка при установке пометки: %s", e)
             return False
 
     def unmark_order_deletion(self, number: str, date: str | None = None) -> bool:
         obj = self.bridge._find_document_by_number("ЗаказВПроизводство", number, date)
         if not obj:
-            log(f"[Снятие пометки] Документ №{number} не найден")
+            _log.info("[Снятие пометки] Документ №%s не найден", number)
             return False
         try:
             obj.DeletionMark = VARIANT(VT_BOOL, False)
             obj.Write()
             if not getattr(obj, "DeletionMark", True):
-                log(f"✅ Пометка на удаление снята с документа №{number}")
+                _log.info("✅ Пометка на удаление снята с документа №%s", number)
                 return True
-            log("❌ Не удалось снять пометку")
+            _log.error("Не удалось снять пометку")
             return False
         except Exception as e:
-            log(f"❌ Ошибка при снятии пометки: {e}")
+            _log.error("Ошибка при снятии пометки: %s", e)
             return False
 
+    # -------------------------------------------------------------
+    # Запись табличной части «Товары»
+    # -------------------------------------------------------------
+
+    @staticmethod
+    def _line_key(name, variant, size, qty, weight, note) -> tuple:
+        """Значения строки в сравнимом виде (представления справочников и числа)."""
+        variant = "" if variant in (None, "—") else str(variant).strip()
+        try:
+            size = round(float(str(size).strip().replace(",", ".")), 2)
+        except ValueError:
+            size = str(size).strip()
+        return (
+            str(name or "").strip(), variant, size,
+            int(qty or 0), round(float(weight or 0), 3), str(note or "").strip(),
+        )
+
+    def _current_row_keys(self, ref) -> list[tuple]:
+        """Строки записанного заказа одним запросом, в порядке табличной части."""
+        selection = self.bridge.query_select(queries.ORDER_ROWS, Ссылка=ref)
+        keys = []
+        while selection.Next():
+            keys.append(self._line_key(
+                selection.Номенклатура, selection.ВариантИзготовления, selection.Размер,
+                selection.Количество, selection.Вес, selection.Примечание,
+            ))
+        return keys
+
+    def _resolve_rows(self, items: list) -> list[dict]:
+        """Ссылки для строк заказа: каждое значение ищется один раз на пакет."""
+        refs: dict[tuple[str, str], Any] = {}
+
+        def ref(catalog: str, description: str):
+            key = (catalog, description)
+            if key not in refs:
+                if catalog == "Размеры":
+                    refs[key] = self.bridge.get_size_ref(description)
+                else:
+                    refs[key] = self.bridge.get_ref(catalog, description)
+            return refs[key]
+
+        resolved = []
+        for row in items:
+            variant = row.get("ВариантИзготовления")
+            size_val = str(row.get("Размер", 0)).strip().replace(",", ".")
+            resolved.append({
+                "Номенклатура": ref("Номенклатура", row.get("Номенклатура")),
+                "ВариантИзготовления": (
+                    ref("ВариантыИзготовленияНоменклатуры", variant)
+                    if variant and variant != "—" else None
+                ),
+                "Размер": ref("Размеры", size_val),
+                "Количество": int(row.get("Количество", 1)),
+                "Вес": float(row.get("Вес", 0)),
+                "Примечание": row.get("Примечание", ""),
+            })
+        return resolved
+
+    def _write_rows(self, obj, items: list, current: list[tuple] | None = None) -> int:
+        """Заполняет «Товары» одной загрузкой таблицы значений.
+
+        ``current`` — ключи уже записанных строк (``_current_row_keys``):
+        строки, совпадающие по позиции, не меняются, ссылки ищутся только
+        для изменённых. Строка с той же номенклатурой правится на месте, а
+        на место строки с другой номенклатурой вставляется новая: реквизиты,
+        которые мост не заполняет (проба, цвет, вставки, цены), не переходят
+        от прежнего товара. Возвращает число изменённых строк (0 — без записи).
+        """
+        current = current or []
+        keys = [
+            self._line_key(
+                r.get("Номенклатура"), r.get("ВариантИзготовления"), r.get("Размер", 0),
+                r.get("Количество", 1), r.get("Вес", 0), r.get("Примечание", ""),
+            )
+            for r in items
+        ]
+        changed = [i for i, key in enumerate(keys) if i >= len(current) or current[i] != key]
+        if not changed and len(keys) == len(current):
+            return 0
+
+        # ненайденная ссылка очищает поле: в переиспользуемой строке
+        # не должно остаться прежнее значение
+        catalogs = self.bridge.catalogs
+        empty = {
+            "Номенклатура": catalogs.Номенклатура.EmptyRef(),
+            "ВариантИзготовления": catalogs.ВариантыИзготовленияНоменклатуры.EmptyRef(),
+            "Размер": catalogs.Размеры.EmptyRef(),
+        }
+        table = obj.Товары.Unload()
+        while table.Count() > len(items):
+            table.Delete(table.Count() - 1)
+        for i, values in zip(changed, self._resolve_rows([items[i] for i in changed])):
+            if i >= table.Count():
+                row = table.Add()
+            elif i < len(current) and current[i][0] == keys[i][0]:
+                row = table.Get(i)
+            else:
+                table.Delete(i)
+                row = table.Insert(i)
+            for field, value in values.items():
+                if value is None:
+                    if field != "ВариантИзготовления":
+                        _log.error("    Строка %s: %s не найден, поле очищено", i + 1, field)
+                    value = empty[field]
+                setattr(row, field, value)
+        obj.Товары.Load(table)
+        return len(changed) + max(0, len(current) - len(items))
+
     def update_order(self, number: str, fields: dict, items: list, date: str | None = None) -> bool:
         obj = self.bridge._find_document_by_number("ЗаказВПроизводство", number, date)
         if not obj:
-            log(f"[Обновление] Заказ №{number} не найден")
+            _log.info("[Обновление] Заказ №%s не найден", number)
             return False
 
         for k, v in fields.items():
@@ -166,32 +263,20 @@ class OrdersBridge:
                     continue
                 setattr(obj, k, v)
             except Exception as e:
-                log(f"[Обновление] Ошибка установки поля {k}: {e}")
-
-        while len(obj.Товары) > 0:
-            obj.Товары.Delete(0)
+                _log.error("[Обновление] Ошибка установки поля %s: %s", k, e)
 
-        for row in items:
-            try:
-                new_row = obj.Товары.Add()
-                new_row.Номенклатура = self.bridge.get_ref("Номенклатура", row.get("Номенклатура"))
-                variant = row.get("ВариантИзготовления")
-                if variant and variant != "—":
-                    new_row.ВариантИзготовления = self.bridge.get_ref("ВариантыИзготовленияНоменклатуры", variant)
-                size_val = row.get("Размер", 0)
-                new_row.Размер = self.bridge.get_size_ref(size_val)
-                new_row.Количество = int(row.get("Количество", 1))
-                new_row.Вес = float(row.get("Вес", 0))
-                new_row.Примечание = row.get("Примечание", "")
-            except Exception as e:
-                log(f"[Обновление] Ошибка в строке заказа: {e}")
+        try:
+            changed = self._write_rows(obj, items, self._current_row_keys(obj.Ref))
+            _log.info("[Обновление] Изменено строк: %s", changed)
+        except Exception as e:
+            _log.error("[Обновление] Ошибка записи строк заказа: %s", e)
 
         try:
             obj.Write()
-            log(f"✔ Обновлён заказ №{number}")
+            _log.info("✔ Обновлён заказ №%s", number)
             return True
         except Exception as e:
-            log(f"[Обновление] Ошибка при записи: {e}")
+            _log.error("[Обновление] Ошибка при записи: %s", e)
             return False
 
     def create_order(self, fields: dict, items: list) -> str:
@@ -204,10 +289,10 @@ class OrdersBridge:
             "Склад": "Склады",
         }
 
-        log("Создание заказа. Поля:")
+        _log.debug("Создание заказа. Поля:")
         for k, v in fields.items():
             try:
-                log(f"  -> {k} = {v}")
+                _log.debug("  -> %s = %s", k, v)
 
                 if k == "ВидСтатусПродукции":
                     reverse_map = {val: key for key, val in PRODUCTION_STATUS_MAP.items()}
@@ -215,99 +300,182 @@ class OrdersBridge:
                         v = reverse_map[v]
 
                     ref = self.bridge.get_ref("ВидыСтатусыПродукции", v)
-                    log(f"[ref] {k}: {v} => {ref}")
+                    _log.debug("[ref] %s: %s => %s", k, v, ref)
                     if ref:
                         setattr(doc, k, ref)
-                        log(f"    Установлено: {k} (Ref: {ref})")
+                        _log.debug("    Установлено: %s (Ref: %s)", k, ref)
                     else:
-                        log(f"    ❌ {k} '{v}' не найден.")
+                        _log.error("    %s '%s' не найден.", k, v)
                     continue
 
                 if k in catalog_fields_map:
                     ref = self.bridge.get_ref(catalog_fields_map[k], v)
-                    log(f"[ref] {k}: {v} => {ref}")
+                    _log.debug("[ref] %s: %s => %s", k, v, ref)
                     if ref:
                         setattr(doc, k, ref)
-                        log(f"    Установлено: {k} (Ref: {ref})")
+                        _log.debug("    Установлено: %s (Ref: %s)", k, ref)
                     else:
-                        log(f"    ❌ {k} '{v}' не найден.")
+                        _log.error("    %s '%s' не найден.", k, v)
                     continue
 
                 setattr(doc, k, v)
             except Exception as e:
-                log(f"    ❌ Ошибка установки поля {k}: {e}")
+                _log.error("    Ошибка установки поля %s: %s", k, e)
 
-        log("Добавление строк заказа:")
-        for row in items:
-            try:
-                log(f"  -> строка: {row}")
-                new_row = doc.Товары.Add()
-                new_row.Номенклатура = self.bridge.get_ref("Номенклатура", row.get("Номенклатура"))
-
-                variant = row.get("ВариантИзготовления")
-                if variant and variant != "—":
-                    new_row.ВариантИзготовления = self.bridge.get_ref("ВариантыИзготовленияНоменклатуры", variant)
-
-                size_val = row.get("Размер", 0)
-                size_ref = self.bridge.get_size_ref(size_val)
-                if size_ref:
-                    new_row.Размер = size_ref
-                else:
-                    log(f"    ❌ Размер '{size_val}' не найден, пропущен")
-
-                new_row.Количество = int(row.get("Количество", 1))
-                new_row.Вес = float(row.get("Вес", 0))
-                log(f"    -> Примечание: {row.get('Примечание')}")
-                new_row.Примечание = row.get("Примечание", "")
-
-            except Exception as e:
-                log(f"    ❌ Ошибка в строке заказа: {e}")
+        _log.debug("Добавление строк заказа: %s", len(items))
+        try:
+            self._write_rows(doc, items)
+        except Exception as e:
+            _log.error("    Ошибка в строках заказа: %s", e)
 
         try:
-            log("Проводим документ...")
+            _log.debug("Проводим документ...")
             doc.Write()
-            log(f"✅ Документ проведён. Номер: {doc.Number}")
+            self.bridge.doc_index.register("ЗаказВПроизводство", doc.Number, doc.Date, doc.Ref)
+            self.bridge.order_numbers.observe(doc.Number)
+            _log.info("✅ Документ проведён. Номер: %s", doc.Number)
             return str(doc.Number)
         except Exception as e:
-            log(f"❌ Ошибка при записи документа: {e}")
+            _log.error("Ошибка при записи документа: %s", e)
             return f"Ошибка: {e}"
 
-    def list_orders(self) -> list[dict]:
+    def _read_orders(self, refs=None) -> list[tuple[str, dict]]:
+        """Шапки заказов с итогами одним запросом.
+
+        Итоги по количеству и весу считаются на стороне 1С; строки
+        табличной части здесь не читаются (см. ``get_order_rows``), как и
+        в ``list_orders_filtered``. ``refs`` — массив ссылок для отбора
+        (None — все заказы).
+        """
+        text = queries.ORDERS_LIST.format(where=queries.LIST_BY_REFS if refs is not None else "")
+        params = {"Ссылки": refs} if refs is not None else {}
+        headers = self.bridge.query_select(text, **params)
         result = []
-        orders = self.bridge.connection.Documents.ЗаказВПроизводство.Select()
-        while orders.Next():
-            doc = orders.GetObject()
-            rows = []
-            for row in doc.Товары:
-                rows.append({
-                    "nomenclature": safe_str(row.Номенклатура),
-                    "size": safe_str(row.Размер),
-                    "qty": row.Количество,
-                    "w": row.Вес,
-                    "variant": safe_str(row.ВариантИзготовления),
-                    "note": row.Примечание,
-                })
-            result.append({
-                "Ref": doc.Ref,
-                "num": doc.Номер,
-                "date": str(doc.Дата),
-                "org": safe_str(doc.Организация),
-                "contragent": safe_str(doc.Контрагент),
-                "contract": safe_str(doc.ДоговорКонтрагента),
-                "comment": safe_str(doc.Комментарий),
-                "prod_status": self.bridge.to_string(doc.ВидСтатусПродукции),
-                "posted": doc.Проведен,
-                "deleted": doc.ПометкаУдаления,
-                "qty": sum([r["qty"] for r in rows]),
-                "weight": sum([r["w"] for r in rows]),
-                "rows": rows,
-            })
+        while headers.Next():
+            result.append(self._order_header(headers))
         return result
 
+    def _order_header(self, headers) -> tuple[str, dict]:
+        """Строка списка заказов из выборки шапок (ORDERS_LIST / ORDERS_PAGE)."""
+        number = headers.Номер
+        date = str(headers.Дата)
+        self.bridge.doc_index.register("ЗаказВПроизводство", number, headers.Дата, headers.Ссылка)
+        return doc_key(number, date), {
+            "Ref": headers.Ссылка,
+            "num": number,
+            "date": date,
+            "org": headers.Организация or "",
+            "contragent": headers.Контрагент or "",
+            "contract": headers.ДоговорКонтрагента or "",
+            "comment": headers.Комментарий or "",
+            "prod_status": headers.ВидСтатусПродукции or "",
+            "posted": headers.Проведен,
+            "deleted": headers.ПометкаУдаления,
+            "qty": headers.Количество,
+            "weight": headers.Вес,
+        }
+
+    @staticmethod
+    def _order_line(lines) -> dict:
+        return {
+            "nomenclature": lines.Номенклатура or "",
+            "size": lines.Размер or "",
+            "qty": lines.Количество,
+            "w": lines.Вес,
+            "variant": lines.ВариантИзготовления or "",
+            "note": lines.Примечание,
+        }
+
+    def list_orders(self) -> list[dict]:
+        """Список заказов для страницы заказов."""
+        return [order for _, order in self._read_orders()]
+
+    def sync_orders(
+        self,
+        known: dict[str, str] | None = None,
+        filters: dict | None = None,
+        since=None,
+    ) -> dict:
+        """Изменения списка заказов относительно версий ``known`` (см. doc_sync).
+
+        ``filters`` — отбор как у ``list_orders_filtered``, ``since`` — дата
+        самого старого показанного заказа: сверяются только заказы, которые
+        может показать список, а не все документы базы.
+        """
+        conditions, params = self._order_conditions(filters)
+        return sync_list(
+            self.bridge, "ЗаказВПроизводство", known, self._read_orders, conditions, since, **params
+        )
+
+    def _order_conditions(self, filters: dict | None) -> tuple[str, dict]:
+        """Условия отбора заказов (``queries.ORDER_FILTERS``) и их параметры."""
+        conditions, params = [], {}
+        for name, value in (filters or {}).items():
+            if value in (None, "") or name not in queries.ORDER_FILTERS:
+                continue
+            if name == "status":
+                value = self.bridge.enum_index.value("ВидыСтатусыПродукции", value)
+                if value is None:
+                    continue
+            elif name == "counterparty":
+                value = "%" + "".join(
+                    f"~{ch}" if ch in "%_[]^~" else ch for ch in str(value).strip()
+                ) + "%"
+            condition, param = queries.ORDER_FILTERS[name]
+            conditions.append(condition)
+            params[param] = value
+        return "".join(conditions), params
+
+    def list_orders_filtered(
+        self,
+        filters: dict | None = None,
+        cursor: tuple | None = None,
+        page_size: int = 100,
+    ) -> dict:
+        """Страница заказов с отбором на стороне 1С, новые первыми.
+
+        ``filters``: ``date_from``/``date_to`` (datetime), ``counterparty``
+        (часть наименования), ``status`` (имя значения ВидыСтатусыПродукции),
+        ``posted``/``deleted`` (bool); отсутствующий ключ или None — без отбора.
+        Строки заказа не читаются — см. ``get_order_rows``. Результат:
+        ``rows`` — пары [ключ, заказ], ``next`` — курсор следующей страницы,
+        ``versions`` — версии данных заказов страницы (для ``sync_orders``).
+        """
+        conditions, params = self._order_conditions(filters)
+        if cursor is not None:
+            conditions += queries.ORDERS_PAGE_AFTER
+            params["КурсорДата"], params["КурсорНомер"] = cursor
+
+        text = queries.ORDERS_PAGE.format(limit=int(page_size), filters=conditions)
+        selection = self.bridge.query_select(text, **params)
+        rows, last, versions = [], None, {}
+        while selection.Next():
+            key, order = self._order_header(selection)
+            rows.append([key, order])
+            versions[key] = str(selection.ВерсияДанных)
+            last = (selection.Дата, selection.Номер)
+        return {"rows": rows, "next": last if len(rows) >= page_size else None, "versions": versions}
+
+    def get_order_rows(self, ref) -> list[dict]:
+        """Строки одного заказа (для открытия в редакторе)."""
+        selection = self.bridge.query_select(queries.ORDER_ROWS, Ссылка=ref)
+        rows = []
+        while selection.Next():
+            rows.append(self._order_line(selection))
+        return rows
+
+    def iter_orders(self, page_size: int = 200):
+        """Заказы по мере чтения, страницами по ``page_size``."""
+        return iter_list(self.bridge, "ЗаказВПроизводство", self._read_orders, page_size)
+
+    def list_orders_page(self, cursor: tuple | None = None, page_size: int = 200) -> dict:
+        """Одна страница списка заказов (см. doc_sync.read_page)."""
+        return read_page(self.bridge, "ЗаказВПроизводство", self._read_orders, cursor, page_size)
+
     def get_order_lines(self, doc_number: str, date: str | None = None) -> list[dict]:
         doc = self.bridge._find_document_by_number("ЗаказВПроизводство", doc_number, date)
         if not doc:
-            log(f"❌ Заказ №{doc_number} не найден")
+            _log.error("Заказ №%s не найден", doc_number)
             return []
 
         rows = []
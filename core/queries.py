@@ -0,0 +1,268 @@
+# queries.py • тексты запросов 1С для COM-моста
+# -*- coding: utf-8 -*-
+"""Тексты запросов на языке запросов 1С.
+
+Имена объектов метаданных подставляются через ``str.format`` (``{doc}``),
+значения отборов — только через параметры запроса.
+"""
+
+# ─────────────  Поиск документов по номеру  ─────────────
+# Все документы с указанным номером, новые первыми
+DOC_BY_NUMBER = """
+ВЫБРАТЬ
+    Т.Ссылка КАК Ссылка,
+    Т.Номер КАК Номер,
+    Т.Дата КАК Дата
+ИЗ
+    Документ.{doc} КАК Т
+ГДЕ
+    Т.Номер = &Номер
+УПОРЯДОЧИТЬ ПО
+    Т.Дата УБЫВ
+"""
+
+# Наибольший номер документа (нумератор следующего номера)
+LAST_NUMBER = """
+ВЫБРАТЬ ПЕРВЫЕ 1
+    Т.Номер КАК Номер
+ИЗ
+    Документ.{doc} КАК Т
+УПОРЯДОЧИТЬ ПО
+    Т.Номер УБЫВ
+"""
+
+# ─────────────  Списки документов для страниц  ─────────────
+# {where} — пустая строка или отбор по ссылкам (LIST_BY_REFS)
+LIST_BY_REFS = "ГДЕ\n    Т.Ссылка В (&Ссылки)"
+
+# Шапки заказов с итогами по строкам; сами строки читаются при открытии
+# заказа (ORDER_ROWS)
+ORDERS_LIST = """
+ВЫБРАТЬ
+    Т.Ссылка КАК Ссылка,
+    Т.Номер КАК Номер,
+    Т.Дата КАК Дата,
+    ПРЕДСТАВЛЕНИЕ(Т.Организация) КАК Организация,
+    ПРЕДСТАВЛЕНИЕ(Т.Контрагент) КАК Контрагент,
+    ПРЕДСТАВЛЕНИЕ(Т.ДоговорКонтрагента) КАК ДоговорКонтрагента,
+    Т.Комментарий КАК Комментарий,
+    ПРЕДСТАВЛЕНИЕ(Т.ВидСтатусПродукции) КАК ВидСтатусПродукции,
+    Т.Проведен КАК Проведен,
+    Т.ПометкаУдаления КАК ПометкаУдаления,
+    ЕСТЬNULL(Итоги.Количество, 0) КАК Количество,
+    ЕСТЬNULL(Итоги.Вес, 0) КАК Вес
+ИЗ
+    Документ.ЗаказВПроизводство КАК Т
+        ЛЕВОЕ СОЕДИНЕНИЕ (ВЫБРАТЬ
+            Товары.Ссылка КАК Ссылка,
+            СУММА(Товары.Количество) КАК Количество,
+            СУММА(Товары.Вес) КАК Вес
+        ИЗ
+            Документ.ЗаказВПроизводство.Товары КАК Товары
+        СГРУППИРОВАТЬ ПО
+            Товары.Ссылка) КАК Итоги
+        ПО (Итоги.Ссылка = Т.Ссылка)
+{where}
+УПОРЯДОЧИТЬ ПО
+    Т.Дата,
+    Т.Номер
+"""
+
+# Страница списка заказов с отбором, новые первыми. Только шапки и итоги:
+# строки заказа читаются при открытии (ORDER_ROWS).
+# {filters} — условия из ORDER_FILTERS, каждое начинается с « И ».
+ORDERS_PAGE = """
+ВЫБРАТЬ ПЕРВЫЕ {limit}
+    Т.Ссылка КАК Ссылка,
+    Т.Номер КАК Номер,
+    Т.Дата КАК Дата,
+    Т.ВерсияДанных КАК ВерсияДанных,
+    ПРЕДСТАВЛЕНИЕ(Т.Организация) КАК Организация,
+    ПРЕДСТАВЛЕНИЕ(Т.Контрагент) КАК Контрагент,
+    ПРЕДСТАВЛЕНИЕ(Т.ДоговорКонтрагента) КАК ДоговорКонтрагента,
+    Т.Комментарий КАК Комментарий,
+    ПРЕДСТАВЛЕНИЕ(Т.ВидСтатусПродукции) КАК ВидСтатусПродукции,
+    Т.Проведен КАК Проведен,
+    Т.ПометкаУдаления КАК ПометкаУдаления,
+    ЕСТЬNULL(Итоги.Количество, 0) КАК Количество,
+    ЕСТЬNULL(Итоги.Вес, 0) КАК Вес
+ИЗ
+    Документ.ЗаказВПроизводство КАК Т
+        ЛЕВОЕ СОЕДИНЕНИЕ (ВЫБРАТЬ
+            Товары.Ссылка КАК Ссылка,
+            СУММА(Товары.Количество) КАК Количество,
+            СУММА(Товары.Вес) КАК Вес
+        ИЗ
+            Документ.ЗаказВПроизводство.Товары КАК Товары
+        СГРУППИРОВАТЬ ПО
+            Товары.Ссылка) КАК Итоги
+        ПО (Итоги.Ссылка = Т.Ссылка)
+ГДЕ
+    ИСТИНА{filters}
+УПОРЯДОЧИТЬ ПО
+    Т.Дата УБЫВ,
+    Т.Номер УБЫВ
+"""
+
+# Условия отбора ORDERS_PAGE: ключ фильтра → (условие, параметр запроса)
+ORDER_FILTERS = {
+    "date_from": ("\n    И Т.Дата >= &ДатаС", "ДатаС"),
+    "date_to": ("\n    И Т.Дата <= &ДатаПо", "ДатаПо"),
+    "counterparty": (
+        "\n    И Т.Контрагент.Наименование ПОДОБНО &Контрагент СПЕЦСИМВОЛ \"~\"", "Контрагент"
+    ),
+    "status": ("\n    И Т.ВидСтатусПродукции = &ВидСтатусПродукции", "ВидСтатусПродукции"),
+    "posted": ("\n    И Т.Проведен = &Проведен", "Проведен"),
+    "deleted": ("\n    И Т.ПометкаУдаления = &ПометкаУдаления", "ПометкаУдаления"),
+}
+# Продолжение страницы после курсора (дата, номер) при сортировке по убыванию
+ORDERS_PAGE_AFTER = (
+    "\n    И (Т.Дата < &КурсорДата"
+    "\n        ИЛИ Т.Дата = &КурсорДата"
+    "\n            И Т.Номер < &КурсорНомер)"
+)
+
+# Строки одного заказа в порядке табличной части (сверка перед записью)
+ORDER_ROWS = """
+ВЫБРАТЬ
+    ПРЕДСТАВЛЕНИЕ(Товары.Номенклатура) КАК Номенклатура,
+    ПРЕДСТАВЛЕНИЕ(Товары.ВариантИзготовления) КАК ВариантИзготовления,
+    ПРЕДСТАВЛЕНИЕ(Товары.Размер) КАК Размер,
+    Товары.Количество КАК Количество,
+    Товары.Вес КАК Вес,
+    Товары.Примечание КАК Примечание
+ИЗ
+    Документ.ЗаказВПроизводство.Товары КАК Товары
+ГДЕ
+    Товары.Ссылка = &Ссылка
+УПОРЯДОЧИТЬ ПО
+    Товары.НомерСтроки
+"""
+
+TASKS_LIST = """
+ВЫБРАТЬ
+    Т.Ссылка КАК Ссылка,
+    Т.Номер КАК Номер,
+    Т.Дата КАК Дата,
+    ПРЕДСТАВЛЕНИЕ(Т.Ответственный) КАК Ответственный,
+    ПРЕДСТАВЛЕНИЕ(Т.ТехОперация) КАК ТехОперация,
+    ПРЕДСТАВЛЕНИЕ(Т.ПроизводственныйУчасток) КАК ПроизводственныйУчасток,
+    Т.Проведен КАК Проведен,
+    Т.ПометкаУдаления КАК ПометкаУдаления
+ИЗ
+    Документ.ЗаданиеНаПроизводство КАК Т
+{where}
+УПОРЯДОЧИТЬ ПО
+    Т.Дата,
+    Т.Номер
+"""
+
+# Шапки нарядов с итогами по табличной части «ТоварыВыдано»
+WAX_JOBS_LIST = """
+ВЫБРАТЬ
+    Т.Ссылка КАК Ссылка,
+    Т.Номер КАК Номер,
+    Т.Дата КАК Дата,
+    ПРЕДСТАВЛЕНИЕ(Т.Сотрудник) КАК Сотрудник,
+    ПРЕДСТАВЛЕНИЕ(Т.ТехОперация) КАК ТехОперация,
+    Т.Комментарий КАК Комментарий,
+    ПРЕДСТАВЛЕНИЕ(Т.Склад) КАК Склад,
+    ПРЕДСТАВЛЕНИЕ(Т.ПроизводственныйУчасток) КАК ПроизводственныйУчасток,
+    ПРЕДСТАВЛЕНИЕ(Т.Организация) КАК Организация,
+    ПРЕДСТАВЛЕНИЕ(Т.ЗаданиеНаПроизводство) КАК Задание,
+    ПРЕДСТАВЛЕНИЕ(Т.Ответственный) КАК Ответственный,
+    Т.Проведен КАК Проведен,
+    Т.ПометкаУдаления КАК ПометкаУдаления,
+    ЕСТЬNULL(Итоги.Количество, 0) КАК Количество,
+    ЕСТЬNULL(Итоги.Вес, 0) КАК Вес
+ИЗ
+    Документ.НарядВосковыеИзделия КАК Т
+        ЛЕВОЕ СОЕДИНЕНИЕ (ВЫБРАТЬ
+            Выдано.Ссылка КАК Ссылка,
+            СУММА(Выдано.Количество) КАК Количество,
+            СУММА(Выдано.Вес) КАК Вес
+        ИЗ
+            Документ.НарядВосковыеИзделия.ТоварыВыдано КАК Выдано
+        СГРУППИРОВАТЬ ПО
+            Выдано.Ссылка) КАК Итоги
+        ПО (Итоги.Ссылка = Т.Ссылка)
+{where}
+УПОРЯДОЧИТЬ ПО
+    Т.Дата,
+    Т.Номер
+"""
+
+# Наряды, созданные по заданию
+WAX_JOBS_BY_TASK = """
+ВЫБРАТЬ
+    Т.Ссылка КАК Ссылка,
+    Т.Номер КАК Номер,
+    Т.Дата КАК Дата
+ИЗ
+    Документ.НарядВосковыеИзделия КАК Т
+ГДЕ
+    Т.ЗаданиеНаПроизводство = &Задание
+УПОРЯДОЧИТЬ ПО
+    Т.Дата,
+    Т.Номер
+"""
+
+# Строки продукции задания с артикулом и типом номенклатуры (план нарядов)
+TASK_PRODUCTS = """
+ВЫБРАТЬ
+    Продукция.НомерСтроки КАК НомерСтроки,
+    Продукция.Номенклатура.Артикул КАК Артикул,
+    ПРЕДСТАВЛЕНИЕ(Продукция.Номенклатура.ТипНоменклатуры) КАК ТипНоменклатуры
+ИЗ
+    Документ.ЗаданиеНаПроизводство.Продукция КАК Продукция
+ГДЕ
+    Продукция.Ссылка = &Задание
+УПОРЯДОЧИТЬ ПО
+    Продукция.НомерСтроки
+"""
+
+# Страница ссылок документов в порядке списков (дата, номер);
+# {where} — пустая строка или PAGE_AFTER (продолжение после курсора)
+DOC_PAGE = """
+ВЫБРАТЬ ПЕРВЫЕ {limit}
+    Т.Ссылка КАК Ссылка,
+    Т.Номер КАК Номер,
+    Т.Дата КАК Дата
+ИЗ
+    Документ.{doc} КАК Т
+{where}
+УПОРЯДОЧИТЬ ПО
+    Т.Дата,
+    Т.Номер
+"""
+PAGE_AFTER = "ГДЕ\n    (Т.Дата > &Дата\n        ИЛИ Т.Дата = &Дата\n            И Т.Номер > &Номер)"
+
+# Версии данных документов (инкрементальное обновление списков);
+# {filters} — условия вида «\n    И Т.…» (пусто — все документы)
+DOC_VERSIONS = """
+ВЫБРАТЬ
+    Т.Ссылка КАК Ссылка,
+    Т.Номер КАК Номер,
+    Т.Дата КАК Дата,
+    Т.ВерсияДанных КАК ВерсияДанных
+ИЗ
+    Документ.{doc} КАК Т
+ГДЕ
+    ИСТИНА{filters}
+"""
+# Сверка только документов не старше даты (окно, показанное в списке)
+DOC_SINCE = ("\n    И Т.Дата >= &ДатаСверки", "ДатаСверки")
+
+# ─────────────  Справочники  ─────────────
+# Элементы справочника с версией данных (сверка локального кэша);
+# {fields} — дополнительные колонки вида ",\n    Т.Реквизит КАК Реквизит".
+# Без сортировки: порядок тот же, что у выборки справочника (Select)
+CATALOG_ITEMS = """
+ВЫБРАТЬ
+    Т.Ссылка КАК Ссылка,
+    Т.ВерсияДанных КАК ВерсияДанных,
+    Т.Код КАК Код,
+    Т.Наименование КАК Наименование{fields}
+ИЗ
+    Справочник.{catalog} КАК Т
+"""
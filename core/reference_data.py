@@ -0,0 +1,83 @@
+# reference_data.py • списки для выпадающих меню (логины, сотрудники)
+# -*- coding: utf-8 -*-
+"""Отложенный поставщик справочных списков.
+
+Списки читаются при первом обращении: после ``init_bridge`` — через
+подключение пользователя, до входа — из локального кэша справочников или
+дампа конфигурации. Второе подключение к 1С не открывается.
+"""
+from __future__ import annotations
+import threading
+
+from . import config_parser
+from .catalog_cache import CatalogCache, cache_path
+from .logger import logger
+
+# имя списка → (справочник, максимальное число элементов)
+SOURCES: dict[str, tuple[str, int]] = {
+    "logins": ("Пользователи", 1000),
+    "employees": ("ФизическиеЛица", 200),
+}
+
+# Значения по умолчанию, если ни один источник недоступен
+DEFAULTS: dict[str, list[str]] = {
+    "logins": ["Администратор"],
+    "employees": [],
+}
+
+
+class ReferenceData:
+    """Кэшируемые списки наименований для комбобоксов."""
+
+    def __init__(self, base_path: str):
+        self.base_path = base_path
+        self._bridge = None
+        self._values: dict[str, list[str]] = {}
+        self._lock = threading.Lock()
+
+    def bind(self, bridge) -> None:
+        """Подключает мост 1С; списки, прочитанные до входа, перечитываются."""
+        with self._lock:
+            self._bridge = bridge
+            self._values.clear()
+
+    def get(self, name: str) -> list[str]:
+        with self._lock:
+            values = self._values.get(name)
+            if values is None:
+                values = self._load(name)
+                # до входа в 1С список временный — после bind прочитаем из базы
+                if self._bridge is not None:
+                    self._values[name] = values
+            return list(values)
+
+    # -------------------------------------------------------------
+    def _load(self, name: str) -> list[str]:
+        catalog, limit = SOURCES[name]
+
+        if self._bridge is not None:
+            try:
+                items = self._bridge.list_catalog_items(catalog, limit)
+                values = [it.get("Description", "") for it in items if it.get("Description")]
+                if values:
+                    return values
+            except Exception as exc:
+                logger.error("Не удалось получить '%s' через COM: %s", catalog, exc)
+        else:
+            try:
+                cache = CatalogCache(None, cache_path(self.base_path))
+                try:
+                    rows = cache.peek(catalog)
+                finally:
+                    cache.close()
+                values = [r["Description"] for r in (rows or [])[:limit] if r["Description"]]
+                if values:
+                    return values
+            except Exception as exc:
+                logger.error("Не удалось прочитать '%s' из локального кэша: %s", catalog, exc)
+
+        try:
+            return config_parser.get_catalog_items(catalog) or DEFAULTS[name]
+        except Exception as exc:
+            logger.error("Не удалось загрузить '%s' из XML: %s", catalog, exc)
+            return DEFAULTS[name]
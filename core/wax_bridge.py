@@ -1,7 +1,14 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
+from datetime import datetime
 from typing import Any
-from .com_bridge import log, safe_str
+from .com_bridge import safe_str
+from .logger import get_logger
+from . import queries
+from .doc_sync import doc_key, sync_list, read_page, iter_list
+import config
+
+_log = get_logger(__name__)
 
 
 class WaxBridge:
@@ -9,83 +16,83 @@ class WaxBridge:
 
     def __init__(self, bridge: 'COM1CBridge'):
         self.bridge = bridge
+        # UUID задания → ссылки его нарядов (сбрасывается при создании,
+        # закрытии и удалении нарядов)
+        self._jobs_by_task: dict[str, list] = {}
+        # справочные ссылки для шапки нарядов (одни на сеанс)
+        self._defaults: dict[str, Any] = {}
+        self._operations: dict[str, Any] = {}
 
     # -------------------------------------------------------------
     # Методы работы с заданиями и нарядами
     # -------------------------------------------------------------
 
     def _find_task_by_number(self, number: str):
-        doc_manager = getattr(self.bridge.connection.Documents, "ЗаданиеНаПроизводство", None)
-        if doc_manager is None:
-            log("❌ Документ 'ЗаданиеНаПроизводство' не найден")
+        if getattr(self.bridge.connection.Documents, "ЗаданиеНаПроизводство", None) is None:
+            _log.error("Документ 'ЗаданиеНаПроизводство' не найден")
             return None
-        selection = doc_manager.Select()
-        while selection.Next():
-            obj = selection.GetObject()
-            if str(obj.Number).strip() == str(number).strip():
-                return obj
-        return None
+        return self.bridge.doc_index.find_object("ЗаданиеНаПроизводство", number)
 
     def post_task(self, number: str) -> bool:
         obj = self._find_task_by_number(number)
         if not obj:
-            log(f"[Проведение] ❌ Задание №{number} не найдено")
+            _log.error("[Проведение] Задание №%s не найдено", number)
             return False
         try:
             obj.Проведен = True
             obj.Write()
-            log(f"[Проведение] ✅ Задание №{number} проведено")
+            _log.info("[Проведение] ✅ Задание №%s проведено", number)
             return True
         except Exception as e:
-            log(f"❌ Ошибка при проведении задания №{number}: {e}")
+            _log.error("Ошибка при проведении задания №%s: %s", number, e)
             return False
 
     def undo_post_task(self, number: str) -> bool:
         obj = self._find_task_by_number(number)
         if not obj:
-            log(f"[Снятие проведения] ❌ Задание №{number} не найдено")
+            _log.error("[Снятие проведения] Задание №%s не найдено", number)
             return False
         try:
             obj.Проведен = False
             obj.Write()
-            log(f"[Снятие проведения] ✅ Задание №{number} отменено")
+            _log.info("[Снятие проведения] ✅ Задание №%s отменено", number)
             return True
         except Exception as e:
-            log(f"❌ Ошибка при снятии проведения задания №{number}: {e}")
+            _log.error("Ошибка при снятии проведения задания №%s: %s", number, e)
             return False
 
     def mark_task_for_deletion(self, number: str) -> bool:
         obj = self._find_task_by_number(number)
         if not obj:
-            log(f"[Пометка удаления] ❌ Задание №{number} не найдено")
+            _log.error("[Пометка удаления] Задание №%s не найдено", number)
             return False
         try:
             obj.DeletionMark = True
             obj.Write()
-            log(f"[Пометка удаления] ✅ Задание №{number} помечено на удаление")
+            _log.info("[Пометка удаления] ✅ Задание №%s помечено на удаление", number)
             return True
         except Exception as e:
-            log(f"❌ Ошибка при пометке на удаление задания №{number}: {e}")
+            _log.error("Ошибка при пометке на удаление задания №%s: %s", number, e)
             return False
 
     def unmark_task_deletion(self, number: str) -> bool:
         obj = self._find_task_by_number(number)
         if not obj:
-            log(f"[Снятие пометки] ❌ Задание №{number} не найдено")
+            _log.error("[Снятие пометки] Задание №%s не найдено", number)
             return False
         try:
             obj.DeletionMark = False
             obj.Write()
-            log(f"[Снятие пометки] ✅ Задание №{number} восстановлено")
+            _log.info("[Снятие пометки] ✅ Задание №%s восстановлено", number)
             return True
         except Exception as e:
-            log(f"❌ Ошибка при снятии пометки задания №{number}: {e}")
+            _log.error("Ошибка при снятии пометки задания №%s: %s", number, e)
             return False
 
     def delete_task(self, number: str) -> bool:
         obj = self._find_task_by_number(number)
         if not obj:
-            log(f"[Удаление] ❌ Задание №{number} не найдено")
+            _log.error("[Удаление] Задание №%s не найдено", number)
             return False
         try:
             if getattr(obj, "Проведен", False):
@@ -95,108 +102,126 @@ class WaxBridge:
             obj.DeletionMark = True
             obj.Write()
             obj.Delete()
-            log(f"[Удаление] ✅ Задание №{number} удалено")
+            self.bridge.doc_index.forget("ЗаданиеНаПроизводство", number)
+            _log.info("[Удаление] ✅ Задание №%s удалено", number)
             return True
         except Exception as e:
-            log(f"❌ Ошибка при удалении задания №{number}: {e}")
+            _log.error("Ошибка при удалении задания №%s: %s", number, e)
             return False
 
-    def list_tasks(self) -> list[dict]:
+    def _read_tasks(self, refs=None) -> list[tuple[str, dict]]:
+        """Задания на производство одним запросом (``refs`` — отбор по ссылкам)."""
         result = []
-        doc_manager = getattr(self.bridge.connection.Documents, "ЗаданиеНаПроизводство", None)
-        if doc_manager is None:
+        if getattr(self.bridge.connection.Documents, "ЗаданиеНаПроизводство", None) is None:
             return result
-        selection = doc_manager.Select()
+        text = queries.TASKS_LIST.format(where=queries.LIST_BY_REFS if refs is not None else "")
+        params = {"Ссылки": refs} if refs is not None else {}
+        selection = self.bridge.query_select(text, **params)
         while selection.Next():
-            doc = selection.GetObject()
-            result.append({
-                "ref": str(doc.Ref),
-                "num": str(doc.Number),
-                "date": str(doc.Date.strftime("%d.%m.%Y")),
-                "employee": self.bridge.safe(doc, "Ответственный"),
-                "tech_op": self.bridge.safe(doc, "ТехОперация"),
-                "section": self.bridge.safe(doc, "ПроизводственныйУчасток"),
-                "posted": getattr(doc, "Проведен", False),
-                "deleted": getattr(doc, "ПометкаУдаления", False),
-            })
+            self.bridge.doc_index.register(
+                "ЗаданиеНаПроизводство", selection.Номер, selection.Дата, selection.Ссылка
+            )
+            result.append((doc_key(selection.Номер, selection.Дата), {
+                "ref": str(selection.Ссылка),
+                "num": str(selection.Номер),
+                "date": str(selection.Дата.strftime("%d.%m.%Y")),
+                "employee": selection.Ответственный or "",
+                "tech_op": selection.ТехОперация or "",
+                "section": selection.ПроизводственныйУчасток or "",
+                "posted": selection.Проведен,
+                "deleted": selection.ПометкаУдаления,
+            }))
         return result
 
+    def list_tasks(self) -> list[dict]:
+        """Список заданий на производство."""
+        return [task for _, task in self._read_tasks()]
+
+    def sync_tasks(self, known: dict[str, str] | None = None, since=None) -> dict:
+        """Изменения списка заданий относительно версий ``known`` (см. doc_sync).
+
+        ``since`` — начало окна дат списка: сверяются только задания из окна.
+        """
+        return sync_list(self.bridge, "ЗаданиеНаПроизводство", known, self._read_tasks, since=since)
+
+    def iter_tasks(self, page_size: int = 200):
+        """Задания по мере чтения, страницами по ``page_size``."""
+        return iter_list(self.bridge, "ЗаданиеНаПроизводство", self._read_tasks, page_size)
+
+    def list_tasks_page(self, cursor: tuple | None = None, page_size: int = 200) -> dict:
+        """Одна страница списка заданий (см. doc_sync.read_page)."""
+        return read_page(self.bridge, "ЗаданиеНаПроизводство", self._read_tasks, cursor, page_size)
+
     # -------------------------------------------------------------
     # Дополнительные операции с нарядами
     # -------------------------------------------------------------
 
     def _find_wax_job_by_number(self, number: str):
-        doc_manager = getattr(self.bridge.connection.Documents, "НарядВосковыеИзделия", None)
-        if doc_manager is None:
-            log("❌ Документ 'НарядВосковыеИзделия' не найден")
+        if getattr(self.bridge.connection.Documents, "НарядВосковыеИзделия", None) is None:
+            _log.error("Документ 'НарядВосковыеИзделия' не найден")
             return None
-        selection = doc_manager.Select()
-        while selection.Next():
-            obj = selection.GetObject()
-            if str(obj.Number).strip() == str(number).strip():
-                return obj
-        return None
+        return self.bridge.doc_index.find_object("НарядВосковыеИзделия", number)
 
     def post_wax_job(self, number: str) -> bool:
         obj = self._find_wax_job_by_number(number)
         if not obj:
-            log(f"[Проведение] ❌ Наряд №{number} не найден")
+            _log.error("[Проведение] Наряд №%s не найден", number)
             return False
         try:
             obj.Проведен = True
             obj.Write()
-            log(f"[Проведение] ✅ Наряд №{number} проведён")
+            _log.info("[Проведение] ✅ Наряд №%s проведён", number)
             return True
         except Exception as e:
-            log(f"❌ Ошибка при проведении наряда №{number}: {e}")
+            _log.error("Ошибка при проведении наряда №%s: %s", number, e)
             return False
 
     def undo_post_wax_job(self, number: str) -> bool:
         obj = self._find_wax_job_by_number(number)
         if not obj:
-            log(f"[Снятие проведения] ❌ Наряд №{number} не найден")
+            _log.error("[Снятие проведения] Наряд №%s не найден", number)
             return False
         try:
             obj.Проведен = False
             obj.Write()
-            log(f"[Снятие проведения] ✅ Наряд №{number} отменён")
+            _log.info("[Снятие проведения] ✅ Наряд №%s отменён", number)
             return True
         except Exception as e:
-            log(f"❌ Ошибка при отмене проведения наряда №{number}: {e}")
+            _log.error("Ошибка при отмене проведения наряда №%s: %s", number, e)
             return False
 
     def mark_wax_job_for_deletion(self, number: str) -> bool:
         obj = self._find_wax_job_by_number(number)
         if not obj:
-            log(f"[Пометка удаления] ❌ Наряд №{number} не найден")
+            _log.error("[Пометка удаления] Наряд №%s не найден", number)
             return False
         try:
             obj.DeletionMark = True
             obj.Write()
-            log(f"[Пометка удаления] ✅ Наряд №{number} помечен на удаление")
+            _log.info("[Пометка удаления] ✅ Наряд №%s помечен на удаление", number)
             return True
         except Exception as e:
-            log(f"❌ Ошибка при пометке наряда №{number}: {e}")
+            _log.error("Ошибка при пометке наряда №%s: %s", number, e)
             return False
 
     def unmark_wax_job_deletion(self, number: str) -> bool:
         obj = self._find_wax_job_by_number(number)
         if not obj:
-            log(f"[Снятие пометки] ❌ Наряд №{number} не найден")
+            _log.error("[Снятие пометки] Наряд №%s не найден", number)
             return False
         try:
             obj.DeletionMark = False
             obj.Write()
-            log(f"[Снятие пометки] ✅ Наряд №{number} восстановлен")
+            _log.info("[Снятие пометки] ✅ Наряд №%s восстановлен", number)
             return True
         except Exception as e:
-            log(f"❌ Ошибка при снятии пометки наряда №{number}: {e}")
+            _log.error("Ошибка при снятии пометки наряда №%s: %s", number, e)
             return False
 
     def delete_wax_job(self, number: str) -> bool:
         obj = self._find_wax_job_by_number(number)
         if not obj:
-            log(f"[Удаление] ❌ Наряд №{number} не найден")
+            _log.error("[Удаление] Наряд №%s не найден", number)
             return False
         try:
             if getattr(obj, "Проведен", False):
@@ -205,165 +230,222 @@ class WaxBridge:
             obj.DeletionMark = True
             obj.Write()
             obj.Delete()
-            log(f"[Удаление] ✅ Наряд №{number} удалён")
+            self.bridge.doc_index.forget("НарядВосковыеИзделия", number)
+            self.invalidate_task_jobs()
+            _log.info("[Удаление] ✅ Наряд №%s удалён", number)
             return True
         except Exception as e:
-            log(f"❌ Ошибка при удалении наряда №{number}: {e}")
+            _log.error("Ошибка при удалении наряда №%s: %s", number, e)
             return False
 
     def get_task_lines(self, doc_num: str) -> list[dict]:
         result = []
-        doc_manager = getattr(self.bridge.connection.Documents, "ЗаданиеНаПроизводство", None)
-        if not doc_manager:
+        doc = self.bridge.doc_index.find_object("ЗаданиеНаПроизводство", doc_num)
+        if doc is None:
             return result
 
-        selection = doc_manager.Select()
+        for row in doc.Продукция:
+            result.append({
+                "nomen": self.bridge.safe(row, "Номенклатура"),
+                "article": safe_str(getattr(row.Номенклатура, "Артикул", "")),
+                "size": self.bridge.safe(row, "Размер"),
+                "sample": self.bridge.safe(row, "Проба"),
+                "color": self.bridge.safe(row, "ЦветМеталла"),
+                "qty": row.Количество,
+                "weight": row.Вес if hasattr(row, "Вес") else "",
+            })
+        return result
+
+    def _read_wax_jobs(self, refs=None) -> list[tuple[str, dict]]:
+        """Наряды одним запросом; итоги по «ТоварыВыдано» считает 1С."""
+        result = []
+        text = queries.WAX_JOBS_LIST.format(where=queries.LIST_BY_REFS if refs is not None else "")
+        params = {"Ссылки": refs} if refs is not None else {}
+        selection = self.bridge.query_select(text, **params)
         while selection.Next():
-            doc = selection.GetObject()
-            if str(doc.Number) == str(doc_num):
-                for row in doc.Продукция:
-                    result.append({
-                        "nomen": self.bridge.safe(row, "Номенклатура"),
-                        "article": safe_str(getattr(row.Номенклатура, "Артикул", "")),
-                        "size": self.bridge.safe(row, "Размер"),
-                        "sample": self.bridge.safe(row, "Проба"),
-                        "color": self.bridge.safe(row, "ЦветМеталла"),
-                        "qty": row.Количество,
-                        "weight": row.Вес if hasattr(row, "Вес") else "",
-                    })
-                break
+            self.bridge.doc_index.register(
+                "НарядВосковыеИзделия", selection.Номер, selection.Дата, selection.Ссылка
+            )
+            posted = selection.Проведен
+            result.append((doc_key(selection.Номер, selection.Дата), {
+                "Номер": str(selection.Номер),
+                "Дата": selection.Дата.strftime("%d.%m.%Y"),
+                "Проведен": posted,
+                "ПометкаУдаления": selection.ПометкаУдаления,
+                "Закрыт": "✅" if posted else "—",
+                "Сотрудник": selection.Сотрудник or "",
+                "ТехОперация": selection.ТехОперация or "",
+                "Комментарий": selection.Комментарий or "",
+                "Склад": selection.Склад or "",
+                "ПроизводственныйУчасток": selection.ПроизводственныйУчасток or "",
+                "Организация": selection.Организация or "",
+                "Задание": selection.Задание or "—",
+                "Ответственный": selection.Ответственный or "",
+                "Вес": round(float(selection.Вес), 2),
+                "Кол-во": selection.Количество,
+            }))
         return result
 
     def list_wax_jobs(self) -> list[dict]:
-        result = []
-        docs = self.bridge.connection.Documents.НарядВосковыеИзделия.Select()
-        while docs.Next():
-            obj = docs.GetObject()
-            rows = getattr(obj, "ТоварыВыдано", [])
-            rows = getattr(obj, "Выдано", [])
-            weight = 0.0
-            qty = 0
-            for r in rows:
-                weight += getattr(r, "Вес", 0)
-                qty += getattr(r, "Количество", 0)
+        """Список нарядов на восковые изделия."""
+        return [job for _, job in self._read_wax_jobs()]
 
-            result.append({
-                "Номер": str(obj.Номер),
-                "Дата": obj.Дата.strftime("%d.%m.%Y"),
-                "Сотрудник": safe_str(obj.Сотрудник.Description),
-                "Вес": weight,
-                "Кол-во": qty,
-                "Проведен": obj.Проведен,
-                "ПометкаУдаления": getattr(obj, "ПометкаУдаления", False),
-                "Закрыт": "✅" if getattr(obj, "Проведен", False) else "—",
-                "Сотрудник": safe_str(obj.Сотрудник),
-                "ТехОперация": safe_str(obj.ТехОперация),
-                "Комментарий": safe_str(obj.Комментарий),
-                "Склад": safe_str(obj.Склад),
-                "ПроизводственныйУчасток": safe_str(obj.ПроизводственныйУчасток),
-                "Организация": safe_str(obj.Организация),
-                "Задание": safe_str(getattr(obj, "ЗаданиеНаПроизводство", "")) or "—",
-                "Ответственный": safe_str(obj.Ответственный),
-                "Вес": round(weight, 2),
-                "Кол-во": qty,
-            })
-        return result
+    def sync_wax_jobs(self, known: dict[str, str] | None = None, since=None) -> dict:
+        """Изменения списка нарядов относительно версий ``known`` (см. doc_sync).
 
-    def find_wax_jobs_by_task(self, task_ref) -> list:
-        """Возвращает наряды, связанные с указанным заданием."""
-        result: list = []
+        ``since`` — начало окна дат списка: сверяются только наряды из окна.
+        """
+        return sync_list(self.bridge, "НарядВосковыеИзделия", known, self._read_wax_jobs, since=since)
 
-        task_ref_str = self.bridge.to_string(task_ref)
-        jobs = self.bridge.list_documents("НарядВосковыеИзделия")
+    def iter_wax_jobs(self, page_size: int = 200):
+        """Наряды по мере чтения, страницами по ``page_size``."""
+        return iter_list(self.bridge, "НарядВосковыеИзделия", self._read_wax_jobs, page_size)
 
-        for job in jobs:
-            try:
-                job_task_ref = getattr(job, "ЗаданиеНаПроизводство", None)
-                if job_task_ref and self.bridge.to_string(job_task_ref) == task_ref_str:
-                    result.append(job.Ref)
-            except Exception as e:
-                log(f"[find_wax_jobs_by_task] ❌ Ошибка: {e}")
+    def list_wax_jobs_page(self, cursor: tuple | None = None, page_size: int = 200) -> dict:
+        """Одна страница списка нарядов (см. doc_sync.read_page)."""
+        return read_page(self.bridge, "НарядВосковыеИзделия", self._read_wax_jobs, cursor, page_size)
 
-        log(f"[find_wax_jobs_by_task] ✅ найдено {len(result)} нарядов для задания {task_ref_str}")
-        return result
+    def _task_key(self, task_ref) -> str:
+        return str(self.bridge.connection.String(task_ref.UUID()))
+
+    def find_wax_jobs_by_task(self, task_ref) -> list:
+        """Возвращает наряды, связанные с указанным заданием.
+
+        Наряды выбираются запросом с отбором по заданию; результат
+        запоминается до ``invalidate_task_jobs``.
+        """
+        key = self._task_key(task_ref)
+        jobs = self._jobs_by_task.get(key)
+        if jobs is None:
+            jobs = []
+            selection = self.bridge.query_select(queries.WAX_JOBS_BY_TASK, Задание=task_ref)
+            while selection.Next():
+                jobs.append(selection.Ссылка)
+                self.bridge.doc_index.register(
+                    "НарядВосковыеИзделия", selection.Номер, selection.Дата, selection.Ссылка
+                )
+            self._jobs_by_task[key] = jobs
+            _log.info("[find_wax_jobs_by_task] ✅ найдено %s нарядов для задания %s", len(jobs), key)
+        return list(jobs)
+
+    def invalidate_task_jobs(self, task_ref=None) -> None:
+        """Сбрасывает связи «задание → наряды» (все, если задание не указано)."""
+        if task_ref is None:
+            self._jobs_by_task.clear()
+            return
+        try:
+            self._jobs_by_task.pop(self._task_key(task_ref), None)
+        except Exception:
+            self._jobs_by_task.clear()
+
+    def _fill_accepted(self, doc, stamp: datetime) -> None:
+        """Заполняет «ТоварыПринято» по выданному одной загрузкой таблицы значений.
+
+        Колонка «Период» заполняется датой принятия для всех строк сразу.
+        """
+        accepted = doc.ТоварыПринято
+        try:
+            accepted.ЗаполнитьПоВыданному()
+            table = accepted.Unload()
+        except Exception as exc:
+            _log.warning("[close_wax_jobs] Заполнение: %s", exc)
+            # колонки, которых нет в «ТоварыПринято», при загрузке пропускаются
+            table = doc.ТоварыВыдано.Unload()
+        if table.Columns.Find("Период") is None:
+            table.Columns.Add("Период")
+        table.FillValues(stamp, "Период")
+        accepted.Load(table)
+
+    def _close_job(self, ref, stamp: datetime):
+        doc = self.bridge.get_object_from_ref(ref)
+        if not doc:
+            raise LookupError("Не удалось получить документ по ссылке")
+        self._fill_accepted(doc, stamp)
+        try:
+            doc.Закрыт = True
+        except Exception:
+            pass
+        doc.Проведен = True
+        doc.Write()
+        return doc
 
     def close_wax_jobs(self, job_refs: list) -> list[str]:
         """Закрывает наряды, принимая изделия из вкладки "Выдано"."""
         closed: list[str] = []
+        stamp = datetime.now()
         for ref in job_refs:
             try:
-                doc = self.bridge.get_object_from_ref(ref)
-                if not doc:
-                    log("[close_wax_jobs] ❌ Не удалось получить документ по ссылке")
-                    continue
-                try:
-                    doc.ТоварыПринято.ЗаполнитьПоВыданному()
-                except Exception as exc:
-                    log(f"[close_wax_jobs] ⚠ Заполнение: {exc}")
-                    try:
-                        issued = getattr(doc, "ТоварыВыдано", None)
-                        accepted = getattr(doc, "ТоварыПринято", None)
-                        if issued is not None and accepted is not None:
-                            for row in issued:
-                                new_row = accepted.Add()
-                                for attr in (
-                                    "Номенклатура",
-                                    "Размер",
-                                    "Проба",
-                                    "ЦветМеталла",
-                                    "Количество",
-                                    "Вес",
-                                    "ВидНорматива",
-                                    "ХарактеристикаВставок",
-                                ):
-                                    if hasattr(row, attr) and hasattr(new_row, attr):
-                                        setattr(new_row, attr, getattr(row, attr))
-                    except Exception as e_fill:
-                        log(f"[close_wax_jobs] ⚠ Ручное заполнение: {e_fill}")
-
-                # Записываем текущую дату в поле 'Период' табличной части
-                try:
-                    from datetime import datetime
-                    for accepted_row in getattr(doc, "ТоварыПринято", []):
-                        if hasattr(accepted_row, "Период"):
-                            accepted_row.Период = datetime.now()
-                except Exception as exc:
-                    log(f"[close_wax_jobs] ⚠ Не удалось установить дату принятия: {exc}")
-
-                try:
-                    doc.Закрыт = True
-                except Exception:
-                    pass
-
-                doc.Проведен = True
-                doc.Write()
+                doc = self._close_job(ref, stamp)
                 closed.append(str(doc.Номер))
-                log(f"[close_wax_jobs] ✅ {doc.Номер}")
+                _log.debug("[close_wax_jobs] ✅ %s", closed[-1])
             except Exception as e:
-                log(f"[close_wax_jobs] ❌ {e}")
+                _log.error("[close_wax_jobs] %s", e)
+        self.invalidate_task_jobs()
         return closed
 
+    def close_wax_jobs_batch(self, job_refs: list) -> list[dict]:
+        """Закрывает наряды в одной транзакции 1С: либо все, либо ни одного.
+
+        Возвращает результат по каждому наряду: ``{"number", "ok", "error"}``.
+        При ошибке транзакция откатывается, у остальных нарядов в ``error``
+        указывается, что закрытие отменено.
+        """
+        connection = self.bridge.connection
+        stamp = datetime.now()
+        results: list[dict] = []
+        failed = None
+        connection.BeginTransaction()
+        try:
+            for ref in job_refs:
+                try:
+                    doc = self._close_job(ref, stamp)
+                    results.append({"number": str(doc.Номер), "ok": True, "error": ""})
+                except Exception as e:
+                    results.append({"number": safe_str(ref), "ok": False, "error": str(e)})
+                    failed = e
+                    break
+        except BaseException:
+            # прерывание (KeyboardInterrupt, ошибка COM вне наряда) — ничего не фиксируем
+            connection.RollbackTransaction()
+            self.invalidate_task_jobs()
+            raise
+        try:
+            if failed is None:
+                connection.CommitTransaction()
+            else:
+                connection.RollbackTransaction()
+        finally:
+            self.invalidate_task_jobs()
+
+        if failed is not None:
+            for r in results[:-1]:
+                r.update(ok=False, error="Отменено: ошибка в другом наряде")
+            for ref in job_refs[len(results):]:
+                results.append({
+                    "number": safe_str(ref), "ok": False,
+                    "error": "Отменено: ошибка в другом наряде",
+                })
+            _log.error("[close_wax_jobs_batch] Транзакция отменена: %s", failed)
+        else:
+            _log.info("[close_wax_jobs_batch] ✅ Закрыто нарядов: %s", len(results))
+        return results
+
     def get_wax_job_lines(self, doc_num: str) -> list[dict]:
         result = []
-        doc_manager = getattr(self.bridge.connection.Documents, "НарядВосковыеИзделия", None)
-        if not doc_manager:
+        doc = self.bridge.doc_index.find_object("НарядВосковыеИзделия", doc_num)
+        if doc is None:
             return result
 
-        selection = doc_manager.Select()
-        while selection.Next():
-            doc = selection.GetObject()
-            if str(doc.Number) == str(doc_num):
-                for row in doc.ТоварыВыдано:
-                    result.append({
-                        "norm": self.bridge.safe(row, "ВидНорматива"),
-                        "nomen": self.bridge.safe(row, "Номенклатура"),
-                        "size": self.bridge.safe(row, "Размер"),
-                        "sample": self.bridge.safe(row, "Проба"),
-                        "color": self.bridge.safe(row, "ЦветМеталла"),
-                        "qty": row.Количество,
-                        "weight": round(float(row.Вес), self.bridge.config.WEIGHT_DECIMALS) if hasattr(row, "Вес") else "",
-                    })
-                break
+        for row in doc.ТоварыВыдано:
+            result.append({
+                "norm": self.bridge.safe(row, "ВидНорматива"),
+                "nomen": self.bridge.safe(row, "Номенклатура"),
+                "size": self.bridge.safe(row, "Размер"),
+                "sample": self.bridge.safe(row, "Проба"),
+                "color": self.bridge.safe(row, "ЦветМеталла"),
+                "qty": row.Количество,
+                "weight": round(float(row.Вес), config.WEIGHT_DECIMALS) if hasattr(row, "Вес") else "",
+            })
         return result
 
     def get_wax_job_rows(self, num: str) -> list[dict]:
@@ -376,7 +458,7 @@ class WaxBridge:
                 "Проба": self.bridge.safe(r, "Проба"),
                 "Цвет": self.bridge.safe(r, "ЦветМеталла"),
                 "Количество": r.Количество,
-                "Вес": round(float(r.Вес), self.bridge.config.WEIGHT_DECIMALS),
+                "Вес": round(float(r.Вес), config.WEIGHT_DECIMALS),
                 "Партия": self.bridge.safe(r, "Партия"),
                 "Номер ёлки": r.НомерЕлки if hasattr(r, "НомерЕлки") else "",
                 "Состав набора": r.СоставНабора if hasattr(r, "СоставНабора") else "",
@@ -386,17 +468,16 @@ class WaxBridge:
     def create_wax_job_from_task(self, task_number: str) -> str:
         task = self._find_task_by_number(task_number)
         if not task:
-            log(f"❌ Задание №{task_number} не найдено")
+            _log.error("Задание №%s не найдено", task_number)
             return ""
 
         try:
             doc = self.bridge.connection.Documents.НарядВосковыеИзделия.CreateDocument()
         except Exception as e:
-            log(f"[1C] Не удалось создать НарядВосковыеИзделия: {e}")
+            _log.info("[1C] Не удалось создать НарядВосковыеИзделия: %s", e)
             return ""
 
         try:
-            from datetime import datetime
             doc.Date = datetime.now()
             doc.ДокументОснование = task
             doc.ТехОперация = getattr(task, "ТехОперация", None)
@@ -408,26 +489,26 @@ class WaxBridge:
             if order_ref and hasattr(order_ref, "GetObject"):
                 try:
                     order_obj = order_ref.GetObject()
-                    log("[create_wax_job_from_task] ✅ Получен заказ-основание")
+                    _log.debug("[create_wax_job_from_task] ✅ Получен заказ-основание")
                 except Exception as exc:
-                    log(f"[create_wax_job_from_task] ⚠ Ошибка получения заказа: {exc}")
+                    _log.error("[create_wax_job_from_task] Ошибка получения заказа: %s", exc)
 
             if order_obj:
                 try:
                     org = getattr(order_obj, "Организация", None)
                     if org:
                         doc.Организация = org if hasattr(org, "Ref") else org
-                        log(f"[create_wax_job_from_task] ✅ Установлена организация: {safe_str(org)}")
+                        _log.debug("[create_wax_job_from_task] ✅ Установлена организация: %s", org)
                 except Exception as e:
-                    log(f"[create_wax_job_from_task] ⚠ Не удалось установить организацию: {e}")
+                    _log.warning("[create_wax_job_from_task] Не удалось установить организацию: %s", e)
 
                 try:
                     wh = getattr(order_obj, "Склад", None)
                     if wh:
                         doc.Склад = wh if hasattr(wh, "Ref") else wh
-                        log(f"[create_wax_job_from_task] ✅ Установлен склад: {safe_str(wh)}")
+                        _log.debug("[create_wax_job_from_task] ✅ Установлен склад: %s", wh)
                 except Exception as e:
-                    log(f"[create_wax_job_from_task] ⚠ Не удалось установить склад: {e}")
+                    _log.warning("[create_wax_job_from_task] Не удалось установить склад: %s", e)
 
             for row in task.Продукция:
                 r = doc.ТоварыВыдано.Add()
@@ -441,37 +522,74 @@ class WaxBridge:
 
             doc.Проведен = True
             doc.Write()
-            log(f"✅ Создан НарядВосковыеИзделия №{doc.Number}")
+            self.bridge.doc_index.register("НарядВосковыеИзделия", doc.Number, doc.Date, doc.Ref)
+            self.invalidate_task_jobs(task.Ref)
+            _log.info("✅ Создан НарядВосковыеИзделия №%s", doc.Number)
             return str(doc.Number)
         except Exception as e:
-            log(f"❌ Ошибка создания Наряда: {e}")
+            _log.error("Ошибка создания Наряда: %s", e)
             return ""
 
-    def create_wax_jobs_from_task(
+    # Колонки строк задания, переносимые в «ТоварыВыдано» наряда
+    JOB_ROW_COLUMNS = ("Номенклатура", "Количество", "Размер", "Проба", "ЦветМеталла", "ХарактеристикаВставок", "Вес")
+    JOB_METHODS = ("3D печать", "Пресс-форма")
+
+    def _default_ref(self, catalog: str):
+        """Первый элемент справочника (значение по умолчанию для шапки наряда)."""
+        if catalog not in self._defaults:
+            ref = None
+            try:
+                items = self.bridge.list_catalog_items(catalog, 1)
+                if items:
+                    ref = self.bridge.catalog_cache.ref(catalog, items[0]["uuid"])
+                    _log.warning(
+                        "[create_wax_jobs_from_task] %s: по умолчанию %s", catalog, items[0]["Description"]
+                    )
+            except Exception as exc:
+                _log.warning("[create_wax_jobs_from_task] Нет значения по умолчанию для %s: %s", catalog, exc)
+            self._defaults[catalog] = ref
+        return self._defaults[catalog]
+
+    def _operation_ref(self, method: str):
+        if method not in self._operations:
+            self._operations[method] = self.bridge.get_ref("ТехОперации", method)
+        return self._operations[method]
+
+    def _open_task(self, task_ref):
+        if isinstance(task_ref, str):
+            return self.bridge.connection.GetObject(task_ref)
+        if hasattr(task_ref, "Продукция"):
+            return task_ref
+        if hasattr(task_ref, "GetObject"):
+            return task_ref.GetObject()
+        return None
+
+    def _open_task_by_number(self, number: str):
+        return self._find_task_by_number(number)
+
+    def plan_wax_jobs(
         self,
         task_ref,
         master_3d: str,
         master_form: str,
         warehouse: str | None = None,
         norm_type: str = "Номенклатура",
-    ) -> list[str]:
-        mapping = {"3D печать": master_3d, "Пресс-форма": master_form}
-        result: list[str] = []
+    ) -> dict | None:
+        """План создания нарядов по заданию: все ссылки разрешены заранее.
 
+        Строки задания выгружаются одной таблицей значений, артикул и тип
+        номенклатуры каждой строки читаются одним запросом. Результат
+        передаётся в ``create_wax_jobs_from_plan``.
+        """
         try:
-            if isinstance(task_ref, str):
-                task = self.bridge.connection.GetObject(task_ref)
-            elif hasattr(task_ref, "Продукция"):
-                task = task_ref
-            elif hasattr(task_ref, "GetObject"):
-                task = task_ref.GetObject()
-            else:
-                log("[create_wax_jobs_from_task] ❌ Неверный тип ссылки")
-                return []
-            task_ref_link = task.Ref
+            task = self._open_task(task_ref)
+            if task is None:
+                _log.error("[create_wax_jobs_from_task] Неверный тип ссылки")
+                return None
+            task_link = task.Ref
         except Exception as exc:
-            log(f"[create_wax_jobs_from_task] ❌ Ошибка доступа к заданию: {exc}")
-            return []
+            _log.error("[create_wax_jobs_from_task] Ошибка доступа к заданию: %s", exc)
+            return None
 
         org = getattr(task, "Организация", None)
         wh = getattr(task, "Склад", None)
@@ -485,113 +603,147 @@ class WaxBridge:
                 wh = wh or getattr(order_obj, "Склад", None)
                 responsible = responsible or getattr(order_obj, "Ответственный", None)
             except Exception as e:
-                log(f"[create_wax_jobs_from_task] ⚠ Не удалось получить данные из заказа: {e}")
-
-        # Заполнение значений по умолчанию, если они не определены
-        if org is None:
-            try:
-                orgs = self.bridge.list_catalog_items("Организации", 1)
-                if orgs:
-                    org = orgs[0]["Ref"]
-                    log(
-                        f"[create_wax_jobs_from_task] ⚠ Установлена организация по умолчанию: {orgs[0]['Description']}"
-                    )
-            except Exception as exc:
-                log(f"[create_wax_jobs_from_task] ⚠ Не удалось установить организацию: {exc}")
-
-        if wh is None:
-            try:
-                whs = self.bridge.list_catalog_items("Склады", 1)
-                if whs:
-                    wh = whs[0]["Ref"]
-                    log(
-                        f"[create_wax_jobs_from_task] ⚠ Установлен склад по умолчанию: {whs[0]['Description']}"
-                    )
-            except Exception as exc:
-                log(f"[create_wax_jobs_from_task] ⚠ Не удалось установить склад: {exc}")
-
-        if responsible is None:
-            try:
-                users = self.bridge.list_catalog_items("Пользователи", 1)
-                if users:
-                    responsible = users[0]["Ref"]
-                    log(
-                        f"[create_wax_jobs_from_task] ⚠ Установлен ответственный по умолчанию: {users[0]['Description']}"
-                    )
-            except Exception as exc:
-                log(f"[create_wax_jobs_from_task] ⚠ Не удалось установить ответственного: {exc}")
+                _log.warning("[create_wax_jobs_from_task] Не удалось получить данные из заказа: %s", e)
 
-        section = getattr(task, "ПроизводственныйУчасток", None)
         if warehouse:
             wh = self.bridge.get_ref_by_description("Склады", warehouse) or wh
 
-        rows_by_method = {"3D печать": [], "Пресс-форма": []}
-        for row in task.Продукция:
-            art = safe_str(getattr(row.Номенклатура, "Артикул", "")).lower()
+        # Вид норматива: по типу номенклатуры строки, norm_type — по умолчанию
+        norms = {
+            name: self.bridge.get_enum_by_description("ВидыНормативовНоменклатуры", name)
+            for name in {norm_type, "Номенклатура", "Комплектующее"}
+        }
+        rows = {method: [] for method in self.JOB_METHODS}
+        selection = self.bridge.query_select(queries.TASK_PRODUCTS, Задание=task_link)
+        while selection.Next():
+            art = str(selection.Артикул or "").lower()
             method = "3D печать" if "д" in art or "d" in art else "Пресс-форма"
-            rows_by_method[method].append(row)
-
-        for method, rows in rows_by_method.items():
+            norm = "Номенклатура" if selection.ТипНоменклатуры == "Продукция" else "Комплектующее"
+            rows[method].append((int(selection.НомерСтроки) - 1, norm))
+
+        masters = {"3D печать": master_3d, "Пресс-форма": master_form}
+        return {
+            "task": task_link,
+            "org": org if org is not None else self._default_ref("Организации"),
+            "warehouse": wh if wh is not None else self._default_ref("Склады"),
+            "responsible": responsible if responsible is not None else self._default_ref("Пользователи"),
+            "section": getattr(task, "ПроизводственныйУчасток", None),
+            "operations": {m: self._operation_ref(m) for m in self.JOB_METHODS},
+            "employees": {m: self.bridge.get_ref("ФизическиеЛица", masters[m]) for m in self.JOB_METHODS},
+            "norms": norms,
+            "default_norm": norm_type,
+            "table": task.Продукция.Unload(),
+            "rows": rows,
+        }
+
+    def _job_lines(self, table, rows: list[tuple[int, str]], norms: dict, default: str):
+        """Строки метода — копия выгруженной таблицы задания для одной загрузки."""
+        selected = self.bridge.connection.NewObject("Массив")
+        for index, _ in rows:
+            selected.Add(table.Get(index))
+        columns = [name for name in self.JOB_ROW_COLUMNS if table.Columns.Find(name) is not None]
+        lines = table.Copy(selected, ",".join(columns))
+        lines.Columns.Add("ВидНорматива")
+        if norms.get(default) is not None:
+            lines.FillValues(norms[default], "ВидНорматива")
+        for i, (_, norm) in enumerate(rows):
+            value = norms.get(norm)
+            if value is not None and norm != default:
+                lines.Get(i).ВидНорматива = value
+        return lines
+
+    @staticmethod
+    def _add_job_rows(job, table, rows: list[tuple[int, str]], norms: dict, default: str) -> None:
+        """Построчное заполнение «ТоварыВыдано», если загрузка таблицей не удалась."""
+        for index, norm in rows:
+            r = table.Get(index)
+            row = job.ТоварыВыдано.Add()
+            row.Номенклатура = r.Номенклатура
+            row.Количество = r.Количество
+            row.Размер = r.Размер
+            row.Проба = r.Проба
+            row.ЦветМеталла = r.ЦветМеталла
+            if hasattr(r, "ХарактеристикаВставок"):
+                row.ХарактеристикаВставок = r.ХарактеристикаВставок
+            if hasattr(r, "Вес"):
+                row.Вес = r.Вес
+            value = norms.get(norm) if norms.get(norm) is not None else norms.get(default)
+            if value is not None:
+                row.ВидНорматива = value
+
+    def create_wax_jobs_from_plan(self, plan: dict) -> list[str]:
+        """Создаёт наряды (3D печать / пресс-форма) по плану ``plan_wax_jobs``."""
+        result: list[str] = []
+        table = plan["table"]
+        norms = plan["norms"]
+        for method, rows in plan["rows"].items():
             if not rows:
                 continue
             try:
                 job = self.bridge.connection.Documents.НарядВосковыеИзделия.CreateDocument()
 
                 job.Дата = datetime.now()
-                job.ДокументОснование = task_ref_link
-                job.ЗаданиеНаПроизводство = task_ref_link
-                if org is not None:
-                    try:
-                        job.Организация = org
-                    except Exception as exc:
-                        log(f"[create_wax_jobs_from_task] ⚠ Не удалось установить организацию: {exc}")
-                if wh is not None:
-                    try:
-                        job.Склад = wh
-                    except Exception as exc:
-                        log(f"[create_wax_jobs_from_task] ⚠ Не удалось установить склад: {exc}")
-                if section:
-                    job.ПроизводственныйУчасток = section
-                if responsible:
-                    job.Ответственный = responsible
-                job.ТехОперация = self.bridge.get_ref("ТехОперации", method)
-                job.Сотрудник = self.bridge.get_ref("ФизическиеЛица", mapping.get(method, ""))
+                job.ДокументОснование = plan["task"]
+                job.ЗаданиеНаПроизводство = plan["task"]
+                for field, key in (("Организация", "org"), ("Склад", "warehouse")):
+                    if plan[key] is not None:
+                        try:
+                            setattr(job, field, plan[key])
+                        except Exception as exc:
+                            _log.warning("[create_wax_jobs_from_task] Не удалось установить %s: %s", field, exc)
+                if plan["section"]:
+                    job.ПроизводственныйУчасток = plan["section"]
+                if plan["responsible"]:
+                    job.Ответственный = plan["responsible"]
+                job.ТехОперация = plan["operations"][method]
+                job.Сотрудник = plan["employees"][method]
                 job.Комментарий = f"Создан автоматически для {method}"
 
-                for r in rows:
-                    row = job.ТоварыВыдано.Add()
-                    row.Номенклатура = r.Номенклатура
-                    row.Количество = r.Количество
-                    row.Размер = r.Размер
-                    row.Проба = r.Проба
-                    row.ЦветМеталла = r.ЦветМеталла
-                    if hasattr(r, "ХарактеристикаВставок"):
-                        row.ХарактеристикаВставок = r.ХарактеристикаВставок
-                    if hasattr(r, "Вес"):
-                        row.Вес = r.Вес
-
-                enum_norm = self.bridge.get_enum_by_description(
-                    "ВидыНормативовНоменклатуры", norm_type
-                )
-                if enum_norm:
-                    for row in job.ТоварыВыдано:
-                        row.ВидНорматива = enum_norm
-
-                for row in job.ТоварыВыдано:
-                    nomenclature = getattr(row, "Номенклатура", None)
-                    if nomenclature is not None:
-                        type_enum = self.bridge.get_object_property(nomenclature, "ТипНоменклатуры")
-                        enum = self.bridge.get_enum_by_description(
-                            "ВидыНормативовНоменклатуры",
-                            "Номенклатура" if safe_str(type_enum) == "Продукция" else "Комплектующее",
-                        )
-                        if enum:
-                            row.ВидНорматива = enum
+                try:
+                    job.ТоварыВыдано.Load(self._job_lines(table, rows, norms, plan["default_norm"]))
+                except Exception as exc:
+                    _log.warning(
+                        "[create_wax_jobs_from_task] Загрузка строк %s не удалась, заполняем построчно: %s",
+                        method, exc,
+                    )
+                    job.ТоварыВыдано.Clear()
+                    self._add_job_rows(job, table, rows, norms, plan["default_norm"])
 
                 job.Проведен = True
                 job.Write()
+                self.bridge.doc_index.register("НарядВосковыеИзделия", job.Номер, job.Дата, job.Ref)
                 result.append(str(job.Номер))
-                log(f"[create_wax_jobs_from_task] ✅ Создан наряд {method}: №{job.Номер}")
+                _log.info("[create_wax_jobs_from_task] ✅ Создан наряд %s: №%s (%s строк)", method, job.Номер, len(rows))
             except Exception as exc:
-                log(f"[create_wax_jobs_from_task] ❌ Ошибка для {method}: {exc}")
+                _log.error("[create_wax_jobs_from_task] Ошибка для %s: %s", method, exc)
+        self.invalidate_task_jobs(plan["task"])
         return result
+
+    def create_wax_jobs_from_task(
+        self,
+        task_ref,
+        master_3d: str,
+        master_form: str,
+        warehouse: str | None = None,
+        norm_type: str = "Номенклатура",
+    ) -> list[str]:
+        """Создаёт два наряда из одного задания по артикулу."""
+        plan = self.plan_wax_jobs(task_ref, master_3d, master_form, warehouse, norm_type)
+        if plan is None:
+            return []
+        return self.create_wax_jobs_from_plan(plan)
+
+    def create_wax_jobs_from_task_number(
+        self,
+        number: str,
+        master_3d: str,
+        master_form: str,
+        warehouse: str | None = None,
+        norm_type: str = "Номенклатура",
+    ) -> list[str]:
+        """Создаёт наряды по номеру задания (см. ``create_wax_jobs_from_task``)."""
+        task = self._open_task_by_number(number)
+        if task is None:
+            _log.error("[create_wax_jobs_from_task] Задание №%s не найдено", number)
+            return []
+        return self.create_wax_jobs_from_task(task, master_3d, master_form, warehouse, norm_type)
@@ -116,12 +116,12 @@ def process_new_order(order_json: Dict[str,Any]) -> Dict[str,Any]:
     order_code = order_json.get("number", new_order_code())  # fallback на случай отладки без 1С
 
     # 🔒 Проверка: если заказ уже в ORDERS_POOL — ничего не делать
-    for existing in ORDERS_POOL:
-        if existing["order"].get("number") == order_code:
-            logger.warning(
-                f"[process_new_order] Заказ №{order_code} уже в ORDERS_POOL, пропускаем"
-            )
-            return existing  # можно вернуть старую запись
+    existing = ORDERS_POOL.find("order", order_code)
+    if existing is not None:
+        logger.warning(
+            "[process_new_order] Заказ №%s уже в ORDERS_POOL, пропускаем", order_code
+        )
+        return existing  # можно вернуть старую запись
 
     items      = expand_items(order_json)
     batches, mapping = group_by_keys(items, GROUP_KEYS_WAX_CAST)
@@ -133,15 +133,23 @@ def process_new_order(order_json: Dict[str,Any]) -> Dict[str,Any]:
         items=items,
         batches=batches,
         mapping=mapping,
-        wax_jobs=wax_jobs))
-    
+        wax_jobs=list(dict.fromkeys(j["wax_job"] for j in wax_jobs))))
+
     ORDERS_POOL.append(record)
     return record
 
+
+def clear_orders() -> None:
+    """Очищает ORDERS_POOL вместе со строками нарядов этих заказов."""
+    for record in ORDERS_POOL:
+        for code in record["docs"].get("wax_jobs", []):
+            WAX_JOBS_POOL.remove_all("job", code)
+    ORDERS_POOL.clear()
+
 # ─────────────  service helpers  ────────────────────────────────────────
 def _find_job(code: str) -> dict | None:
     """Возвращает словарь наряда по его коду."""
-    return next((j for j in WAX_JOBS_POOL if j.get("wax_job") == code), None)
+    return WAX_JOBS_POOL.find("job", code)
 
 def get_wax_job(job_code: str) -> dict | None:
     """Публичная обёртка для поиска наряда."""
@@ -153,6 +161,7 @@ def update_wax_job(job_code: str, updates: Dict[str, Any]) -> dict | None:
     if not job:
         return None
     job.update(updates)
+    WAX_JOBS_POOL.save(job)
     return job
 
 
@@ -168,6 +177,7 @@ def log_event(job_code: str, stage: str, user: str | None = None, extra: Dict[st
     if extra:
         rec.update(extra)
     job["signed_log"].append(rec)
+    WAX_JOBS_POOL.save(job)
 
 
 def form_wax_trees(jobs: list[dict]) -> list[dict]:
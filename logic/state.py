@@ -1,10 +1,323 @@
-# logic/state.py
+# state.py • производственные пулы: индексы в памяти + SQLite (WAL)
+# -*- coding: utf-8 -*-
+"""Пулы заказов, нарядов, очереди сборки и ёлок.
 
-ORDERS_POOL = []
-WAX_JOBS_POOL = []
+Каждый пул ведёт себя как список словарей (``append``, ``extend``, ``clear``,
+перебор, ``in``), но дополнительно держит индексы по ключевым полям —
+``find``/``find_all`` отвечают без перебора. Содержимое пулов хранится в
+``data/production_state.sqlite`` (журнал WAL) и читается при первом
+обращении, поэтому после перезапуска партии и наряды не нужно заново
+получать из 1С.
+
+Словари, изменённые на месте (``job.update(...)``), сохраняются вызовом
+``pool.save(item)``.
+"""
+from __future__ import annotations
+import json
+import sqlite3
+import threading
+from bisect import bisect_left, insort
+from collections.abc import MutableSequence
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from core.logger import get_logger
+
+_log = get_logger(__name__)
+
+# Файл состояния производства
+STATE_PATH = Path(__file__).resolve().parent.parent / "data" / "production_state.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pool_items(
+    pool TEXT    NOT NULL,
+    seq  INTEGER NOT NULL,
+    data TEXT    NOT NULL,
+    PRIMARY KEY (pool, seq)
+);
+"""
+
+# Индекс: функция «элемент → ключи» (у элемента может быть несколько ключей)
+Index = Callable[[dict], Iterable[Any]]
+
+
+class StateStore:
+    """Файл SQLite, общий для всех пулов. Без доступа к диску пулы работают в памяти."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.lock = threading.RLock()
+        self._db: sqlite3.Connection | None = None
+        self._failed = False
+
+    def _conn(self) -> sqlite3.Connection | None:
+        if self._db is None and not self._failed:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+                self._db.executescript(_SCHEMA)
+            except Exception as e:
+                _log.warning("[StateStore] Состояние не сохраняется (%s): %s", self.path, e)
+                self._db, self._failed = None, True
+        return self._db
+
+    def _run(self, sql: str, rows: Iterable[tuple] = ((),)) -> None:
+        db = self._conn()
+        if db is None:
+            return
+        with self.lock:
+            try:
+                with db:
+                    db.executemany(sql, rows)
+            except Exception as e:
+                _log.error("[StateStore] Ошибка записи состояния: %s", e)
+
+    def load(self, pool: str) -> list[tuple[int, dict]]:
+        db = self._conn()
+        if db is None:
+            return []
+        with self.lock:
+            cur = db.execute("SELECT seq, data FROM pool_items WHERE pool = ? ORDER BY seq", (pool,))
+            return [(seq, json.loads(data)) for seq, data in cur]
+
+    def write(self, pool: str, rows: Iterable[tuple[int, dict]]) -> None:
+        self._run(
+            "INSERT OR REPLACE INTO pool_items(pool, seq, data) VALUES (?, ?, ?)",
+            ((pool, seq, json.dumps(item, ensure_ascii=False, default=str)) for seq, item in rows),
+        )
+
+    def delete(self, pool: str, seqs: Iterable[int]) -> None:
+        self._run("DELETE FROM pool_items WHERE pool = ? AND seq = ?", ((pool, s) for s in seqs))
+
+    def clear(self, pool: str) -> None:
+        self._run("DELETE FROM pool_items WHERE pool = ?", [(pool,)])
+
+    def close(self) -> None:
+        with self.lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class Pool(MutableSequence):
+    """Список словарей с индексами и записью каждого изменения в ``StateStore``.
+
+    Элементы пула — разные объекты: один и тот же словарь дважды не добавляется.
+    """
+
+    def __init__(self, name: str, store: StateStore, indexes: dict[str, Index]):
+        self.name = name
+        self._store = store
+        self._indexes = indexes
+        self._items: list[dict] = []
+        self._seqs: list[int] = []
+        self._seq_of: dict[int, int] = {}                        # id(элемент) → seq
+        self._keys_of: dict[int, dict[str, list]] = {}           # id(элемент) → ключи
+        self._by: dict[str, dict[Any, list[dict]]] = {n: {} for n in indexes}
+        self._next_seq = 1
+        self._loaded = False
+
+    # -------------------------------------------------------------
+    def _ensure(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        for seq, item in self._store.load(self.name):
+            self._attach(len(self._items), seq, item)
+        if self._seqs:
+            self._next_seq = self._seqs[-1] + 1
+            _log.info("[Pool] %s: восстановлено %s записей", self.name, len(self._items))
+
+    def _keys(self, item: dict) -> dict[str, list]:
+        keys = {}
+        for name, fn in self._indexes.items():
+            try:
+                keys[name] = [k for k in fn(item) if k is not None]
+            except (KeyError, TypeError, AttributeError):
+                keys[name] = []
+        return keys
+
+    def _index(self, item: dict, keys: dict[str, list] | None = None) -> None:
+        # корзины индекса упорядочены по seq, как и сам пул
+        keys = self._keys(item) if keys is None else keys
+        for name, values in keys.items():
+            for key in values:
+                insort(self._by[name].setdefault(key, []), item, key=lambda it: self._seq_of[id(it)])
+        self._keys_of[id(item)] = keys
+
+    def _unindex(self, item: dict) -> None:
+        for name, keys in self._keys_of.pop(id(item), {}).items():
+            for key in keys:
+                bucket = self._by[name].get(key, [])
+                for i, other in enumerate(bucket):
+                    if other is item:
+                        del bucket[i]
+                        break
+                if not bucket:
+                    self._by[name].pop(key, None)
+
+    def _attach(self, pos: int, seq: int, item: dict) -> None:
+        self._items.insert(pos, item)
+        self._seqs.insert(pos, seq)
+        self._seq_of[id(item)] = seq
+        self._index(item)
+
+    def _detach(self, pos: int) -> tuple[int, dict]:
+        item, seq = self._items.pop(pos), self._seqs.pop(pos)
+        self._seq_of.pop(id(item), None)
+        self._unindex(item)
+        return seq, item
+
+    def _append_new(self, items: Iterable[dict]) -> list[tuple[int, dict]]:
+        added = []
+        for item in items:
+            seq, self._next_seq = self._next_seq, self._next_seq + 1
+            self._attach(len(self._items), seq, item)
+            added.append((seq, item))
+        return added
+
+    # ─────────────  интерфейс списка  ─────────────
+    def __len__(self) -> int:
+        self._ensure()
+        return len(self._items)
+
+    def __getitem__(self, i):
+        self._ensure()
+        return self._items[i]
+
+    def __iter__(self):
+        self._ensure()
+        return iter(self._items)
+
+    def __contains__(self, item) -> bool:
+        self._ensure()
+        if isinstance(item, dict) and self._indexes:
+            name = next(iter(self._indexes))
+            keys = self._keys(item)[name]
+            if keys:
+                return any(other == item for other in self._by[name].get(keys[0], ()))
+        return item in self._items
+
+    def __setitem__(self, i, item) -> None:
+        self._ensure()
+        if isinstance(i, slice):
+            raise TypeError("Pool не поддерживает присваивание срезу")
+        pos = range(len(self._items))[i]
+        seq, _ = self._detach(pos)
+        self._attach(pos, seq, item)
+        self._store.write(self.name, [(seq, item)])
+
+    def __delitem__(self, i) -> None:
+        self._ensure()
+        positions = range(len(self._items))[i]
+        positions = [positions] if isinstance(positions, int) else sorted(positions, reverse=True)
+        self._store.delete(self.name, [self._detach(pos)[0] for pos in positions])
+
+    def insert(self, i: int, item: dict) -> None:
+        self._ensure()
+        n = len(self._items)
+        pos = min(i if i >= 0 else max(n + i, 0), n)
+        if pos >= len(self._items):
+            self._store.write(self.name, self._append_new([item]))
+            return
+        # вставка в середину: порядковые номера пересчитываются
+        self._attach(pos, 0, item)
+        self._seqs = list(range(1, len(self._items) + 1))
+        self._seq_of = {id(it): seq for it, seq in zip(self._items, self._seqs)}
+        self._next_seq = len(self._items) + 1
+        for buckets in self._by.values():
+            for bucket in buckets.values():
+                bucket.sort(key=lambda it: self._seq_of[id(it)])
+        self._store.clear(self.name)
+        self._store.write(self.name, zip(self._seqs, self._items))
+
+    def append(self, item: dict) -> None:
+        self._ensure()
+        self._store.write(self.name, self._append_new([item]))
+
+    def extend(self, items: Iterable[dict]) -> None:
+        self._ensure()
+        self._store.write(self.name, self._append_new(list(items)))
+
+    def clear(self) -> None:
+        self._ensure()
+        self._items.clear()
+        self._seqs.clear()
+        self._seq_of.clear()
+        self._keys_of.clear()
+        self._by = {n: {} for n in self._indexes}
+        self._store.clear(self.name)
+
+    def __repr__(self) -> str:
+        return f"<Pool {self.name}: {len(self)} записей>"
+
+    # ─────────────  поиск и сохранение  ─────────────
+    def find(self, index: str, key: Any) -> dict | None:
+        """Первый элемент с ключом ``key`` в индексе ``index``."""
+        self._ensure()
+        bucket = self._by[index].get(key)
+        return bucket[0] if bucket else None
+
+    def find_all(self, index: str, key: Any) -> list[dict]:
+        """Все элементы с ключом ``key`` (в порядке добавления)."""
+        self._ensure()
+        return list(self._by[index].get(key, ()))
+
+    def remove_all(self, index: str, key: Any) -> int:
+        """Удаляет все элементы с ключом ``key``; возвращает их количество."""
+        self._ensure()
+        positions = sorted(
+            (bisect_left(self._seqs, self._seq_of[id(item)]) for item in self._by[index].get(key, ())),
+            reverse=True,
+        )
+        self._store.delete(self.name, [self._detach(pos)[0] for pos in positions])
+        return len(positions)
+
+    def keys(self, index: str) -> list:
+        self._ensure()
+        return list(self._by[index])
+
+    def save(self, item: dict) -> None:
+        """Сохраняет элемент, изменённый на месте, и обновляет индексы."""
+        self._ensure()
+        seq = self._seq_of.get(id(item))
+        if seq is None:
+            return
+        keys = self._keys(item)
+        if keys != self._keys_of.get(id(item)):
+            self._unindex(item)
+            self._index(item, keys)
+        self._store.write(self.name, [(seq, item)])
+
+
+def _field(name: str) -> Index:
+    return lambda item: (item.get(name),)
+
+
+def _alloy(item: dict) -> tuple:
+    """Ключ металл–проба–цвет."""
+    return ((item.get("metal"), item.get("hallmark"), item.get("color")),)
+
+
+STORE = StateStore(STATE_PATH)
+
+# Заказы с развёрнутыми изделиями и партиями (process_new_order);
+# в docs["wax_jobs"] — коды нарядов, сами строки нарядов — в WAX_JOBS_POOL
+ORDERS_POOL = Pool("orders", STORE, {
+    "order": lambda r: (r["order"].get("number"),),
+    "batch": lambda r: [b["batch_barcode"] for b in r["docs"].get("batches", [])],
+})
+# Строки нарядов; у одного наряда (wax_job) может быть несколько строк
+WAX_JOBS_POOL = Pool("wax_jobs", STORE, {
+    "job": _field("wax_job"),
+    "batch": _field("batch_code"),
+    "alloy": _alloy,
+})
 
 # Очередь нарядов для сборки ёлок
-ASSEMBLY_POOL: list[dict] = []
+ASSEMBLY_POOL = Pool("assembly", STORE, {"job": _field("wax_job"), "alloy": _alloy})
 
 # Сформированные ёлки после сборки
-TREES_POOL: list[dict] = []
+TREES_POOL = Pool("trees", STORE, {"tree": _field("tree_code"), "alloy": _alloy})
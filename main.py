@@ -26,7 +26,9 @@ from config import (
 )
 import config
 from widgets import LoginDialog
-from PyQt5.QtCore    import Qt
+from widgets.async_call import bridge_call, prefetch_data
+from core.com_metrics import METRICS
+from PyQt5.QtCore    import Qt, QTimer
 from PyQt5.QtGui     import QFont, QCursor
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QListWidget, QStackedWidget,
@@ -48,6 +50,19 @@ class StubPage(QWidget):
         lbl.setFont(QFont("Arial", 22, QFont.Bold))
         v.addWidget(lbl, alignment=Qt.AlignTop)
 
+# Заглушка на время создания страницы
+class LoadingPage(StubPage):
+    def __init__(self, title: str):
+        super().__init__(title)
+        hint = QLabel("Загрузка…")
+        hint.setStyleSheet("color:#6b7280;font-size:14px;")
+        self.layout().addWidget(hint, alignment=Qt.AlignTop)
+        self.layout().addStretch(1)
+
+
+# Пауза перед фоновой подготовкой следующей страницы, мс
+PREFETCH_DELAY_MS = 1500
+
 # Главное окно
 class Main(QMainWindow):
     def __init__(self):
@@ -73,6 +88,14 @@ class Main(QMainWindow):
         h_lay.addWidget(self.btn_toggle, alignment=Qt.AlignLeft)
         h_lay.addWidget(brand, alignment=Qt.AlignLeft)
         h_lay.addStretch(1)
+        self.metrics_panel = None
+        if config.COM_METRICS:
+            btn_metrics = QToolButton()
+            btn_metrics.setText("⏱")
+            btn_metrics.setCursor(QCursor(Qt.PointingHandCursor))
+            btn_metrics.setToolTip("Метрики COM")
+            btn_metrics.clicked.connect(self._show_metrics)
+            h_lay.addWidget(btn_metrics, alignment=Qt.AlignRight)
         outer.addWidget(header)
 
         body = QWidget()
@@ -88,34 +111,96 @@ class Main(QMainWindow):
 
         self.page_idx = {}
         self.page_refs = {}
-        wax_index = next(i for i, (_, k) in enumerate(MENU_ITEMS) if k == "wax")
+        # Фабрики «тяжёлых» страниц: создаются при первом выборе в меню;
+        # data — заранее прочитанные данные страницы (DATA_CALLS)
+        self._page_factories = {
+            "orders": lambda data=None: OrdersPage(on_send_to_wax=self._open_wax_with_order, data=data),
+            "wax": lambda data=None: WaxPage(data),
+            "catalogs": lambda data=None: CatalogsPage(config.BRIDGE),
+        }
+        self._page_data = {"orders": OrdersPage.DATA_CALLS, "wax": WaxPage.DATA_CALLS}
         for idx, (title, key) in enumerate(MENU_ITEMS):
             self.menu.addItem(title)
-            if key == "orders":
-                def _open_wax_with_order(order=None):
-                    self.page_refs["wax"].refresh()
-                    if order:
-                        if isinstance(order, dict):
-                            self.page_refs["wax"].task_form.load_order_by_number(order.get("num"), order.get("date"))
-                        else:
-                            self.page_refs["wax"].task_form.load_order_by_number(order)
-                    self.menu.setCurrentRow(self.page_idx.get("wax", wax_index))
-
-                page = OrdersPage(on_send_to_wax=_open_wax_with_order)
-            elif key == "wax":
-                page = WaxPage()
-            elif key == "catalogs":
-                page = CatalogsPage(config.BRIDGE)  # ← вот это обязательно!
+            if key in self._page_factories:
+                page = LoadingPage(title.strip())
             else:
                 page = StubPage(title.strip())
+                self.page_refs[key] = page
             self.pages.addWidget(page)
             self.page_idx[key] = idx
-            self.page_refs[key] = page
 
-        self.menu.currentRowChanged.connect(self.pages.setCurrentIndex)
+        self.menu.currentRowChanged.connect(self._on_menu_row)
         self.menu.setCurrentRow(0)
         self.sidebar_open = True
 
+        # Остальные страницы готовим по одной, когда окно уже на экране:
+        # данные читаются в потоке COM, в потоке GUI создаются только виджеты
+        self._prefetch_queue = [k for k in self._page_factories if k not in self.page_refs]
+        QTimer.singleShot(PREFETCH_DELAY_MS, self._prefetch_next)
+
+    # ------------------------------------------------------------------
+    def page(self, key: str, data: dict | None = None):
+        """Возвращает страницу по ключу, создавая её при первом обращении."""
+        page = self.page_refs.get(key)
+        if page is not None:
+            return page
+        factory = self._page_factories.get(key)
+        if factory is None:
+            return None
+        idx = self.page_idx[key]
+        current = self.pages.currentIndex()
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            page = factory(data)
+        finally:
+            QApplication.restoreOverrideCursor()
+        placeholder = self.pages.widget(idx)
+        self.pages.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.pages.insertWidget(idx, page)
+        self.pages.setCurrentIndex(current)
+        self.page_refs[key] = page
+        return page
+
+    def _on_menu_row(self, idx: int):
+        if idx < 0:
+            return
+        self.page(MENU_ITEMS[idx][1])
+        self.pages.setCurrentIndex(idx)
+
+    def _prefetch_next(self):
+        while self._prefetch_queue:
+            key = self._prefetch_queue.pop(0)
+            if key not in self.page_refs:
+                prefetch_data(
+                    self._page_data.get(key, {}),
+                    lambda data, key=key: self._build_prefetched(key, data),
+                )
+                return
+
+    def _build_prefetched(self, key: str, data: dict):
+        if key not in self.page_refs:
+            self.page(key, data)
+        if self._prefetch_queue:
+            QTimer.singleShot(PREFETCH_DELAY_MS, self._prefetch_next)
+
+    def _open_wax_with_order(self, order=None):
+        wax = self.page("wax")
+        wax.refresh()
+        if order:
+            if isinstance(order, dict):
+                wax.task_form.load_order_by_number(order.get("num"), order.get("date"))
+            else:
+                wax.task_form.load_order_by_number(order)
+        self.menu.setCurrentRow(self.page_idx["wax"])
+
+    def _show_metrics(self):
+        if self.metrics_panel is None:
+            from widgets.metrics_panel import MetricsPanel
+            self.metrics_panel = MetricsPanel()
+        self.metrics_panel.show()
+        self.metrics_panel.raise_()
+
     def toggle_sidebar(self):
         self.sidebar_open = not self.sidebar_open
         self.menu.setVisible(self.sidebar_open)
@@ -136,4 +221,12 @@ if __name__ == "__main__":
 
     win = Main()
     win.show()
-    sys.exit(app.exec_())
+    # справочники открыты из локального кэша — сверяем их с базой после отрисовки
+    QTimer.singleShot(0, lambda: bridge_call("catalog_cache.revalidate_all"))
+    code = app.exec_()
+    config.COM_POOL.log_stats()
+    if config.COM_METRICS:
+        METRICS.log_summary()
+        METRICS.close()
+    config.COM_POOL.stop()
+    sys.exit(code)
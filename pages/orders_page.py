@@ -1,18 +1,18 @@
 import pywintypes
-from PyQt5.QtCore import QDate, QTimer
+from PyQt5.QtCore import QDate
 from core.com_bridge import safe_str, PRODUCTION_STATUS_MAP
 from core.catalogs import metals, hallmarks, colors
 from datetime import datetime
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QVBoxLayout, QFormLayout, QComboBox, QDateEdit,
-    QSpinBox, QDoubleSpinBox, QTableWidget, QTableWidgetItem, QPushButton,
-    QMessageBox, QHeaderView, QTabWidget, QHBoxLayout, QAbstractItemView,
-    QLineEdit
+    QPushButton, QMessageBox, QHeaderView, QTabWidget, QHBoxLayout,
+    QAbstractItemView, QLineEdit, QTableView
 )
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt, QDate
 from logic.production_docs import process_new_order
-from core.com_bridge import log
+from widgets.async_call import bridge_call, load_data
+from widgets.order_models import OrdersListModel, OrderLinesModel, OrderLinesDelegate
 import config
 from config import ORDERS_COLS
 
@@ -37,15 +37,36 @@ def parse_variant(variant: str) -> tuple[str, str, str]:
 
 class OrdersPage(QWidget):
     COLS = ORDERS_COLS
-
-    def __init__(self, on_send_to_wax=None):
+    # Размер страницы списка заказов и период отбора по умолчанию
+    PAGE_SIZE = 100
+    DEFAULT_PERIOD_MONTHS = 3
+
+    # Данные страницы из моста: имя → (метод, аргументы); main читает их
+    # заранее через bridge_call, без них — синхронно (см. async_call.load_data)
+    DATA_CALLS = {
+        "articles": ("get_article_index",),
+        "organizations": ("list_catalog_items", "Организации"),
+        "counterparties": ("list_catalog_items", "Контрагенты"),
+        "contracts": ("list_catalog_items", "ДоговорыКонтрагентов"),
+        "next_number": ("get_next_order_number",),
+    }
+
+    def __init__(self, on_send_to_wax=None, data: dict | None = None):
         super().__init__()
         self.on_send_to_wax = on_send_to_wax
-        self.articles = config.BRIDGE.get_articles()
-        self.organizations = config.BRIDGE.list_catalog_items("Организации")
-        self.counterparties = config.BRIDGE.list_catalog_items("Контрагенты")
-        self.contracts = config.BRIDGE.list_catalog_items("ДоговорыКонтрагентов")
+        data = load_data(config.BRIDGE, self.DATA_CALLS, data)
+        self.articles = data["articles"]
+        self.organizations = data["organizations"]
+        self.counterparties = data["counterparties"]
+        self.contracts = data["contracts"]
+        self._next_number = data["next_number"]
         self.production_statuses = config.BRIDGE.PRODUCTION_STATUSES
+        # курсор следующей страницы списка заказов (None — список загружен)
+        self._orders_cursor = None
+        # отбор, которым загружен список (None — ещё не загружен),
+        # и версии данных показанных заказов (для sync_orders)
+        self._orders_query = None
+        self._order_versions = {}
         self._ui()
         self._load_orders()
         self._edit_mode = False
@@ -54,6 +75,27 @@ class OrdersPage(QWidget):
         self._current_ref = None
         self._select_callback = None
 
+    @property
+    def _orders(self) -> list[dict]:
+        return self.orders_model.orders
+
+    def _collect_items(self) -> list[dict]:
+        """Строки табличной части редактора в формате create_order/update_order."""
+        items = []
+        for art, _name, variant, size, qty, weight, note in self.lines.rows():
+            card = self.articles.get(art, {})
+            items.append({
+                "Номенклатура": card.get("name", ""),
+                "АртикулГП": card.get("name", ""),
+                "ВариантИзготовления": variant,
+                "Размер": size,
+                "Количество": qty,
+                "Вес": weight,
+                "Примечание": note,
+                "ЕдиницаИзмерения": "шт"
+            })
+        return items
+
     def set_selection_callback(self, callback=None):
         """Устанавливает внешний callback для выбора заказа."""
         self._select_callback = callback
@@ -75,20 +117,7 @@ class OrdersPage(QWidget):
             "ВидСтатусПродукции": str(self.status_combo.currentText()).strip()
         }
 
-        items = []
-        for row in range(self.tbl.rowCount()):
-            art = self.tbl.cellWidget(row, 0).currentText()
-            card = self.articles.get(art, {})
-            items.append({
-                "Номенклатура": card.get("name", ""),
-                "АртикулГП": card.get("name", ""),
-                "ВариантИзготовления": self.tbl.cellWidget(row, 2).currentText(),
-                "Размер": self.tbl.cellWidget(row, 3).value(),
-                "Количество": self.tbl.cellWidget(row, 4).value(),
-                "Вес": self.tbl.cellWidget(row, 5).value(),
-                "Примечание": self.tbl.cellWidget(row, 6).text() if self.tbl.cellWidget(row, 6) else "",
-                "ЕдиницаИзмерения": "шт"
-            })
+        items = self._collect_items()
 
         success = config.BRIDGE.update_order(self._current_number, fields, items, self._current_date)
         if success:
@@ -114,7 +143,7 @@ class OrdersPage(QWidget):
         form = QFormLayout()
         self.comment_input = QLineEdit()
         form.addRow("Комментарий к заказу:", self.comment_input)
-        self.ed_num = QLabel(config.BRIDGE.get_next_order_number())
+        self.ed_num = QLabel(self._next_number)
         self.d_date = QDateEdit(datetime.now()); self.d_date.setCalendarPopup(True)
         self.c_org = QComboBox(); self.c_org.addItems([x["Description"] for x in self.organizations])
         self.c_contr = QComboBox(); self.c_contr.addItems([x["Description"] for x in self.counterparties])
@@ -130,8 +159,14 @@ class OrdersPage(QWidget):
             form.addRow(label, widget)
         v.addLayout(form)
 
-        self.tbl = QTableWidget(0, len(self.COLS))
-        self.tbl.setHorizontalHeaderLabels(self.COLS)
+        self.lines = OrderLinesModel(self.articles, config.BRIDGE.get_variants_by_article, self)
+        self.tbl = QTableView()
+        self.tbl.setModel(self.lines)
+        self.tbl.setItemDelegate(OrderLinesDelegate(self.tbl, self.articles))
+        self.tbl.setEditTriggers(
+            QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked
+            | QAbstractItemView.EditKeyPressed | QAbstractItemView.AnyKeyPressed
+        )
         QShortcut(QKeySequence("F9"), self).activated.connect(self._copy_row)
         self.tbl.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.tbl.verticalHeader().setVisible(False)
@@ -155,19 +190,40 @@ class OrdersPage(QWidget):
         v.addLayout(btns)
         self.tabs.addTab(self.frm_new, "Новый заказ")
 
-        self.tbl_orders = QTableWidget(0, 10)
-        self.tbl_orders.setHorizontalHeaderLabels([
-            "✓", "Номер", "Дата", "Вид/статус продукции", "Количество", "Вес",
-            "Организация", "Контрагент", "Договор", "Комментарий"
-        ])
+        self.orders_model = OrdersListModel(self)
+        self.tbl_orders = QTableView()
+        self.tbl_orders.setModel(self.orders_model)
         self.tbl_orders.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.tbl_orders.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.tbl_orders.cellDoubleClicked.connect(self._show_order)
+        self.tbl_orders.verticalHeader().setDefaultSectionSize(24)
+        self.tbl_orders.doubleClicked.connect(lambda idx: self._show_order(idx.row(), idx.column()))
 
         tab_orders = QWidget()
         layout = QVBoxLayout(tab_orders)
         layout.addWidget(QLabel("📋 Заказы в производстве"))
 
+        # Отбор списка выполняется запросом на стороне 1С
+        filters = QHBoxLayout()
+        self.f_date_from = QDateEdit(QDate.currentDate().addMonths(-self.DEFAULT_PERIOD_MONTHS))
+        self.f_date_to = QDateEdit(QDate.currentDate())
+        for w in (self.f_date_from, self.f_date_to):
+            w.setCalendarPopup(True)
+        self.f_contr = QLineEdit(); self.f_contr.setPlaceholderText("Контрагент")
+        self.f_contr.returnPressed.connect(self._find_orders)
+        self.f_status = QComboBox(); self.f_status.addItems(["Все виды"] + list(self.production_statuses))
+        self.f_posted = QComboBox(); self.f_posted.addItems(["Все", "Проведённые", "Непроведённые"])
+        self.f_deleted = QComboBox(); self.f_deleted.addItems(["Все", "Без пометки", "Помеченные"])
+        for label, widget in [
+            ("с", self.f_date_from), ("по", self.f_date_to), (None, self.f_contr),
+            (None, self.f_status), (None, self.f_posted), (None, self.f_deleted),
+        ]:
+            if label:
+                filters.addWidget(QLabel(label))
+            filters.addWidget(widget)
+        btn_find = QPushButton("🔍 Найти"); btn_find.clicked.connect(self._find_orders)
+        filters.addWidget(btn_find)
+        layout.addLayout(filters)
+
         buttons = QHBoxLayout()
         for label, func in [
             ("🔄 Обновить", self._load_orders),
@@ -180,92 +236,37 @@ class OrdersPage(QWidget):
             btn = QPushButton(label); btn.clicked.connect(func); buttons.addWidget(btn)
         layout.addLayout(buttons)
         layout.addWidget(self.tbl_orders)
+        self.btn_more = QPushButton("⬇ Показать ещё")
+        self.btn_more.clicked.connect(self._load_more_orders)
+        self.btn_more.setEnabled(False)
+        layout.addWidget(self.btn_more)
         self.tabs.addTab(tab_orders, "Заказы")
         
     def _print_selected_order(self):
-        selected = self.tbl_orders.currentRow()
+        selected = self.tbl_orders.currentIndex().row()
         if selected < 0:
             QMessageBox.warning(self, "Ошибка", "Выберите заказ для печати")
             return
-        number = self.tbl_orders.item(selected, 1).text().strip().replace("⚪", "")
+        number = str(self._orders[selected]["num"]).strip()
         date = self._orders[selected]["date"]
         success = config.BRIDGE.print_order_preview_pdf(number, date)
         if not success:
             QMessageBox.critical(self, "Ошибка", f"Не удалось сформировать предпросмотр для заказа №{number}")   
 
     def _add_row(self, copy_from: int = None):
-        r = self.tbl.rowCount()
-        self.tbl.insertRow(r)
-
-        art = QComboBox(); art.setEditable(True); art.addItems(self.articles.keys())
-        name = QTableWidgetItem("")
-        variant = QComboBox()
-        size = QDoubleSpinBox()
-        size.setDecimals(1)
-        # Максимальный размер увеличен до 100, чтобы поддерживать крупные кольца
-        size.setRange(0.5, 100.0)
-        size.setSingleStep(0.5)     # шаг изменения
-        size.setValue(16.0)
-        qty = QSpinBox(); qty.setRange(1, 999); qty.setValue(1)
-        wgt = QDoubleSpinBox()
-        wgt.setDecimals(config.WEIGHT_DECIMALS)
-        wgt.setMaximum(9999)
-        comment = QLineEdit()
-        self.tbl.setCellWidget(r, 6, comment)
-
-        widgets = [art, name, variant, size, qty, wgt, comment]
-        for c, w in enumerate(widgets):
-            if isinstance(w, (QComboBox, QSpinBox, QDoubleSpinBox, QLineEdit)):
-                self.tbl.setCellWidget(r, c, w)
-            else:
-                self.tbl.setItem(r, c, w)
-
-        def fill():
-            selected = art.currentText().strip()
-            card = self.articles.get(selected, {})
-            name.setText(card.get("name", ""))
-            if card.get("size"):
-                size.setValue(float(card["size"]))
-            wgt.setValue(round(card.get("w", 0) * qty.value(), config.WEIGHT_DECIMALS))
-
-            # 🟡 добавляем недостающую строку
-            article = art.currentText()
-            prev = variant.currentText()
-            variant.clear()
-            variants = config.BRIDGE.get_variants_by_article(article)
-            variant.addItems(variants)
-            if prev in variants:
-                variant.setCurrentText(prev)
-
-        art.currentTextChanged.connect(fill)
-        qty.valueChanged.connect(fill)
-
-        if copy_from is not None:
-            for i, (src, dst) in enumerate(zip(range(self.tbl.columnCount()), widgets)):
-                if isinstance(dst, QComboBox):
-                    current = self.tbl.cellWidget(copy_from, i).currentText()
-                    dst.setCurrentText(current)
-                elif isinstance(dst, QDoubleSpinBox) or isinstance(dst, QSpinBox):
-                    dst.setValue(self.tbl.cellWidget(copy_from, i).value())
-                elif isinstance(dst, QTableWidgetItem):
-                    dst.setText(self.tbl.item(copy_from, i).text())
-        else:
-            fill()
-
+        self.lines.add_row(copy_from)
 
     def _copy_last_row(self):
-        r = self.tbl.rowCount()
+        r = self.lines.rowCount()
         if r > 0:
             self._add_row(copy_from=r - 1)
 
     def _remove_row(self):
-        r = self.tbl.rowCount()
-        if r > 0:
-            self.tbl.removeRow(r - 1)
+        self.lines.remove_last()
 
     def _new_order(self):
         self.ed_num.setText(config.BRIDGE.get_next_order_number())
-        self.tbl.setRowCount(0)
+        self.lines.clear()
         self._add_row()
         # Сбрасываем дату и комментарий при создании нового заказа
         self.d_date.setDate(QDate.currentDate())
@@ -288,35 +289,20 @@ class OrdersPage(QWidget):
             "ВидСтатусПродукции": str(self.status_combo.currentText()).strip()
         }
 
-        items = []
-        for row in range(self.tbl.rowCount()):
-            art = self.tbl.cellWidget(row, 0).currentText()
-            card = self.articles.get(art, {})
-            items.append({
-                "Номенклатура": card.get("name", ""),
-                "АртикулГП": card.get("name", ""),
-                "ВариантИзготовления": self.tbl.cellWidget(row, 2).currentText(),
-                "Размер": self.tbl.cellWidget(row, 3).value(),
-                "Количество": self.tbl.cellWidget(row, 4).value(),
-                "Вес": self.tbl.cellWidget(row, 5).value(),
-                "Примечание": self.tbl.cellWidget(row, 6).text() if self.tbl.cellWidget(row, 6) else "",
-                "ЕдиницаИзмерения": "шт"
-            })
+        items = self._collect_items()
 
         # ⏩ Сначала создаём документ в 1С
         number = config.BRIDGE.create_order(fields, items)
 
         # Потом подготавливаем JSON
         order_json_rows = []
-        for row in range(self.tbl.rowCount()):
-            metal, hallmark, color = parse_variant(
-                self.tbl.cellWidget(row, 2).currentText()
-            )
+        for art, _name, variant, size, qty, weight, _note in self.lines.rows():
+            metal, hallmark, color = parse_variant(variant)
             order_json_rows.append({
-                "article": self.tbl.cellWidget(row, 0).currentText(),
-                "size": self.tbl.cellWidget(row, 3).value(),
-                "qty": self.tbl.cellWidget(row, 4).value(),
-                "weight": self.tbl.cellWidget(row, 5).value(),
+                "article": art,
+                "size": size,
+                "qty": qty,
+                "weight": weight,
                 "metal": metal,
                 "hallmark": hallmark,
                 "color": color,
@@ -337,39 +323,118 @@ class OrdersPage(QWidget):
         self._post()
         self.tabs.setCurrentIndex(1)
 
+    def _order_filters(self) -> dict:
+        """Отбор списка заказов из полей фильтра (см. list_orders_filtered)."""
+        date_from = self.f_date_from.date()
+        date_to = self.f_date_to.date()
+        flags = {"Все": None, "Проведённые": True, "Непроведённые": False,
+                 "Без пометки": False, "Помеченные": True}
+        return {
+            "date_from": datetime(date_from.year(), date_from.month(), date_from.day()),
+            "date_to": datetime(date_to.year(), date_to.month(), date_to.day(), 23, 59, 59),
+            "counterparty": self.f_contr.text().strip() or None,
+            "status": self.f_status.currentText() if self.f_status.currentIndex() > 0 else None,
+            "posted": flags[self.f_posted.currentText()],
+            "deleted": flags[self.f_deleted.currentText()],
+        }
+
     def _load_orders(self):
-        self.tbl_orders.setRowCount(0)
-        self._orders = config.BRIDGE.list_orders()
-        for o in self._orders:
-            r = self.tbl_orders.rowCount()
-            self.tbl_orders.insertRow(r)
-            chk = QTableWidgetItem(); chk.setCheckState(Qt.Unchecked)
-            self.tbl_orders.setItem(r, 0, chk)
-            status = "🟢" if o.get("posted") else ("❌" if o.get("deleted") else "⚪")
-            vals = [
-                f"{status} {o['num']}", o["date"], o.get("prod_status", ""),
-                o.get("qty", 0), f"{o.get('weight', 0):.{config.WEIGHT_DECIMALS}f}",
-                o.get("org", ""), o.get("contragent", ""), o.get("contract", ""), o.get("comment", "")
-            ]
-            for i, v in enumerate(vals):
-                self.tbl_orders.setItem(r, i + 1, QTableWidgetItem(str(v)))
+        """Обновляет список заказов в потоке COM.
+
+        Пока отбор не менялся, сверяются версии только показанных заказов
+        (и новых в том же окне дат): таблица дополняется изменёнными
+        строками без повторного запроса страниц.
+        """
+        filters = self._order_filters()
+        if filters != self._orders_query:
+            self._find_orders()
+            return
+        since = self._orders_cursor[0] if self._orders_cursor is not None else None
+        bridge_call(
+            "sync_orders", dict(self._order_versions), filters, since,
+            on_done=self._apply_orders_sync, key="orders.list",
+        )
+
+    def _find_orders(self):
+        """Запрашивает первую страницу списка по текущему отбору."""
+        filters = self._order_filters()
+        bridge_call(
+            "list_orders_filtered", filters, None, self.PAGE_SIZE,
+            on_done=lambda result: self._apply_orders_page(result, filters),
+            key="orders.list",
+        )
+
+    def _load_more_orders(self):
+        if self._orders_cursor is None:
+            return
+        bridge_call(
+            "list_orders_filtered", self._orders_query, self._orders_cursor, self.PAGE_SIZE,
+            on_done=self._apply_orders_page, key="orders.list",
+        )
+
+    def _apply_orders_page(self, result: dict, filters: dict | None = None):
+        """Страница списка; ``filters`` — первая страница нового отбора."""
+        if filters is not None:
+            self._orders_query = filters
+            self._order_versions = {}
+            self.orders_model.set_orders(
+                [row for _, row in result["rows"]],
+                [key for key, _ in result["rows"]],
+            )
+        else:
+            for key, o in result["rows"]:
+                self.orders_model.upsert(key, o)
+        self._order_versions.update(result["versions"])
+        self._orders_cursor = result["next"]
+        self.btn_more.setEnabled(self._orders_cursor is not None)
+
+    def _apply_orders_sync(self, result: dict):
+        for key in result["removed"]:
+            self.orders_model.remove(key)
+        for key, o in result["changed"]:
+            self.orders_model.upsert(key, o, self._order_position(o))
+        self._order_versions = result["versions"]
+
+    def _order_position(self, order: dict) -> int:
+        """Место нового заказа в списке (новые первыми, как в list_orders_filtered)."""
+        key = (order["date"], order["num"])
+        for i, other in enumerate(self._orders):
+            if (other["date"], other["num"]) < key:
+                return i
+        return len(self._orders)
+
+    def _with_order_rows(self, order: dict, on_rows) -> None:
+        """Передаёт строки заказа в ``on_rows``; из 1С они читаются
+        в потоке COM при первом обращении."""
+        if "rows" in order:
+            on_rows(order["rows"])
+            return
+
+        def done(rows):
+            order["rows"] = rows
+            on_rows(rows)
+
+        bridge_call("get_order_rows", order["Ref"], on_done=done)
 
     def _mass_post(self):
-        for i, o in enumerate(self._orders):
-            if self.tbl_orders.item(i, 0).checkState() == Qt.Checked:
-                config.BRIDGE.post_order(o["num"], o["date"])
+        for i in self.orders_model.checked_rows():
+            o = self._orders[i]
+            config.BRIDGE.post_order(o["num"], o["date"])
         self._load_orders()
 
     def _send_to_wax(self):
-        row = self.tbl_orders.currentRow()
+        row = self.tbl_orders.currentIndex().row()
         if row < 0:
             QMessageBox.warning(self, "Ошибка", "Выберите заказ")
             return
         order = self._orders[row]
+        self._with_order_rows(order, lambda rows: self._send_rows_to_wax(order, rows))
+
+    def _send_rows_to_wax(self, order: dict, rows: list[dict]):
         number = order["num"]
 
         order_json_rows = []
-        for r in order.get("rows", []):
+        for r in rows:
             metal, hallmark, color = parse_variant(r.get("variant", ""))
             order_json_rows.append({
                 "article": r.get("nomenclature", ""),
@@ -391,21 +456,19 @@ class OrdersPage(QWidget):
             self.on_send_to_wax(order)
 
     def _delete_selected_order(self):
-        selected = [i for i in range(self.tbl_orders.rowCount())
-                    if self.tbl_orders.item(i, 0).checkState() == Qt.Checked]
+        selected = self.orders_model.checked_rows()
         for i in selected:
             config.BRIDGE.delete_order_by_number(self._orders[i]["num"], self._orders[i]["date"])
         self._load_orders()
 
     def _mark_deleted(self, mark=True):
-        for i in range(self.tbl_orders.rowCount()):
-            if self.tbl_orders.item(i, 0).checkState() == Qt.Checked:
-                number = self._orders[i]["num"]
-                date = self._orders[i]["date"]
-                if mark:
-                    config.BRIDGE.mark_order_for_deletion(number, date)
-                else:
-                    config.BRIDGE.unmark_order_deletion(number, date)
+        for i in self.orders_model.checked_rows():
+            number = self._orders[i]["num"]
+            date = self._orders[i]["date"]
+            if mark:
+                config.BRIDGE.mark_order_for_deletion(number, date)
+            else:
+                config.BRIDGE.unmark_order_deletion(number, date)
 
         self._load_orders()
 
@@ -446,23 +509,19 @@ class OrdersPage(QWidget):
                 self.status_combo.setCurrentText(internal)
                 break
 
-        # Табличная часть
-        self.tbl.setRowCount(0)
-        for r in o.get("rows", []):
-            self._add_row()
-            row_index = self.tbl.rowCount() - 1
-
-            # Найти артикул по наименованию
+        # Табличная часть приходит из потока COM; до этого заказ не редактируется
+        self._edit_mode = False
+        self.btn_update.setVisible(False)
+        self.lines.set_rows([])
+        self._with_order_rows(o, lambda rows: self._fill_order_lines(o, rows))
+
+    def _fill_order_lines(self, o: dict, rows: list[dict]):
+        """Табличная часть открытого заказа — одним обновлением модели."""
+        if self._current_ref is not o.get("Ref"):
+            return  # пока читались строки, открыт другой заказ
+        lines = []
+        for r in rows:
             name = r["nomenclature"]
-            article = next((art for art, card in self.articles.items() if card["name"] == name), None)
-            if article:
-                self.tbl.cellWidget(row_index, 0).setCurrentText(article)
-
-                # Установить вариант изготовления чуть позже, когда заполнится список
-                def set_variant(row=row_index, val=r.get("variant", "—")):
-                    self.tbl.cellWidget(row, 2).setCurrentText(val)
-
-                QTimer.singleShot(0, set_variant)
 
             # Размер
             size_val = r.get("size", 0)
@@ -470,18 +529,18 @@ class OrdersPage(QWidget):
                 size_float = float(str(safe_str(size_val)).replace(",", "."))
             except Exception:
                 size_float = 0.0
-            self.tbl.cellWidget(row_index, 3).setValue(size_float)
-
-            # Кол-во, вес, примечание
-            self.tbl.cellWidget(row_index, 4).setValue(int(r.get("qty", 1)))
-            self.tbl.cellWidget(row_index, 5).setValue(float(r.get("w", 0)))
-            self.tbl.cellWidget(row_index, 6).setText(r.get("note", ""))
-            self._edit_mode = True
-            self._current_number = o["num"]
-            self.btn_update.setVisible(True)  # ← покажем кнопку "Обновить"
+
+            lines.append([
+                self.lines.article_for(name), name, r.get("variant", "—"), size_float,
+                int(r.get("qty", 1)), float(r.get("w", 0)), r.get("note", ""),
+            ])
+        self.lines.set_rows(lines)
+        self._edit_mode = True
+        self._current_number = o["num"]
+        self.btn_update.setVisible(True)  # ← покажем кнопку "Обновить"
         
     def _copy_row(self):
-        row = self.tbl.currentRow()
+        row = self.tbl.currentIndex().row()
         if row < 0:
             QMessageBox.warning(self, "Нет строки", "Выберите строку для копирования.")
             return
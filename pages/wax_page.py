@@ -1,9 +1,10 @@
 # wax_page.py • v0.8
 # ─────────────────────────────────────────────────────────────────────────
 from collections import defaultdict
+from datetime import datetime, timedelta
 import re
 from PyQt5.QtCore    import Qt
-from PyQt5.QtGui     import QFont
+from PyQt5.QtGui     import QFont, QBrush, QColor
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem,
     QHeaderView, QPushButton, QMessageBox, QTabWidget, QInputDialog,
@@ -14,25 +15,41 @@ from logic.production_docs import (
     ORDERS_POOL,
     METHOD_LABEL,
     process_new_order,
+    clear_orders,
 )
 from pages.orders_page import parse_variant
-from core.com_bridge import log
+from core.logger import get_logger
+from widgets.async_call import bridge_call, load_data
 import config
 from config import CSS_TREE
 from widgets.production_task_form import ProductionTaskEditForm
 
+_log = get_logger(__name__)
+
 class WaxPage(QWidget):
-    def __init__(self):
+    # Данные страницы из моста: имя → (метод, аргументы); main читает их
+    # заранее через bridge_call, без них — синхронно (см. async_call.load_data)
+    DATA_CALLS = {
+        "warehouses": ("list_catalog_items", "Склады"),
+        "norm_types": ("list_enum_values", "ВидыНормативовНоменклатуры"),
+        **ProductionTaskEditForm.DATA_CALLS,
+    }
+
+    def __init__(self, data: dict | None = None):
         super().__init__()
         self.last_created_task_ref = None
         self.jobs_page = None
         self.close_job_refs = []
         self._task_select_callback = None
-        self.warehouses = config.BRIDGE.list_catalog_items("Склады")
-        self.norm_types = (
-            config.BRIDGE.list_enum_values("ВидыНормативовНоменклатуры")
-            or ["Номенклатура", "Комплектующее"]
-        )
+        # строки деревьев по ключу документа и версии данных (инкрементальное обновление)
+        self._task_items = {}
+        self._task_versions = {}
+        self._job_items = {}
+        self._job_versions = {}
+        data = load_data(config.BRIDGE, self.DATA_CALLS, data)
+        self.warehouses = data["warehouses"]
+        self.norm_types = data["norm_types"] or ["Номенклатура", "Комплектующее"]
+        self._data = data
         self._ui()
         self.refresh()
 
@@ -94,7 +111,7 @@ class WaxPage(QWidget):
 
         # --- sub-tab: создание задания ---
         tab_task_new = QWidget(); t_new = QVBoxLayout(tab_task_new)
-        self.task_form = ProductionTaskEditForm(config.BRIDGE)
+        self.task_form = ProductionTaskEditForm(config.BRIDGE, self._data)
         self.task_form.task_saved.connect(
             lambda ref: setattr(self, "last_created_task_ref", config.BRIDGE.get_object_from_ref(ref) if ref else None)
         )
@@ -500,11 +517,11 @@ class WaxPage(QWidget):
                 jobs = [item.text(0).strip()]
         if not jobs:
 
-            log("[UI] ❌ Не выбраны наряды для отправки в сборку")
+            _log.error("[UI] Не выбраны наряды для отправки в сборку")
             QMessageBox.warning(self, "Ошибка", "Выберите наряды")
             return
 
-        log(f"[UI] Отправка нарядов в сборку: {', '.join(jobs)}")
+        _log.info("[UI] Отправка нарядов в сборку: %s", ', '.join(jobs))
 
         added = False
         for num in jobs:
@@ -516,7 +533,7 @@ class WaxPage(QWidget):
                     break
             if item_obj and item_obj.text(2).strip() != "✅":
 
-                log(f"[UI] Наряд {num} не закрыт")
+                _log.info("[UI] Наряд %s не закрыт", num)
 
                 QMessageBox.warning(self, "Ошибка", f"Наряд {num} не закрыт")
                 continue
@@ -524,7 +541,7 @@ class WaxPage(QWidget):
             added = True
         if not added:
 
-            log("[UI] ❌ Не удалось добавить наряды в сборку")
+            _log.error("[UI] Не удалось добавить наряды в сборку")
 
             return
         if hasattr(self, "tabs_jobs"):
@@ -548,17 +565,19 @@ class WaxPage(QWidget):
 
     def populate_jobs_tree(self, doc_num: str):
         self.tree_jobs.clear()
+        self._job_items.clear()
+        self._job_versions = {}
         self.tree_part.clear()
 
         try:
             # Попытка как наряд
             rows = config.BRIDGE.get_wax_job_rows(doc_num)
             if rows:
-                log(f"[populate_jobs_tree] Найдены строки наряда №{doc_num}: {len(rows)}")
+                _log.info("[populate_jobs_tree] Найдены строки наряда №%s: %s", doc_num, len(rows))
                 self.refresh()
                 return
         except Exception as e:
-            log(f"[populate_jobs_tree] Не удалось как наряд: {e}")
+            _log.info("[populate_jobs_tree] Не удалось как наряд: %s", e)
 
         try:
             # Попытка как задание на производство
@@ -567,7 +586,7 @@ class WaxPage(QWidget):
                 base_ref = getattr(task, "ДокументОснование")
                 base_obj = config.BRIDGE.get_object_from_ref(base_ref)
                 order_num = base_obj.Номер
-                log(f"[populate_jobs_tree] Задание связано с заказом №{order_num}")
+                _log.info("[populate_jobs_tree] Задание связано с заказом №%s", order_num)
 
                 # Загружаем строки заказа и формируем данные как для нового заказа
                 order_lines = config.BRIDGE.get_order_lines(order_num)
@@ -587,18 +606,18 @@ class WaxPage(QWidget):
                     )
 
                 # Перезаписываем ORDERS_POOL и используем существующую обработку
-                ORDERS_POOL.clear()
+                clear_orders()
                 process_new_order({"number": order_num, "rows": order_json_rows})
-                log(
-                    f"[ORDERS_POOL] Добавлены строки и партии для заказа №{order_num}"
+                _log.info(
+                    "[ORDERS_POOL] Добавлены строки и партии для заказа №%s", order_num
                 )
 
                 # Перерисовываем
                 self.refresh()
             else:
-                log("[populate_jobs_tree] Не найден документ основания")
+                _log.info("[populate_jobs_tree] Не найден документ основания")
         except Exception as ee:
-            log(f"[populate_jobs_tree] Ошибка при получении заказа из задания: {ee}")
+            _log.error("[populate_jobs_tree] Ошибка при получении заказа из задания: %s", ee)
 
     def _on_task_double_click(self, item, column):
         num = item.text(1).strip() if item.columnCount() > 1 else item.text(0).strip()
@@ -624,11 +643,11 @@ class WaxPage(QWidget):
             if hasattr(self, "tabs_tasks"):
                 self.tabs_tasks.setCurrentIndex(0)
                 self.task_form.load_task_object(task_obj)
-        log(f"[UI] Выбрано задание №{num}.")
+        _log.info("[UI] Выбрано задание №%s.", num)
 
     def load_task_data(self, task_obj):
         if not task_obj:
-            log("[UI] ❌ Нет задания для отображения.")
+            _log.error("[UI] Нет задания для отображения.")
             return
 
         self.last_created_task_ref = task_obj
@@ -651,11 +670,11 @@ class WaxPage(QWidget):
             self.lbl_task_info.setText(f"Задание №{task_obj.Номер} от {d}")
 
 
-        log(f"[UI] ✅ Загружены данные задания №{task_obj.Номер}")
+        _log.info("[UI] ✅ Загружены данные задания №%s", task_obj.Номер)
 
     def load_close_task_data(self, task_obj):
         if not task_obj:
-            log("[UI] ❌ Нет задания для закрытия.")
+            _log.error("[UI] Нет задания для закрытия.")
             return
 
         self.last_created_task_ref = task_obj
@@ -672,7 +691,7 @@ class WaxPage(QWidget):
         """Заполняет таблицу нарядов строками выбранного задания."""
         lines = config.BRIDGE.get_task_lines(getattr(task_obj, "Номер", ""))
         if not hasattr(self, "tbl_3d") or not hasattr(self, "tbl_form"):
-            log("[UI] Таблицы для строк задания не инициализированы")
+            _log.info("[UI] Таблицы для строк задания не инициализированы")
             return
 
         self.tbl_3d.setRowCount(0)
@@ -699,7 +718,7 @@ class WaxPage(QWidget):
 
         self.tbl_3d.resizeColumnsToContents()
         self.tbl_form.resizeColumnsToContents()
-        log(f"[UI] Загрузка строк задания: {len(lines)}")
+        _log.info("[UI] Загрузка строк задания: %s", len(lines))
 
     def _fill_close_tables_from_task(self, task_obj):
         """Заполняет таблицы закрытия строками нарядов по заданию."""
@@ -784,32 +803,71 @@ class WaxPage(QWidget):
         dlg.resize(700, 400)
         dlg.exec_()
 
+    @staticmethod
+    def _list_since():
+        """Начало окна дат деревьев заданий и нарядов (None — без окна)."""
+        if config.WAX_LIST_DAYS <= 0:
+            return None
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        return today - timedelta(days=config.WAX_LIST_DAYS)
+
     def _fill_tasks_tree(self):
-        self.tree_tasks.clear()
-        for t in config.BRIDGE.list_tasks():
-            status = ""
-            if t.get("posted"):
-                status = "✅"
-            elif t.get("deleted"):
-                status = "🗑"
-            item = QTreeWidgetItem([
-                status,
-                t.get("num", ""),
-                t.get("date", ""),
-                t.get("section", ""),
-                t.get("tech_op", ""),
-                t.get("employee", "")
-            ])
-            item.setCheckState(0, Qt.Unchecked)
-            from PyQt5.QtGui import QBrush, QColor
+        bridge_call(
+            "sync_tasks", dict(self._task_versions), self._list_since(),
+            on_done=self._apply_tasks_sync, key="wax.tasks",
+        )
 
-            if t.get("deleted"):
-                for i in range(item.columnCount()):
-                    item.setBackground(i, QBrush(QColor("#f87171")))  # красный
-            elif t.get("posted"):
-                for i in range(item.columnCount()):
-                    item.setBackground(i, QBrush(QColor("#bbf7d0")))  # зелёный
-            self.tree_tasks.addTopLevelItem(item)
+    def _apply_tasks_sync(self, result: dict):
+        self._apply_tree_sync(self.tree_tasks, self._task_items, result, self._set_task_item)
+        self._task_versions = result["versions"]
+
+    def _set_task_item(self, item: QTreeWidgetItem, t: dict):
+        status = ""
+        if t.get("posted"):
+            status = "✅"
+        elif t.get("deleted"):
+            status = "🗑"
+        values = [
+            status,
+            t.get("num", ""),
+            t.get("date", ""),
+            t.get("section", ""),
+            t.get("tech_op", ""),
+            t.get("employee", "")
+        ]
+        for i, v in enumerate(values):
+            item.setText(i, v)
+        self._paint_item(item, t.get("deleted"), t.get("posted"))
+
+    @staticmethod
+    def _paint_item(item: QTreeWidgetItem, deleted, posted):
+        if deleted:
+            brush = QBrush(QColor("#f87171"))  # красный
+        elif posted:
+            brush = QBrush(QColor("#bbf7d0"))  # зелёный
+        else:
+            brush = QBrush()
+        for i in range(item.columnCount()):
+            item.setBackground(i, brush)
+
+    @staticmethod
+    def _apply_tree_sync(tree: QTreeWidget, items: dict, result: dict, fill):
+        """Применяет результат sync_* к дереву: правит только изменённые строки."""
+        if result["full"]:
+            tree.clear()
+            items.clear()
+        for key in result["removed"]:
+            item = items.pop(key, None)
+            if item is not None:
+                tree.takeTopLevelItem(tree.indexOfTopLevelItem(item))
+        for key, row in result["changed"]:
+            item = items.get(key)
+            if item is None:
+                item = QTreeWidgetItem()
+                item.setCheckState(0, Qt.Unchecked)
+                tree.addTopLevelItem(item)
+                items[key] = item
+            fill(item, row)
 
     def _fill_wax_jobs_tree(self):
         if not hasattr(self, "tree_acts"):
@@ -889,7 +947,7 @@ class WaxPage(QWidget):
         warehouse = self.combo_warehouse.currentText().strip()
         norm_type = self.combo_norm_type.currentText().strip()
         try:
-            count = config.BRIDGE.create_wax_jobs_from_task(
+            count = config.BRIDGE.create_wax_jobs_from_task_number(
                 task_num,
                 self.combo_3d_master.currentText().strip(),
                 self.combo_form_master.currentText().strip(),
@@ -906,32 +964,32 @@ class WaxPage(QWidget):
     def _fill_jobs_tree(self):
         if not hasattr(self, "tree_jobs"):
             return
-        self.tree_jobs.clear()
+        bridge_call(
+            "sync_wax_jobs", dict(self._job_versions), self._list_since(),
+            on_done=self._apply_jobs_sync, key="wax.jobs",
+        )
 
-        jobs = config.BRIDGE.list_wax_jobs()
-        for job in jobs:
-            item = QTreeWidgetItem([
-                job["Номер"],
-                job["Дата"],
-                job["Закрыт"],
-                job["Сотрудник"],
-                job["ТехОперация"],
-                job["Комментарий"],
-                job["Склад"],
-                job["ПроизводственныйУчасток"],
-                job["Организация"],
-                job["Задание"],
-                job["Ответственный"],
-            ])
-            item.setCheckState(0, Qt.Unchecked)
-            from PyQt5.QtGui import QBrush, QColor
-            if job.get("ПометкаУдаления"):
-                for i in range(item.columnCount()):
-                    item.setBackground(i, QBrush(QColor("#f87171")))
-            elif job.get("Проведен"):
-                for i in range(item.columnCount()):
-                    item.setBackground(i, QBrush(QColor("#bbf7d0")))
-            self.tree_jobs.addTopLevelItem(item)
+    def _apply_jobs_sync(self, result: dict):
+        self._apply_tree_sync(self.tree_jobs, self._job_items, result, self._set_job_item)
+        self._job_versions = result["versions"]
+
+    def _set_job_item(self, item: QTreeWidgetItem, job: dict):
+        values = [
+            job["Номер"],
+            job["Дата"],
+            job["Закрыт"],
+            job["Сотрудник"],
+            job["ТехОперация"],
+            job["Комментарий"],
+            job["Склад"],
+            job["ПроизводственныйУчасток"],
+            job["Организация"],
+            job["Задание"],
+            job["Ответственный"],
+        ]
+        for i, v in enumerate(values):
+            item.setText(i, v)
+        self._paint_item(item, job.get("ПометкаУдаления"), job.get("Проведен"))
 
     # —──────────── дерево «Партии» ─────────────
     def _fill_parties_tree(self):
@@ -977,39 +1035,32 @@ class WaxPage(QWidget):
             QMessageBox.warning(self, "Ошибка", "Нет выбранных нарядов")
             return
 
-        result = config.BRIDGE.close_wax_jobs(job_refs)
-        if result:
-            QMessageBox.information(self, "Успех", "Закрыты наряды: " + ", ".join(result))
+        results = config.BRIDGE.close_wax_jobs_batch(job_refs)
+        if results and all(r["ok"] for r in results):
+            QMessageBox.information(
+                self, "Успех", "Закрыты наряды: " + ", ".join(r["number"] for r in results)
+            )
             self.refresh()
         else:
-            QMessageBox.critical(self, "Ошибка", "Не удалось закрыть наряды")
+            details = "\n".join(f"{r['number']}: {r['error']}" for r in results if r["error"])
+            QMessageBox.critical(self, "Ошибка", "Не удалось закрыть наряды\n" + details)
 
     # ------------------------------------------------------------------
     def _add_job_to_assembly(self, job_num: str):
         """Добавляет наряд в очередь сборки ёлок."""
         from logic.state import ASSEMBLY_POOL
 
-        added = False
-        for pack in ORDERS_POOL:
-            for j in pack["docs"].get("wax_jobs", []):
-                if j.get("wax_job") == job_num and j not in ASSEMBLY_POOL:
-                    ASSEMBLY_POOL.append(j.copy())
-                    log(f"[UI] Добавлен наряд {job_num} в очередь сборки")
-                    added = True
-                    break
+        # у наряда может быть несколько строк (разные металлы/пробы/цвета)
+        rows = WAX_JOBS_POOL.find_all("job", job_num)
+        if not rows:
+            _log.error("[UI] Наряд %s не найден для добавления в сборку", job_num)
+        else:
+            added = [j.copy() for j in rows if j not in ASSEMBLY_POOL]
+            ASSEMBLY_POOL.extend(added)
             if added:
-                break
-
-        if not added:
-            for j in WAX_JOBS_POOL:
-                if j.get("wax_job") == job_num and j not in ASSEMBLY_POOL:
-                    ASSEMBLY_POOL.append(j.copy())
-                    log(f"[UI] Добавлен наряд {job_num} в очередь сборки (поиск в WAX_JOBS_POOL)")
-                    added = True
-                    break
-
-        if not added:
-            log(f"[UI] ❌ Наряд {job_num} не найден для добавления в сборку")
+                _log.info("[UI] Добавлен наряд %s в очередь сборки: строк %s", job_num, len(added))
+            else:
+                _log.info("[UI] Наряд %s уже в очереди сборки", job_num)
 
         self._fill_assembly_tree()
 
@@ -1033,7 +1084,7 @@ class WaxPage(QWidget):
                  f"{data['weight']:.{config.WEIGHT_DECIMALS}f}"]
             )
             root.setExpanded(True)
-            for j in [x for x in ASSEMBLY_POOL if (x.get("metal"), x.get("hallmark"), x.get("color")) == (metal, hallmark, color)]:
+            for j in ASSEMBLY_POOL.find_all("alloy", (metal, hallmark, color)):
                 QTreeWidgetItem(root, [j["wax_job"], str(j.get("qty", 0)), f"{j.get('weight', 0):.{config.WEIGHT_DECIMALS}f}"])
 
     def _clear_assembly_pool(self):
@@ -1058,7 +1109,7 @@ class WaxPage(QWidget):
         self._fill_assembly_tree()
 
         count = len(trees)
-        log(f"[UI] Сформировано {count} ёлок")
+        _log.info("[UI] Сформировано %s ёлок", count)
         if count:
             tree_codes = ", ".join(t["tree_code"] for t in trees)
             QMessageBox.information(
@@ -0,0 +1,29 @@
+# conftest.py • общие настройки тестов
+# -*- coding: utf-8 -*-
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import logger  # noqa: E402
+
+# журнал тестов — только в консоль, gui1c.log не трогаем
+logger.setup(file=None)
+
+
+@pytest.fixture(scope="session")
+def bridge(tmp_path_factory):
+    """Мост на имитации 1С (bench/fake_1c); COM подменяется один раз на сеанс."""
+    from bench import fake_1c
+
+    fake_1c.install(fake_1c.seed(orders=4, lines=2, articles=5, counterparties=2))
+    import config  # noqa: F401  (config и core.com_bridge импортируют друг друга)
+    from core import catalog_cache
+    from core.com_bridge import COM1CBridge
+
+    catalog_cache.CACHE_DIR = tmp_path_factory.mktemp("cache")
+    bridge = COM1CBridge("test")
+    yield bridge
+    bridge.catalog_cache.close()
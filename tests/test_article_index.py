@@ -0,0 +1,62 @@
+# test_article_index.py • индекс артикулов для автодополнения
+# -*- coding: utf-8 -*-
+import random
+import time
+
+from core.article_index import ArticleIndex
+
+SIZE = 50_000
+
+
+def _rows(articles):
+    return [
+        {"uuid": f"uuid-{i}", "Description": f"Изделие {a}", "attrs": {"Артикул": a}}
+        for i, a in enumerate(articles)
+    ]
+
+
+def _synthetic():
+    rnd = random.Random(14)
+    prefixes = ["КЦ", "СР", "ПД", "Кл", "цп", "БР", "ser"]
+    return [f"{rnd.choice(prefixes)}-{rnd.randrange(10**6):06d}" for _ in range(SIZE)]
+
+
+def _expected(articles, text, limit):
+    key = text.casefold()
+    ordered = sorted(set(articles), key=str.casefold)
+    prefixed = [a for a in ordered if a.casefold().startswith(key)]
+    containing = [a for a in ordered if key in a.casefold() and a not in prefixed]
+    return (prefixed + containing)[:limit]
+
+
+def test_complete_matches_full_scan_on_large_catalog():
+    articles = _synthetic()
+    index = ArticleIndex(_rows(articles))
+    for text in ["кц-1", "СР", "123", "-00", "45678", "r-9", "ЯЯЯ", "Кл-999999"]:
+        assert index.complete(text, limit=50) == _expected(articles, text, 50), text
+
+
+def test_lookup_does_not_scan_the_catalog():
+    index = ArticleIndex(_rows(_synthetic()))
+    started = time.perf_counter()
+    for _ in range(100):
+        index.complete("кц-12")
+        index.complete("4567")
+    # полный перебор 50 000 строк на каждый запрос занял бы секунды
+    assert time.perf_counter() - started < 0.5
+
+
+def test_index_is_a_mapping_of_cards():
+    index = ArticleIndex(_rows(["A-1", "B-2"]))
+    assert list(index) == ["A-1", "B-2"]
+    assert index["B-2"]["ref"] == "uuid-1"
+    assert index["B-2"]["name"] == "Изделие B-2"
+
+
+def test_article_for_name_or_uuid_first_wins():
+    rows = _rows(["A-1", "B-2"])
+    rows[1]["Description"] = rows[0]["Description"]
+    index = ArticleIndex(rows)
+    assert index.article_for("Изделие A-1") == "A-1"
+    assert index.article_for("uuid-1") == "B-2"
+    assert index.article_for("нет такого") == ""
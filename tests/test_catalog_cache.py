@@ -0,0 +1,92 @@
+# test_catalog_cache.py • кэш справочников и маршрутизация его сверки
+# -*- coding: utf-8 -*-
+
+
+def test_revalidate_all_goes_to_writer(bridge):
+    from core.com_pool import is_read
+
+    assert not is_read("catalog_cache.revalidate_all")
+
+
+def test_revalidate_all_covers_catalogs_on_disk(bridge):
+    from core.catalog_cache import CatalogCache
+
+    bridge.catalog_cache.items("Размеры")
+    fresh = CatalogCache(bridge, bridge.catalog_cache.path)
+    try:
+        fresh.revalidate_all()
+        assert "Размеры" in fresh._validated
+        assert fresh.find_uuid("Размеры", "17.0")
+    finally:
+        fresh.close()
+
+
+def test_list_catalog_items_keeps_selection_order(bridge):
+    catalog = "ВариантыИзготовленияНоменклатуры"
+    selection = bridge.catalogs.ВариантыИзготовленияНоменклатуры.Select()
+    names = []
+    while selection.Next():
+        names.append(selection.GetObject().Description)
+    items = bridge.list_catalog_items(catalog, limit=len(names))
+    assert [item["Description"] for item in items] == names
+    assert {"Ref", "Code", "Description", "uuid"} <= set(items[0])
+    assert isinstance(items[0]["Ref"], str)
+
+
+def test_articles_keep_variant_key(bridge):
+    card = next(iter(bridge.get_articles().values()))
+    assert set(card) >= {"name", "variant", "size", "w"}
+
+
+def test_column_keys_match_row_uuids(bridge):
+    from core.catalog_cache import _column_keys
+
+    query = bridge.connection.NewObject("Запрос")
+    query.Text = "ВЫБРАТЬ Т.Ссылка КАК Ссылка, Т.ВерсияДанных КАК ВерсияДанных ИЗ Справочник.Размеры КАК Т"
+    table = query.Execute().Unload()
+    expected = [
+        (str(bridge.connection.String(line.Ссылка.UUID())), str(line.ВерсияДанных))
+        for line in table
+    ]
+    assert _column_keys(bridge.connection, table) == expected
+
+
+def test_revalidate_reads_only_changed_rows(bridge, monkeypatch):
+    from bench import fake_1c
+    from core.catalog_cache import CatalogCache
+
+    bridge.catalog_cache.items("Размеры")
+    fresh = CatalogCache(bridge, bridge.catalog_cache.path)
+    try:
+        fresh.peek("Размеры")
+        fake_1c.STATS.reset()
+        assert fresh.revalidate("Размеры")
+        assert fake_1c.STATS.names["Get"] == 0
+        assert fake_1c.STATS.total < 20
+    finally:
+        fresh.close()
+
+
+def test_duplicate_description_last_wins(bridge):
+    from bench import fake_1c
+
+    db = fake_1c._DATABASE
+    db.add_item("Пробы", "Дубль")
+    last = db.add_item("Пробы", "Дубль")
+    bridge.catalog_cache.revalidate("Пробы")
+    assert bridge.catalog_cache.find_uuid("Пробы", "Дубль") == last._uuid
+
+
+def test_article_index_is_rebuilt_on_revalidate(bridge):
+    from bench import fake_1c
+
+    cache = bridge.catalog_cache
+    before = cache.article_index()
+    assert cache.article_index() is before
+    ref = fake_1c._DATABASE.add_item("Номенклатура", "Серьги СР-НОВЫЙ", Артикул="СР-НОВЫЙ")
+    cache.revalidate("Номенклатура")
+    index = cache.article_index()
+    assert index is not before
+    assert index.article_for("Серьги СР-НОВЫЙ") == "СР-НОВЫЙ"
+    assert index.article_for(ref._uuid) == "СР-НОВЫЙ"
+    assert "СР-НОВЫЙ" in index.complete("ср-нов")
@@ -0,0 +1,30 @@
+# test_com_metrics.py • выгрузка метрик COM в JSONL
+# -*- coding: utf-8 -*-
+import json
+import threading
+
+from core.com_metrics import ComMetrics
+
+
+def test_export_is_written_by_metrics_thread(tmp_path, monkeypatch):
+    path = tmp_path / "metrics.jsonl"
+    metrics = ComMetrics()
+    metrics.enable(path)
+    writers = set()
+    original = json.dumps
+
+    def dumps(*args, **kwargs):
+        writers.add(threading.current_thread().name)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(json, "dumps", dumps)
+    for _ in range(3):
+        with metrics.operation("COM1CBridge.list_orders"):
+            metrics.hit("calls")
+    metrics.close()
+
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [r["op"] for r in records] == ["COM1CBridge.list_orders"] * 3
+    assert records[0]["calls"] == 1
+    assert records[0]["thread"] == threading.current_thread().name
+    assert writers == {"com-metrics"}
@@ -0,0 +1,38 @@
+# test_com_pool.py • маршрутизация вызовов пула COM на имитации 1С
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import pytest
+
+CODE_BY_REF = "ВЫБРАТЬ Т.Код КАК Код ИЗ Справочник.Размеры КАК Т ГДЕ Т.Ссылка = &Ссылка"
+
+
+@pytest.fixture
+def pool(bridge):
+    from core.com_bridge import COM1CBridge
+    from core.com_pool import ComPool
+
+    pool = ComPool(lambda: COM1CBridge("test"), size=2)
+    pool.wait_ready()
+    yield pool
+    pool.stop()
+
+
+def test_write_call_with_reader_ref_returns_while_reader_is_busy(pool):
+    # bridge_call в потоке GUI сводится к pool.call: он не должен ждать читателя
+    reader = pool.readers[0]
+    ref = pool.call("get_ref", "Размеры", "17.0").result()
+    assert ref._worker is reader
+    release = threading.Event()
+    reader.submit(release.wait)
+
+    started = time.perf_counter()
+    future = pool.call("query_select", CODE_BY_REF, Ссылка=ref)
+    assert time.perf_counter() - started < 0.5
+    assert not future.done()
+
+    release.set()
+    selection = future.result(timeout=5)
+    assert selection._worker is pool.writer
+    assert selection.Next()
@@ -0,0 +1,41 @@
+# test_com_worker.py • передача ссылок между потоками COM на имитации 1С
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import pytest
+
+# запрос, которому ссылка из другого подключения передаётся параметром
+CODE_BY_REF = "ВЫБРАТЬ Т.Код КАК Код ИЗ Справочник.Размеры КАК Т ГДЕ Т.Ссылка = &Ссылка"
+
+
+@pytest.fixture
+def workers(bridge):
+    from core.com_bridge import COM1CBridge
+    from core.com_worker import ComWorker
+
+    owner = ComWorker(lambda: COM1CBridge("test"), name="owner")
+    target = ComWorker(lambda: COM1CBridge("test"), name="target")
+    owner.wait_ready()
+    target.wait_ready()
+    yield owner, target
+    owner.stop()
+    target.stop()
+
+
+def test_call_with_foreign_ref_does_not_wait_for_owner(workers):
+    owner, target = workers
+    ref = owner.call("get_ref", "Размеры", "17.0").result()
+    expected = owner.run_sync(lambda: ref._obj.Код)
+    release = threading.Event()
+    owner.submit(release.wait)
+
+    started = time.perf_counter()
+    future = target.call("query_select", CODE_BY_REF, Ссылка=ref)
+    assert time.perf_counter() - started < 0.5
+    assert not future.done()
+
+    release.set()
+    selection = future.result(timeout=5)
+    assert selection.Next()
+    assert selection.Код == expected
@@ -0,0 +1,36 @@
+# test_doc_index.py • индекс документов по номеру на имитации 1С
+# -*- coding: utf-8 -*-
+from core.doc_index import DocumentIndex
+
+
+def _counting(bridge, monkeypatch):
+    calls = []
+    query_select = bridge.query_select
+
+    def counted(text, **params):
+        calls.append(params)
+        return query_select(text, **params)
+
+    monkeypatch.setattr(bridge, "query_select", counted)
+    return calls
+
+
+def test_missing_number_is_queried_once(bridge, monkeypatch):
+    index = DocumentIndex(bridge)
+    calls = _counting(bridge, monkeypatch)
+
+    assert index.find_ref("ЗаказВПроизводство", "НЕТ-000001") is None
+    assert index.find_ref("ЗаказВПроизводство", "НЕТ-000001") is None
+    assert len(calls) == 1
+
+
+def test_register_clears_remembered_miss(bridge, monkeypatch):
+    index = DocumentIndex(bridge)
+    selection = bridge.documents.ЗаказВПроизводство.Select()
+    selection.Next()
+    number, ref = selection.Номер, selection.Ref
+    monkeypatch.setattr(index, "_load_number", lambda doc_name, key: None)
+
+    assert index.find_ref("ЗаказВПроизводство", number) is None
+    index.register("ЗаказВПроизводство", number, selection.Дата, ref)
+    assert index.find_ref("ЗаказВПроизводство", number) == ref
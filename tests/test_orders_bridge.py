@@ -0,0 +1,105 @@
+# test_orders_bridge.py • запись строк заказа на имитации 1С
+# -*- coding: utf-8 -*-
+
+
+def _first_order(bridge):
+    selection = bridge.documents.ЗаказВПроизводство.Select()
+    selection.Next()
+    return selection.GetObject()
+
+
+def test_unresolved_size_clears_reused_line(bridge):
+    order = _first_order(bridge)
+    row = order.Товары.Get(0)
+    items = [{
+        "Номенклатура": str(row.Номенклатура),
+        "ВариантИзготовления": str(row.ВариантИзготовления),
+        "Размер": "99.5",                       # такого размера в справочнике нет
+        "Количество": row.Количество,
+        "Вес": row.Вес,
+    }]
+
+    assert bridge.orders_bridge.update_order(order.Номер, {}, items)
+
+    saved = bridge.documents.ЗаказВПроизводство.GetRef(order.Ref.UUID()).GetObject()
+    assert saved.Товары.Count() == 1
+    assert saved.Товары.Get(0).Размер == bridge.catalogs.Размеры.EmptyRef()
+    assert str(saved.Товары.Get(0).Номенклатура) == items[0]["Номенклатура"]
+
+
+def test_sync_orders_checks_only_the_shown_window(bridge):
+    page = bridge.list_orders_filtered({}, None, 2)
+    since = page["next"][0]
+    shown = {key for key, _ in page["rows"]}
+
+    result = bridge.sync_orders({}, {}, since)
+    assert result["versions"] == page["versions"]
+    assert set(result["versions"]) == shown
+    assert {key for key, _ in result["changed"]} == shown
+
+    again = bridge.sync_orders(result["versions"], {}, since)
+    assert again["changed"] == [] and again["removed"] == []
+
+
+def test_sync_orders_drops_rows_leaving_the_filter(bridge):
+    page = bridge.list_orders_filtered({}, None, 2)
+    since = page["next"][0]
+    known = bridge.sync_orders({}, {}, since)["versions"]
+    key, order = page["rows"][0]
+
+    result = bridge.sync_orders(known, {"posted": not order["posted"]}, since)
+    assert key in result["removed"]
+
+
+def test_list_paths_return_headers_only(bridge):
+    page = bridge.list_orders_filtered({}, None, 2)
+    synced = bridge.sync_orders({}, {}, page["next"][0])
+    for rows in (page["rows"], synced["changed"]):
+        assert rows
+        assert all("rows" not in order for _, order in rows)
+
+    _, order = synced["changed"][0]
+    assert bridge.get_order_rows(order["Ref"])
+
+
+def _order_with_assay(bridge):
+    order = _first_order(bridge)
+    row = order.Товары.Get(0)
+    row.Проба = bridge.get_ref("Пробы", "585")
+    order.Write()
+    saved = bridge.documents.ЗаказВПроизводство.GetRef(order.Ref.UUID()).GetObject()
+    row = saved.Товары.Get(0)
+    assert row.Проба == bridge.get_ref("Пробы", "585")
+    return saved, {
+        "Номенклатура": str(row.Номенклатура),
+        "ВариантИзготовления": str(row.ВариантИзготовления),
+        "Размер": str(row.Размер),
+        "Количество": row.Количество,
+        "Вес": row.Вес,
+    }
+
+
+def test_changed_nomenclature_gets_a_fresh_line(bridge):
+    order, item = _order_with_assay(bridge)
+    other = next(
+        i["Description"] for i in bridge.list_catalog_items("Номенклатура", 10)
+        if i["Description"] != item["Номенклатура"]
+    )
+
+    assert bridge.orders_bridge.update_order(order.Номер, {}, [dict(item, Номенклатура=other)])
+
+    saved = bridge.documents.ЗаказВПроизводство.GetRef(order.Ref.UUID()).GetObject()
+    row = saved.Товары.Get(0)
+    assert str(row.Номенклатура) == other
+    assert not row.Проба
+
+
+def test_same_nomenclature_is_patched_in_place(bridge):
+    order, item = _order_with_assay(bridge)
+
+    assert bridge.orders_bridge.update_order(order.Номер, {}, [dict(item, Количество=item["Количество"] + 1)])
+
+    saved = bridge.documents.ЗаказВПроизводство.GetRef(order.Ref.UUID()).GetObject()
+    row = saved.Товары.Get(0)
+    assert row.Количество == item["Количество"] + 1
+    assert row.Проба == bridge.get_ref("Пробы", "585")
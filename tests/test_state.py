@@ -0,0 +1,76 @@
+# test_state.py • индексы и сохранение производственных пулов
+# -*- coding: utf-8 -*-
+from logic.state import Pool, StateStore, _alloy, _field
+
+
+def _jobs(store: StateStore) -> Pool:
+    return Pool("wax_jobs", store, {"job": _field("wax_job"), "alloy": _alloy})
+
+
+def _two_row_job() -> list[dict]:
+    return [
+        {"wax_job": "WX-1", "row": 1, "metal": "Au", "hallmark": "585", "color": "red", "status": "created"},
+        {"wax_job": "WX-1", "row": 2, "metal": "Au", "hallmark": "750", "color": "white", "status": "created"},
+    ]
+
+
+def test_save_keeps_find_order(tmp_path):
+    pool = _jobs(StateStore(tmp_path / "state.sqlite"))
+    pool.extend(_two_row_job())
+
+    for status in ("given", "done"):
+        job = pool.find("job", "WX-1")
+        job["status"] = status
+        pool.save(job)
+    job = pool.find("job", "WX-1")
+    job.setdefault("signed_log", []).append({"stage": "done"})
+    pool.save(job)
+
+    first, second = pool.find_all("job", "WX-1")
+    assert first["row"] == 1 and first["status"] == "done" and first["signed_log"]
+    assert second["row"] == 2 and second["status"] == "created"
+
+
+def test_save_with_changed_key_keeps_seq_order(tmp_path):
+    pool = _jobs(StateStore(tmp_path / "state.sqlite"))
+    rows = _two_row_job()
+    rows[0]["hallmark"] = "750"
+    rows[0]["color"] = "white"
+    pool.extend(rows)
+    rows[0]["color"] = "red"
+    pool.save(rows[0])
+    rows[0]["color"] = "white"
+    pool.save(rows[0])
+
+    assert [r["row"] for r in pool.find_all("alloy", ("Au", "750", "white"))] == [1, 2]
+    assert pool.find("alloy", ("Au", "750", "red")) is None
+
+
+def test_restore_after_restart(tmp_path):
+    path = tmp_path / "state.sqlite"
+    store = StateStore(path)
+    pool = _jobs(store)
+    pool.extend(_two_row_job())
+    job = pool.find("job", "WX-1")
+    job["status"] = "done"
+    pool.save(job)
+    store.close()
+
+    restored = _jobs(StateStore(path))
+    assert [r["status"] for r in restored.find_all("job", "WX-1")] == ["done", "created"]
+
+
+def test_remove_all_deletes_rows_on_disk(tmp_path):
+    path = tmp_path / "state.sqlite"
+    store = StateStore(path)
+    pool = _jobs(store)
+    pool.extend(_two_row_job() + [{"wax_job": "WX-2", "row": 3}])
+
+    assert pool.remove_all("job", "WX-1") == 2
+    assert [r["row"] for r in pool] == [3]
+    pool.append({"wax_job": "WX-1", "row": 4})
+    store.close()
+
+    restored = _jobs(StateStore(path))
+    assert [r["row"] for r in restored] == [3, 4]
+    assert [r["row"] for r in restored.find_all("job", "WX-1")] == [4]
@@ -0,0 +1,108 @@
+# test_wax_bridge.py • задания и наряды на имитации 1С
+# -*- coding: utf-8 -*-
+from datetime import datetime
+
+import pytest
+
+
+def _job_refs(bridge):
+    selection = bridge.documents.НарядВосковыеИзделия.Select()
+    refs = []
+    while selection.Next():
+        refs.append(selection.Ref)
+    return refs
+
+
+def test_batch_close_rolls_back_on_interrupt(bridge, monkeypatch):
+    wax = bridge.wax_bridge
+    refs = _job_refs(bridge)[:2]
+    before = [ref.GetObject().ТоварыПринято.Count() for ref in refs]
+    close_job = wax._close_job
+    calls = []
+
+    def interrupted(ref, stamp):
+        calls.append(ref)
+        if len(calls) > 1:
+            raise KeyboardInterrupt
+        return close_job(ref, stamp)
+
+    monkeypatch.setattr(wax, "_close_job", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        wax.close_wax_jobs_batch(refs)
+
+    assert not bridge.connection.TransactionActive()
+    assert [ref.GetObject().ТоварыПринято.Count() for ref in refs] == before
+
+
+
+def test_sync_lists_check_only_the_date_window(bridge):
+    for sync in (bridge.sync_tasks, bridge.sync_wax_jobs):
+        known = sync({})["versions"]
+        assert known
+
+        outside = sync(known, datetime(2100, 1, 1))
+        assert outside["versions"] == {}
+        assert set(outside["removed"]) == set(known)
+
+        inside = sync(known, datetime(1900, 1, 1))
+        assert inside["versions"] == known
+        assert inside["changed"] == [] and inside["removed"] == []
+
+
+def _task_ref(bridge):
+    selection = bridge.documents.ЗаданиеНаПроизводство.Select()
+    selection.Next()
+    return selection.Ref
+
+
+def _issued(bridge, numbers):
+    rows = []
+    for number in numbers:
+        job = bridge.doc_index.find_object("НарядВосковыеИзделия", number)
+        rows.extend(job.ТоварыВыдано)
+    return rows
+
+
+def test_job_rows_copy_only_columns_the_task_table_has(bridge):
+    wax = bridge.wax_bridge
+    plan = wax.plan_wax_jobs(_task_ref(bridge), "Иванов И.И.", "Петров П.П.")
+    count = plan["table"].Count()
+    plan["table"] = plan["table"].Copy(None, "Номенклатура,Количество,Размер,Проба,ЦветМеталла")
+
+    rows = _issued(bridge, wax.create_wax_jobs_from_plan(plan))
+    assert len(rows) == count
+    assert all(row.ВидНорматива is not None for row in rows)
+
+
+def test_job_rows_fall_back_to_row_by_row(bridge, monkeypatch):
+    wax = bridge.wax_bridge
+    plan = wax.plan_wax_jobs(_task_ref(bridge), "Иванов И.И.", "Петров П.П.")
+    count = plan["table"].Count()
+
+    def broken(*args):
+        raise RuntimeError("Copy недоступен")
+
+    monkeypatch.setattr(type(plan["table"]), "Copy", broken)
+    rows = _issued(bridge, wax.create_wax_jobs_from_plan(plan))
+    assert len(rows) == count
+    assert all(row.ВидНорматива is not None for row in rows)
+
+
+def test_open_task_keeps_string_as_identifier(bridge, monkeypatch):
+    wax = bridge.wax_bridge
+    calls = []
+    monkeypatch.setattr(type(bridge.connection), "GetObject", lambda self, ref: calls.append(ref) or "задание")
+    monkeypatch.setattr(wax, "_find_task_by_number", lambda number: pytest.fail("поиск по номеру"))
+
+    assert wax._open_task("идентификатор") == "задание"
+    assert calls == ["идентификатор"]
+
+
+def test_create_jobs_by_task_number(bridge):
+    wax = bridge.wax_bridge
+    task = _task_ref(bridge).GetObject()
+    assert wax._open_task_by_number(task.Номер).Ref == task.Ref
+
+    numbers = bridge.create_wax_jobs_from_task_number(task.Номер, "Иванов И.И.", "Петров П.П.")
+    assert len(_issued(bridge, numbers)) == task.Продукция.Count()
+    assert bridge.create_wax_jobs_from_task_number("НЕТ-000001", "Иванов И.И.", "Петров П.П.") == []
@@ -0,0 +1,115 @@
+# async_call.py • асинхронные вызовы COM-моста из потока GUI
+# -*- coding: utf-8 -*-
+from concurrent.futures import Future
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+import config
+from core.logger import get_logger
+
+_log = get_logger(__name__)
+
+
+class _Dispatcher(QObject):
+    """Переносит завершение Future из потока COM в поток GUI."""
+
+    finished = pyqtSignal(object, object)
+
+    def __init__(self):
+        super().__init__()
+        self.finished.connect(self._deliver)
+
+    def _deliver(self, future: Future, callbacks):
+        key, on_done, on_error = callbacks
+        pool = config.COM_POOL
+        if future.cancelled():
+            return
+        if key is not None and pool is not None and not pool.is_current(key, future):
+            return  # результат вытеснен более новым запросом
+        try:
+            error = future.exception()
+            if error is not None:
+                if on_error is not None:
+                    on_error(error)
+                else:
+                    _log.error("[bridge_call] Ошибка: %s", error)
+                return
+            if on_done is not None:
+                on_done(future.result())
+        except RuntimeError as e:
+            # виджет-получатель уже удалён
+            _log.warning("[bridge_call] Результат не доставлен: %s", e)
+
+
+_dispatcher = None
+
+
+def _resolve(bridge, method: str):
+    target = bridge
+    for part in method.split("."):
+        target = getattr(target, part)
+    return target
+
+
+def bridge_call(method: str, *args, on_done=None, on_error=None, key=None, **kwargs) -> Future:
+    """Вызывает метод моста в пуле потоков COM, не блокируя интерфейс.
+
+    ``on_done(result)`` / ``on_error(exc)`` вызываются в потоке GUI. Новый
+    вызов с тем же ``key`` отменяет предыдущий, ещё не доставленный.
+    """
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = _Dispatcher()
+
+    pool = config.COM_POOL
+    if pool is None:
+        # мост без отдельного потока — выполняем сразу
+        future: Future = Future()
+        try:
+            future.set_result(_resolve(config.BRIDGE, method)(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        _dispatcher._deliver(future, (None, on_done, on_error))
+        return future
+
+    future = pool.call(method, *args, key=key, **kwargs)
+    callbacks = (key, on_done, on_error)
+    future.add_done_callback(lambda f: _dispatcher.finished.emit(f, callbacks))
+    return future
+
+
+def load_data(bridge, calls: dict[str, tuple], data: dict | None = None) -> dict:
+    """Данные ``{имя: (метод, *аргументы)}``: уже полученные берутся из ``data``,
+    недостающие читаются из ``bridge`` синхронно."""
+    data = dict(data or {})
+    for name, (method, *args) in calls.items():
+        if name not in data:
+            data[name] = _resolve(bridge, method)(*args)
+    return data
+
+
+def prefetch_data(calls: dict[str, tuple], on_done) -> None:
+    """Читает данные ``{имя: (метод, *аргументы)}`` в пуле COM.
+
+    ``on_done(data)`` вызывается в потоке GUI, когда пришли все ответы;
+    неудачные вызовы в ``data`` не попадают (их дочитает ``load_data``).
+    """
+    data, pending = {}, set(calls)
+
+    def finish(name, value=None, ok=True):
+        if ok:
+            data[name] = value
+        else:
+            _log.warning("[prefetch_data] %s: %s", calls[name][0], value)
+        pending.discard(name)
+        if not pending:
+            on_done(data)
+
+    if not calls:
+        on_done(data)
+    for name, (method, *args) in calls.items():
+        bridge_call(
+            method, *args,
+            on_done=lambda value, name=name: finish(name, value),
+            on_error=lambda e, name=name: finish(name, e, ok=False),
+        )
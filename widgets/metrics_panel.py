@@ -0,0 +1,91 @@
+# metrics_panel.py • окно «Метрики COM»: самые медленные операции моста
+# -*- coding: utf-8 -*-
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+    QTableWidgetItem, QHeaderView,
+)
+
+from core.com_metrics import METRICS, BUCKETS_MS
+
+# Период обновления таблицы, мс
+REFRESH_MS = 2000
+
+
+class MetricsPanel(QWidget):
+    """Сводка ``ComMetrics``: операции, отсортированные по p95 времени.
+
+    Таблица обновляется по таймеру, пока окно открыто.
+    """
+
+    COLUMNS = [
+        ("Операция", "op"),
+        ("Вызовов", "count"),
+        ("Ошибок", "errors"),
+        ("Сред., мс", "avg_ms"),
+        ("p95, мс", "p95_ms"),
+        ("Макс., мс", "max_ms"),
+        ("Всего, мс", "total_ms"),
+        ("COM на вызов", "com_per_call"),
+    ]
+
+    def __init__(self, metrics=METRICS, parent=None):
+        super().__init__(parent)
+        self.metrics = metrics
+        self.setWindowTitle("Метрики COM")
+        self.resize(900, 480)
+
+        v = QVBoxLayout(self)
+        top = QHBoxLayout()
+        self.summary = QLabel()
+        btn_reset = QPushButton("Сбросить")
+        btn_reset.clicked.connect(self._reset)
+        top.addWidget(self.summary, 1)
+        top.addWidget(btn_reset)
+        v.addLayout(top)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _ in self.COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        v.addWidget(self.table, 1)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start()
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def _reset(self):
+        self.metrics.reset()
+        self.refresh()
+
+    def refresh(self):
+        if not self.metrics.enabled:
+            self.summary.setText("Метрики выключены (запустите с COM_METRICS=1)")
+            self.table.setRowCount(0)
+            return
+        rows = self.metrics.snapshot()
+        calls = sum(r["count"] for r in rows)
+        com = sum(r["com"] for r in rows)
+        self.summary.setText(f"Операций: {calls}, обращений к COM: {com}")
+        self.table.setRowCount(len(rows))
+        for i, r in enumerate(rows):
+            for j, (_, key) in enumerate(self.COLUMNS):
+                item = QTableWidgetItem(str(r[key]))
+                if j == 0:
+                    item.setToolTip(self._histogram(r["histogram"]))
+                self.table.setItem(i, j, item)
+
+    @staticmethod
+    def _histogram(buckets: list[int]) -> str:
+        bounds = [f"≤{b} мс" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]} мс"]
+        return "\n".join(f"{b}: {n}" for b, n in zip(bounds, buckets) if n)
@@ -0,0 +1,321 @@
+# order_models.py • модели и делегаты таблиц страницы заказов
+# -*- coding: utf-8 -*-
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QStringListModel
+from PyQt5.QtWidgets import (
+    QStyledItemDelegate, QComboBox, QSpinBox, QDoubleSpinBox, QCompleter, QLineEdit
+)
+
+import config
+from core.article_index import ArticleIndex
+
+
+# ─────────────────────────── Список заказов ───────────────────────────
+class OrdersListModel(QAbstractTableModel):
+    """Список заказов: строки хранятся готовыми кортежами для отображения."""
+
+    HEADERS = [
+        "✓", "Номер", "Дата", "Вид/статус продукции", "Количество", "Вес",
+        "Организация", "Контрагент", "Договор", "Комментарий"
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.orders: list[dict] = []
+        self.keys: list[str] = []
+        self._display: list[tuple] = []
+        self._checked: set[str] = set()
+
+    @staticmethod
+    def _row(o: dict) -> tuple:
+        status = "🟢" if o.get("posted") else ("❌" if o.get("deleted") else "⚪")
+        return (
+            "", f"{status} {o['num']}", str(o["date"]), str(o.get("prod_status", "")),
+            str(o.get("qty", 0)), f"{o.get('weight', 0):.{config.WEIGHT_DECIMALS}f}",
+            str(o.get("org", "")), str(o.get("contragent", "")),
+            str(o.get("contract", "")), str(o.get("comment", "")),
+        )
+
+    # --- Qt ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._display)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self._display[index.row()][index.column()]
+        if role == Qt.CheckStateRole and index.column() == 0:
+            return Qt.Checked if self.keys[index.row()] in self._checked else Qt.Unchecked
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role == Qt.CheckStateRole and index.column() == 0:
+            key = self.keys[index.row()]
+            if value == Qt.Checked:
+                self._checked.add(key)
+            else:
+                self._checked.discard(key)
+            self.dataChanged.emit(index, index, [role])
+            return True
+        return False
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    # --- данные ---
+    def set_orders(self, orders: list[dict], keys: list[str] | None = None):
+        self.beginResetModel()
+        self.orders = list(orders)
+        self.keys = list(keys) if keys is not None else [f"{o['num']}|{o['date']}" for o in orders]
+        self._display = [self._row(o) for o in self.orders]
+        self._checked &= set(self.keys)
+        self.endResetModel()
+
+    def upsert(self, key: str, order: dict, pos: int | None = None) -> None:
+        """Обновляет строку заказа по ключу или вставляет её в позицию ``pos``
+        (по умолчанию — в конец)."""
+        try:
+            r = self.keys.index(key)
+        except ValueError:
+            r = len(self.orders) if pos is None else pos
+            self.beginInsertRows(QModelIndex(), r, r)
+            self.orders.insert(r, order)
+            self.keys.insert(r, key)
+            self._display.insert(r, self._row(order))
+            self.endInsertRows()
+            return
+        self.orders[r] = order
+        self._display[r] = self._row(order)
+        self.dataChanged.emit(self.index(r, 0), self.index(r, len(self.HEADERS) - 1))
+
+    def remove(self, key: str) -> None:
+        try:
+            r = self.keys.index(key)
+        except ValueError:
+            return
+        self.beginRemoveRows(QModelIndex(), r, r)
+        del self.orders[r], self.keys[r], self._display[r]
+        self._checked.discard(key)
+        self.endRemoveRows()
+
+    def checked_rows(self) -> list[int]:
+        return [r for r, key in enumerate(self.keys) if key in self._checked]
+
+
+# ─────────────────────────── Строки заказа ───────────────────────────
+# Колонки редактора строк (config.ORDERS_COLS)
+COL_ARTICLE, COL_NAME, COL_VARIANT, COL_SIZE, COL_QTY, COL_WEIGHT, COL_NOTE = range(7)
+
+
+class OrderLinesModel(QAbstractTableModel):
+    """Табличная часть редактируемого заказа.
+
+    Строка — список [артикул, наименование, вариант, размер, кол-во, вес,
+    примечание]. При смене артикула подставляются наименование, размер,
+    вес и вариант по карточке; при смене количества пересчитывается вес.
+    """
+
+    DEFAULT_SIZE = 16.0
+
+    def __init__(self, articles: ArticleIndex, variants_for, parent=None):
+        super().__init__(parent)
+        self.articles = articles
+        self.variants_for = variants_for
+        self._rows: list[list] = []
+
+    # --- Qt ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(config.ORDERS_COLS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return config.ORDERS_COLS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        value = self._rows[index.row()][index.column()]
+        if role == Qt.EditRole:
+            return value
+        if role == Qt.DisplayRole:
+            col = index.column()
+            if col == COL_SIZE:
+                return f"{value:.1f}"
+            if col == COL_WEIGHT:
+                return f"{value:.{config.WEIGHT_DECIMALS}f}"
+            return str(value)
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() != COL_NAME:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        r, col = index.row(), index.column()
+        row = self._rows[r]
+        if col == COL_ARTICLE:
+            row[COL_ARTICLE] = str(value).strip()
+            self._fill_from_card(row, with_size=True)
+        elif col == COL_QTY:
+            row[COL_QTY] = int(value)
+            self._fill_from_card(row, with_size=False)
+        elif col in (COL_SIZE, COL_WEIGHT):
+            row[col] = float(value)
+        else:
+            row[col] = str(value)
+        self.dataChanged.emit(self.index(r, 0), self.index(r, len(row) - 1))
+        return True
+
+    # --- данные ---
+    def _fill_from_card(self, row: list, with_size: bool) -> None:
+        card = self.articles.get(row[COL_ARTICLE], {})
+        row[COL_NAME] = card.get("name", "")
+        if with_size:
+            if card.get("size"):
+                row[COL_SIZE] = float(card["size"])
+            variants = self.variants_for(row[COL_ARTICLE])
+            if row[COL_VARIANT] not in variants:
+                row[COL_VARIANT] = variants[0] if variants else ""
+        row[COL_WEIGHT] = round(card.get("w", 0) * row[COL_QTY], config.WEIGHT_DECIMALS)
+
+    def article_for(self, name: str) -> str:
+        """Артикул по наименованию (или UUID) номенклатуры; "" — не найден."""
+        return self.articles.article_for(name)
+
+    def _new_row(self) -> list:
+        row = ["", "", "", self.DEFAULT_SIZE, 1, 0.0, ""]
+        if self.articles:
+            row[COL_ARTICLE] = next(iter(self.articles))
+            self._fill_from_card(row, with_size=True)
+        return row
+
+    def add_row(self, copy_from: int | None = None) -> None:
+        if copy_from is not None and 0 <= copy_from < len(self._rows):
+            row = list(self._rows[copy_from])
+        else:
+            row = self._new_row()
+        r = len(self._rows)
+        self.beginInsertRows(QModelIndex(), r, r)
+        self._rows.append(row)
+        self.endInsertRows()
+
+    def remove_last(self) -> None:
+        if self._rows:
+            r = len(self._rows) - 1
+            self.beginRemoveRows(QModelIndex(), r, r)
+            self._rows.pop()
+            self.endRemoveRows()
+
+    def clear(self) -> None:
+        self.set_rows([])
+
+    def set_rows(self, rows: list[list]) -> None:
+        """Заменяет все строки разом (одно обновление представления)."""
+        self.beginResetModel()
+        self._rows = [list(r) for r in rows]
+        self.endResetModel()
+
+    def rows(self) -> list[list]:
+        return [list(r) for r in self._rows]
+
+
+class OrderLinesDelegate(QStyledItemDelegate):
+    """Редакторы создаются только на время редактирования ячейки.
+
+    Для артикула — строка ввода с автодополнением. Модель подсказок и
+    ``QCompleter`` одни на всю таблицу; модель небольшая и при каждом
+    изменении текста заполняется из ``ArticleIndex``: сначала артикулы,
+    начинающиеся с введённого, затем содержащие его.
+    """
+
+    def __init__(self, parent=None, articles=None):
+        super().__init__(parent)
+        self.articles = articles
+        self.articles_model = QStringListModel(self)
+        self.completer = QCompleter(self.articles_model, self)
+        self.completer.setCaseSensitivity(Qt.CaseInsensitive)
+        # отбор уже сделан индексом — completer показывает модель как есть
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+
+    def set_articles(self, articles) -> None:
+        """Заменяет индекс артикулов для автодополнения."""
+        self.articles = articles
+
+    def _suggest(self, text: str) -> None:
+        if self.articles is None:
+            return
+        self.articles_model.setStringList(self.articles.complete(text))
+        self.completer.setCompletionPrefix(text)
+        self.completer.complete()
+
+    def createEditor(self, parent, option, index):
+        model = index.model()
+        col = index.column()
+        if col == COL_ARTICLE:
+            editor = QLineEdit(parent)
+            editor.setCompleter(self.completer)
+            editor.textEdited.connect(self._suggest)
+            return editor
+        if col == COL_VARIANT:
+            editor = QComboBox(parent)
+            article = model.data(model.index(index.row(), COL_ARTICLE), Qt.EditRole)
+            editor.addItems(model.variants_for(article))
+            return editor
+        if col == COL_SIZE:
+            editor = QDoubleSpinBox(parent)
+            editor.setDecimals(1)
+            # Максимальный размер увеличен до 100, чтобы поддерживать крупные кольца
+            editor.setRange(0.5, 100.0)
+            editor.setSingleStep(0.5)
+            return editor
+        if col == COL_QTY:
+            editor = QSpinBox(parent)
+            editor.setRange(1, 999)
+            return editor
+        if col == COL_WEIGHT:
+            editor = QDoubleSpinBox(parent)
+            editor.setDecimals(config.WEIGHT_DECIMALS)
+            editor.setMaximum(9999)
+            return editor
+        return super().createEditor(parent, option, index)
+
+    def setEditorData(self, editor, index):
+        value = index.model().data(index, Qt.EditRole)
+        if isinstance(editor, QComboBox):
+            editor.setCurrentText(str(value))
+        elif isinstance(editor, QLineEdit):
+            editor.setText(str(value))
+        elif isinstance(editor, (QSpinBox, QDoubleSpinBox)):
+            editor.setValue(value)
+        else:
+            super().setEditorData(editor, index)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QComboBox):
+            model.setData(index, editor.currentText(), Qt.EditRole)
+        elif isinstance(editor, QLineEdit):
+            model.setData(index, editor.text(), Qt.EditRole)
+        elif isinstance(editor, (QSpinBox, QDoubleSpinBox)):
+            editor.interpretText()
+            model.setData(index, editor.value(), Qt.EditRole)
+        else:
+            super().setModelData(editor, model, index)
@@ -5,10 +5,14 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import QDate, pyqtSignal
-from core.com_bridge import safe_str, log
+from core.com_bridge import safe_str
+from core.logger import get_logger
+from widgets.async_call import load_data
 import getpass
 import config
 
+_log = get_logger(__name__)
+
 
 class ProductionTaskEditForm(QWidget):
     """Форма редактирования документа 'Задание на производство'."""
@@ -21,10 +25,19 @@ class ProductionTaskEditForm(QWidget):
         "Проба", "Цвет металла", "Вставки", "Заказ"
     ]
 
-    def __init__(self, bridge):
+    # Данные формы из моста: имя → (метод, аргументы) (см. async_call.load_data)
+    DATA_CALLS = {
+        "next_task_number": ("get_next_task_number",),
+        "sections": ("list_catalog_items", "ПроизводственныеУчастки"),
+        "operations": ("list_catalog_items", "ТехОперации"),
+        "centers": ("list_catalog_items", "ФизическиеЛица", 200),
+    }
+
+    def __init__(self, bridge, data: dict | None = None):
         super().__init__()
         self.bridge = bridge
         self._order_ref = None
+        self._data = load_data(bridge, self.DATA_CALLS, data)
         self._build_ui()
         self.c_center.setCurrentText(getpass.getuser())
 
@@ -36,20 +49,20 @@ class ProductionTaskEditForm(QWidget):
         layout.addWidget(hdr)
 
         form = QFormLayout()
-        self.lbl_number = QLabel(self.bridge.get_next_task_number())
+        self.lbl_number = QLabel(self._data["next_task_number"])
         self.d_date = QDateEdit(QDate.currentDate()); self.d_date.setCalendarPopup(True)
         self.d_end = QDateEdit(QDate.currentDate()); self.d_end.setCalendarPopup(True)
 
         self.c_section = QComboBox()
-        sections = [x["Description"] for x in self.bridge.list_catalog_items("ПроизводственныеУчастки")]
+        sections = [x["Description"] for x in self._data["sections"]]
         self.c_section.addItems(sections)
 
         self.c_op = QComboBox()
-        ops = [x["Description"] for x in self.bridge.list_catalog_items("ТехОперации")]
+        ops = [x["Description"] for x in self._data["operations"]]
         self.c_op.addItems(ops)
 
         self.c_center = QComboBox()
-        centers = [x["Description"] for x in self.bridge.list_catalog_items("ФизическиеЛица", limit=200)]
+        centers = [x["Description"] for x in self._data["centers"]]
         self.c_center.addItems(centers)
 
         self.order_line = QLineEdit(); self.order_line.setReadOnly(True)
@@ -236,7 +249,7 @@ class ProductionTaskEditForm(QWidget):
 
                 self._order_ref = base
             except Exception as e:  # noqa: PIE786
-                log(f"❌ Ошибка чтения осн. документа: {e}")
+                _log.error("Ошибка чтения осн. документа: %s", e)
 
         self.tbl.setRowCount(0)
         lines = self.bridge.get_task_lines(str(getattr(task_obj, "Номер", "")))